@@ -0,0 +1,75 @@
+"""
+Plumbing for native async (ASGI) function views that keep the project's
+DRF behaviour: the configured authenticators and permission classes, DRF
+error bodies and the first configured renderer. DRF's own dispatch is
+sync-only, so these views are plain Django coroutines.
+"""
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.http import HttpResponseNotAllowed
+from rest_framework import exceptions
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+
+def render_response(response):
+    """Render a DRF Response with the first DEFAULT_RENDERER_CLASSES entry."""
+    renderer = api_settings.DEFAULT_RENDERER_CLASSES[0]()
+    response.accepted_renderer = renderer
+    response.accepted_media_type = renderer.media_type
+    response.renderer_context = {}
+    return response.render()
+
+
+def _check_access(request, permission_classes):
+    """APIView.initial() minus throttling/negotiation; returns an error Response or None."""
+    drf_request = Request(
+        request, authenticators=[auth() for auth in api_settings.DEFAULT_AUTHENTICATION_CLASSES]
+    )
+    try:
+        request.user = drf_request.user  # authenticate now, as APIView.perform_authentication does
+        for permission in permission_classes:
+            if not permission().has_permission(drf_request, None):
+                if drf_request.authenticators and not drf_request.successful_authenticator:
+                    raise exceptions.NotAuthenticated()
+                raise exceptions.PermissionDenied()
+    except exceptions.APIException as exc:
+        if isinstance(exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+            header = None
+            if drf_request.authenticators:
+                header = drf_request.authenticators[0].authenticate_header(drf_request)
+            if header:
+                exc.auth_header = header
+            else:
+                exc.status_code = 403
+        return api_settings.EXCEPTION_HANDLER(exc, {"request": drf_request, "view": None})
+
+    return None
+
+
+def async_api_view(permission_classes):
+    """
+    Decorate an `async def view(request)` answering GET: runs authentication
+    and permissions (off the event loop, they may hit the ORM) and renders a
+    returned DRF Response.
+    """
+    def decorator(view):
+        @wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            if request.method not in ("GET", "HEAD"):
+                return HttpResponseNotAllowed(["GET", "HEAD"])
+
+            denied = await sync_to_async(_check_access)(request, permission_classes)
+            if denied is not None:
+                return render_response(denied)
+
+            response = await view(request, *args, **kwargs)
+            if isinstance(response, Response):
+                response = render_response(response)
+            return response
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,175 @@
+"""
+SQLite-backed Django cache shared by every process on one host.
+
+LocMemCache is per process, so with several gunicorn workers plus the
+scheduler each has its own copy: ingestion's data-version bump, token
+revocations and task-written keys never reach the other workers. This
+backend keeps entries in one SQLite file (WAL, so readers don't block the
+writer) that all processes open. For multi-node deployments use Redis
+instead (CACHE_URL=redis://...).
+
+    CACHE_URL=sqlitecache:///var/tmp/rainsafe-cache.sqlite3
+"""
+import os
+import pickle
+import sqlite3
+import threading
+import time
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+CULL_EVERY = 100  # writes between expiry/size sweeps (per process)
+
+
+class SQLiteCache(BaseCache):
+    pickle_protocol = pickle.HIGHEST_PROTOCOL
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        self._path = location
+        self._local = threading.local()
+        self._writes = 0
+
+    def _conn(self):
+        # One connection per thread, reopened after fork
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self._path, timeout=30, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_entries "
+                "(key TEXT PRIMARY KEY, value BLOB NOT NULL, expires REAL) WITHOUT ROWID"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS cache_entries_expires ON cache_entries (expires)")
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def _dumps(self, value):
+        return pickle.dumps(value, self.pickle_protocol)
+
+    def _wrote(self, count=1):
+        self._writes += count
+        if self._writes >= CULL_EVERY:
+            self._writes = 0
+            self._cull()
+
+    def _cull(self):
+        conn = self._conn()
+        conn.execute("DELETE FROM cache_entries WHERE expires <= ?", (time.time(),))
+        (count,) = conn.execute("SELECT COUNT(*) FROM cache_entries").fetchone()
+        if count > self._max_entries:
+            if self._cull_frequency == 0:
+                conn.execute("DELETE FROM cache_entries")
+                return
+            # Soonest-expiring first; entries without expiry go last
+            conn.execute(
+                "DELETE FROM cache_entries WHERE key IN (SELECT key FROM cache_entries "
+                "ORDER BY expires IS NULL, expires LIMIT ?)",
+                (count // self._cull_frequency,),
+            )
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        cursor = self._conn().execute(
+            "INSERT INTO cache_entries (key, value, expires) VALUES (?, ?, ?) "
+            "ON CONFLICT (key) DO UPDATE SET value = excluded.value, expires = excluded.expires "
+            "WHERE cache_entries.expires <= ?",
+            (key, self._dumps(value), self.get_backend_timeout(timeout), time.time()),
+        )
+        self._wrote()
+        return cursor.rowcount == 1
+
+    def get(self, key, default=None, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        row = self._conn().execute(
+            "SELECT value FROM cache_entries WHERE key = ? AND (expires IS NULL OR expires > ?)",
+            (key, time.time()),
+        ).fetchone()
+        return default if row is None else pickle.loads(row[0])
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        self._conn().execute(
+            "INSERT OR REPLACE INTO cache_entries (key, value, expires) VALUES (?, ?, ?)",
+            (key, self._dumps(value), self.get_backend_timeout(timeout)),
+        )
+        self._wrote()
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        cursor = self._conn().execute(
+            "UPDATE cache_entries SET expires = ? WHERE key = ? AND (expires IS NULL OR expires > ?)",
+            (self.get_backend_timeout(timeout), key, time.time()),
+        )
+        return cursor.rowcount == 1
+
+    def delete(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        cursor = self._conn().execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+        return cursor.rowcount == 1
+
+    def has_key(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        return self._conn().execute(
+            "SELECT 1 FROM cache_entries WHERE key = ? AND (expires IS NULL OR expires > ?)",
+            (key, time.time()),
+        ).fetchone() is not None
+
+    def incr(self, key, delta=1, version=None):
+        # Read-modify-write under the write lock, so concurrent workers don't lose counts
+        key = self.make_and_validate_key(key, version=version)
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT value FROM cache_entries WHERE key = ? AND (expires IS NULL OR expires > ?)",
+                (key, time.time()),
+            ).fetchone()
+            if row is None:
+                raise ValueError("Key '%s' not found" % key)
+            new_value = pickle.loads(row[0]) + delta
+            conn.execute("UPDATE cache_entries SET value = ? WHERE key = ?", (self._dumps(new_value), key))
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+        return new_value
+
+    def get_many(self, keys, version=None):
+        key_map = {self.make_and_validate_key(key, version=version): key for key in keys}
+        if not key_map:
+            return {}
+        placeholders = ",".join("?" * len(key_map))
+        rows = self._conn().execute(
+            f"SELECT key, value FROM cache_entries WHERE key IN ({placeholders}) "
+            "AND (expires IS NULL OR expires > ?)",
+            (*key_map, time.time()),
+        )
+        return {key_map[key]: pickle.loads(value) for key, value in rows}
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        expires = self.get_backend_timeout(timeout)
+        rows = [
+            (self.make_and_validate_key(key, version=version), self._dumps(value), expires)
+            for key, value in data.items()
+        ]
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany("INSERT OR REPLACE INTO cache_entries (key, value, expires) VALUES (?, ?, ?)", rows)
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+        self._wrote(len(rows))
+        return []
+
+    def delete_many(self, keys, version=None):
+        self._conn().executemany(
+            "DELETE FROM cache_entries WHERE key = ?",
+            [(self.make_and_validate_key(key, version=version),) for key in keys],
+        )
+
+    def clear(self):
+        self._conn().execute("DELETE FROM cache_entries")
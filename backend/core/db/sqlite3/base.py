@@ -0,0 +1,38 @@
+"""
+SQLite backend for small deployments where the hourly ingestion writes
+alongside report submissions and API reads.
+
+Extra OPTIONS (popped before sqlite3.connect):
+- journal_mode: "wal" lets readers run while a write is in progress.
+- synchronous: "normal" is safe under WAL and avoids an fsync per commit.
+- transaction_mode: "IMMEDIATE" makes atomic blocks take the write lock at
+  BEGIN. A deferred transaction that reads first and then writes cannot wait
+  on the busy timeout and fails straight away with "database is locked".
+  (Django 5.1 adds this option natively.)
+
+The standard "timeout" option is the busy timeout in seconds.
+"""
+from django.db.backends.sqlite3 import base
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        self.journal_mode = params.pop("journal_mode", None)
+        self.synchronous = params.pop("synchronous", None)
+        self.transaction_mode = params.pop("transaction_mode", None)
+        return params
+
+    def get_new_connection(self, conn_params):
+        conn = super().get_new_connection(conn_params)
+        if self.journal_mode and not self.is_in_memory_db():
+            conn.execute(f"PRAGMA journal_mode = {self.journal_mode}")
+        if self.synchronous:
+            conn.execute(f"PRAGMA synchronous = {self.synchronous}")
+        return conn
+
+    def _start_transaction_under_autocommit(self):
+        if self.transaction_mode:
+            self.cursor().execute(f"BEGIN {self.transaction_mode}")
+        else:
+            super()._start_transaction_under_autocommit()
@@ -0,0 +1,46 @@
+"""
+Fast path for hot list GETs: rows come from .values() queries and are
+turned into plain dicts by small row builders, skipping per-object
+ModelSerializer field introspection. Builders must produce exactly what
+the matching ModelSerializer would (checked by `manage.py bench_serializers`);
+set FAST_READ_SERIALIZERS=false to fall back to the serializers.
+"""
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.utils import timezone
+from rest_framework.response import Response
+
+
+def iso_datetime(value):
+    """DateTimeField.to_representation for ISO 8601 output."""
+    if not value:
+        return None
+    if settings.USE_TZ:
+        value = value.astimezone(timezone.get_current_timezone())
+    value = value.isoformat()
+    if value.endswith("+00:00"):
+        value = value[:-6] + "Z"
+    return value
+
+
+def file_url(name, request=None):
+    """FileField/ImageField.to_representation from a stored file name."""
+    if not name:
+        return None
+    url = default_storage.url(name)
+    return request.build_absolute_uri(url) if request is not None else url
+
+
+class FastListMixin:
+    """
+    List views set `fast_list` to a callable (queryset, context) -> list of
+    dicts. Used for unpaginated lists when FAST_READ_SERIALIZERS is on.
+    """
+    fast_list = None
+
+    def list(self, request, *args, **kwargs):
+        if self.fast_list is None or not settings.FAST_READ_SERIALIZERS or self.paginator is not None:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        return Response(type(self).fast_list(queryset, self.get_serializer_context()))
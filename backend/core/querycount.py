@@ -0,0 +1,125 @@
+"""
+Per-request query accounting. QueryLog records every SQL statement run
+while it is active (in this thread/context, on any database connection);
+QueryCountMiddleware wraps each request in one, reports the totals as
+X-Query-Count / X-Query-Time headers and logs query shapes repeated often
+enough to look like an N+1. Enable with QUERY_LOG=true.
+"""
+import contextvars
+import logging
+import re
+import time
+from collections import Counter
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+logger = logging.getLogger(__name__)
+
+_active = contextvars.ContextVar("query_logs", default=())
+
+_IN_LIST = re.compile(r"\((?:\s*(?:%s|\?)\s*,)+\s*(?:%s|\?)\s*\)")
+_VALUES_ROWS = re.compile(r"(\(\.\.\.\))(?:\s*,\s*\(\.\.\.\))+")
+_LITERALS = re.compile(r"'(?:[^']|'')*'|(?<![\w.\"])-?\d+(?:\.\d+)?\b")
+
+
+def normalize_sql(sql):
+    """
+    Reduce a statement to its shape: literals become ?, and IN lists or
+    multi-row VALUES of any length look the same.
+    """
+    sql = _LITERALS.sub("?", sql)
+    sql = _IN_LIST.sub("(...)", sql)
+    return _VALUES_ROWS.sub(r"\1", sql)
+
+
+def _record(execute, sql, params, many, context):
+    logs = _active.get()
+    if not logs:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        duration = time.perf_counter() - started
+        for log in logs:
+            log.queries.append((context["connection"].alias, sql, duration))
+
+
+def _install(connection, **kwargs):
+    if _record not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_record)
+
+
+# Connections opened later (other threads, sync_to_async workers, reconnects)
+connection_created.connect(_install, dispatch_uid="core.querycount")
+
+
+class QueryLog:
+    """
+    Context manager collecting (alias, sql, seconds) for each query run
+    inside it. Logs nest; an outer log also sees the inner log's queries.
+    """
+
+    def __init__(self):
+        self.queries = []
+
+    def __enter__(self):
+        for connection in connections.all(initialized_only=True):
+            _install(connection)
+        self._token = _active.set(_active.get() + (self,))
+        return self
+
+    def __exit__(self, *exc):
+        _active.reset(self._token)
+
+    @property
+    def count(self):
+        return len(self.queries)
+
+    @property
+    def duration(self):
+        return sum(seconds for _, _, seconds in self.queries)
+
+    def shapes(self):
+        """Counter of normalized statements."""
+        return Counter(normalize_sql(sql) for _, sql, _ in self.queries)
+
+    def repeated(self, threshold):
+        """[(shape, times)] for shapes run at least `threshold` times: likely N+1s."""
+        return [(shape, times) for shape, times in self.shapes().most_common() if times >= threshold]
+
+    def describe(self):
+        return "\n".join(f"{i}. [{alias}] {sql}" for i, (alias, sql, _) in enumerate(self.queries, 1))
+
+
+class QueryCountMiddleware:
+    """Adds query totals to every response and warns about repeated query shapes."""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with QueryLog() as log:
+            response = self.get_response(request)
+        return self._report(request, response, log)
+
+    async def __acall__(self, request):
+        with QueryLog() as log:
+            response = await self.get_response(request)
+        return self._report(request, response, log)
+
+    def _report(self, request, response, log):
+        response["X-Query-Count"] = str(log.count)
+        response["X-Query-Time"] = f"{log.duration * 1000:.1f}ms"
+        for shape, times in log.repeated(settings.QUERY_LOG_REPEAT_THRESHOLD):
+            logger.warning("Possible N+1 on %s %s: %d× %s", request.method, request.path, times, shape)
+        return response
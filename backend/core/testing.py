@@ -0,0 +1,60 @@
+"""Helpers shared by the app test suites."""
+from django.core.cache import caches
+from rest_framework.test import APIClient
+
+from .querycount import QueryLog
+
+
+class QueryBudgetMixin:
+    """
+    Query budgets per endpoint, checked at several dataset sizes. Mix into
+    a TestCase and declare
+
+        query_budgets = {label: (path, max_queries)}
+
+    plus `self.user`, the account the GETs are made as, and override
+    populate(size), called with each of `dataset_sizes` in turn, so it
+    makes every listed table hold at least `size` rows. Paths are formatted
+    with the test case as `self`, e.g. "/api/things/{self.thing_pk}/".
+
+    An endpoint fails when it runs more queries than its budget or repeats
+    one query shape `repeat_threshold` times (an N+1). Budgets are
+    constants: a query count that grows with the data fails at the larger
+    sizes.
+    """
+    query_budgets = {}
+    dataset_sizes = (1, 10, 40)
+    repeat_threshold = 3
+
+    def populate(self, size):
+        """Grow the test data to `size` rows per listed table; override this."""
+
+    def budget_client(self):
+        from users.tokens import CustomTokenObtainPairSerializer
+
+        client = APIClient()
+        token = CustomTokenObtainPairSerializer.get_token(self.user).access_token
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        return client
+
+    def test_query_budgets(self):
+        client = self.budget_client()
+        for size in self.dataset_sizes:
+            self.populate(size)
+            for label, (path, budget) in self.query_budgets.items():
+                for cache in caches.all():
+                    cache.clear()  # measure the database work, not a cached response
+                with self.subTest(endpoint=label, rows=size):
+                    with QueryLog() as log:
+                        response = client.get(path.format(self=self))
+                    self.assertEqual(response.status_code, 200, response.content[:300])
+                    self.assertLessEqual(
+                        log.count, budget,
+                        f"{label} ran {log.count} queries (budget {budget}) with {size} rows:\n{log.describe()}",
+                    )
+                    repeated = log.repeated(self.repeat_threshold)
+                    self.assertFalse(
+                        repeated,
+                        f"{label} repeats queries with {size} rows (N+1):\n"
+                        + "\n".join(f"{times}× {shape}" for shape, times in repeated),
+                    )
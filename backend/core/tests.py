@@ -0,0 +1,81 @@
+import datetime
+import decimal
+import json
+import zoneinfo
+
+import numpy as np
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from reports.models import Report
+from weather.models import Station, WeatherData
+from .renderers import ORJSONRenderer
+
+
+class ORJSONRendererParityTests(SimpleTestCase):
+    """ORJSONRenderer must produce what JSONRenderer would, byte for byte."""
+
+    def assertParity(self, data):
+        self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_datetimes(self):
+        utc = datetime.timezone.utc
+        for value in (
+            datetime.datetime(2026, 7, 1, 12, 30, tzinfo=utc),
+            datetime.datetime(2026, 7, 1, 12, 30, 5, 123456, tzinfo=utc),  # microseconds are kept
+            datetime.datetime(2026, 7, 1, 12, 30, 5, 1000, tzinfo=zoneinfo.ZoneInfo("UTC")),
+            datetime.datetime(2026, 7, 1, 12, 30, 5, 123456, tzinfo=zoneinfo.ZoneInfo("Asia/Manila")),
+            datetime.datetime(2026, 7, 1, 12, 30, 5, 500),  # naive
+            timezone.now(),
+            datetime.date(2026, 7, 1),
+            datetime.time(6, 15, 0, 250000),
+        ):
+            with self.subTest(value=value):
+                self.assertParity({"value": value, "list": [value]})
+
+    def test_other_types(self):
+        self.assertParity({
+            "decimal": decimal.Decimal("12.50"),
+            "duration": datetime.timedelta(hours=1, microseconds=5),
+            "lazy": gettext_lazy("Pending"),
+            "numpy": np.array([1.5, 2.0]),
+            "scalar": np.float64(0.1) + np.float64(0.2),
+            "keys": {1: "one"},
+            "text": "Ñoño   ⚠️",
+            "big": 2 ** 70,  # beyond orjson; handed to DRF
+        })
+
+
+class ReadPathParityTests(TestCase):
+    """The same endpoint renders identically on the fast and serializer read paths, with either renderer."""
+    urls = ["/api/weather/stations/", "/api/weather/history/", "/api/reports/", "/api/reports/all/"]
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = get_user_model().objects.create_user(email="admin@example.com", role="admin")
+        station = Station.objects.create(name="CMU Campus", latitude=7.85, longitude=125.05)
+        WeatherData.objects.create(station=station, timestamp=timezone.now() - datetime.timedelta(minutes=30),
+                                   temperature=26.5, humidity=80, location_name=station.name,
+                                   latitude=7.85, longitude=125.05)
+        Report.objects.create(user=cls.admin, name="Juan", contact="1", description="Clogged canal",
+                              latitude=7.8, longitude=125.0)
+
+    def test_fast_and_serializer_paths_match(self):
+        client = APIClient()
+        client.force_authenticate(self.admin)
+        for url in self.urls:
+            rendered = set()
+            for fast in (True, False):
+                with override_settings(FAST_READ_SERIALIZERS=fast), self.subTest(url=url, fast=fast):
+                    cache.clear()  # weather responses are cached as rendered bytes
+                    response = client.get(url)
+                    self.assertEqual(response.status_code, 200)
+                    data = json.loads(response.content)
+                    self.assertEqual(ORJSONRenderer().render(response.data), JSONRenderer().render(response.data))
+                    rendered.add(json.dumps(data, sort_keys=True))
+            self.assertEqual(len(rendered), 1, url)
@@ -0,0 +1,218 @@
+"""
+RainSafe Messenger bot: answers weather, rain and forecast questions from
+stored readings only. Replies are built from a cached per-station snapshot,
+so the reply path never calls Open-Meteo.
+"""
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db.models import Max, Min
+from django.utils.timezone import localtime, now
+
+from weather.models import Station, WeatherData
+from .models import Subscription
+from .text import normalize_barangay, tokenize
+
+SNAPSHOT_KEY = "messenger_weather_snapshot"
+SNAPSHOT_TTL = 300  # seconds; ingestion runs hourly
+FORECAST_HOURS = 24
+MAX_STATIONS_IN_REPLY = 5
+
+INTENT_KEYWORDS = {
+    "weather": ("weather", "panahon", "temp", "temperature", "humidity", "wind", "now", "current"),
+    "rain": ("rain", "raining", "ulan", "umbrella", "precipitation", "storm", "bagyo"),
+    "forecast": ("forecast", "tomorrow", "later", "ugma", "next", "week"),
+    "help": ("help", "hi", "hello", "start", "menu"),
+    "subscribe": ("subscribe", "follow", "alerts"),
+    "unsubscribe": ("unsubscribe", "unfollow", "stop"),
+}
+BARANGAY_WORDS = ("barangay", "brgy")
+# token -> intent, built once
+_INTENT_INDEX = {word: intent for intent, words in INTENT_KEYWORDS.items() for word in words}
+
+_TERMINAL = object()
+_trie_cache = {"version": None, "trie": None}
+
+
+def build_snapshot():
+    """Latest observed reading and next-24h outlook for every station (4 queries)."""
+    current = now()
+    stations = {s["id"]: s["name"] for s in Station.objects.values("id", "name")}
+
+    latest_times = (
+        WeatherData.objects.filter(timestamp__lte=current)
+        .values("station_id")
+        .annotate(latest=Max("timestamp"))
+    )
+    latest = {}
+    if latest_times:
+        wanted = {row["station_id"]: row["latest"] for row in latest_times}
+        for row in WeatherData.objects.filter(
+            station_id__in=wanted.keys(), timestamp__in=set(wanted.values())
+        ).values("station_id", "timestamp", "temperature", "humidity", "precipitation_probability", "wind_speed"):
+            if wanted.get(row["station_id"]) == row["timestamp"]:
+                latest[row["station_id"]] = row
+
+    outlook = {
+        row["station_id"]: row
+        for row in WeatherData.objects.filter(
+            timestamp__gt=current, timestamp__lte=current + timedelta(hours=FORECAST_HOURS)
+        )
+        .values("station_id")
+        .annotate(
+            min_temp=Min("temperature"),
+            max_temp=Max("temperature"),
+            max_rain=Max("precipitation_probability"),
+            max_wind=Max("wind_speed"),
+        )
+    }
+
+    return {
+        "version": current.timestamp(),
+        "stations": {
+            station_id: {"name": name, "latest": latest.get(station_id), "outlook": outlook.get(station_id)}
+            for station_id, name in stations.items()
+        },
+    }
+
+
+def get_snapshot():
+    snapshot = cache.get(SNAPSHOT_KEY)
+    if snapshot is None:
+        snapshot = build_snapshot()
+        cache.set(SNAPSHOT_KEY, snapshot, timeout=SNAPSHOT_TTL)
+    return snapshot
+
+
+def _station_trie(snapshot):
+    """Token trie over station names, rebuilt only when the snapshot changes."""
+    if _trie_cache["version"] != snapshot["version"]:
+        trie = {}
+        for station_id, station in snapshot["stations"].items():
+            node = trie
+            for token in tokenize(station["name"]):
+                node = node.setdefault(token, {})
+            node[_TERMINAL] = station_id
+        _trie_cache.update(version=snapshot["version"], trie=trie)
+    return _trie_cache["trie"]
+
+
+def match_station(tokens, trie):
+    """Longest station name appearing in the token list, or None."""
+    best, best_len = None, 0
+    for start in range(len(tokens)):
+        node = trie
+        for end in range(start, len(tokens)):
+            node = node.get(tokens[end])
+            if node is None:
+                break
+            if _TERMINAL in node and end - start + 1 > best_len:
+                best, best_len = node[_TERMINAL], end - start + 1
+    return best
+
+
+def match_intent(tokens):
+    for token in tokens:
+        intent = _INTENT_INDEX.get(token)
+        if intent:
+            return intent
+    return None
+
+
+def _fmt(value, suffix=""):
+    return "n/a" if value is None else f"{value:g}{suffix}"
+
+
+def _weather_line(station):
+    reading = station["latest"]
+    if not reading:
+        return f"🌤️ {station['name']}: no readings yet."
+    return (
+        f"🌤️ {station['name']}: {_fmt(reading['temperature'], '°C')}, "
+        f"humidity {_fmt(reading['humidity'], '%')}, rain chance {_fmt(reading['precipitation_probability'], '%')}, "
+        f"wind {_fmt(reading['wind_speed'], ' km/h')} (as of {localtime(reading['timestamp']):%b %d %H:%M})"
+    )
+
+
+def _rain_line(station):
+    reading, outlook = station["latest"], station["outlook"]
+    now_part = _fmt(reading["precipitation_probability"], "%") if reading else "n/a"
+    later_part = _fmt(outlook["max_rain"], "%") if outlook else "n/a"
+    return f"🌧️ {station['name']}: rain chance now {now_part}, up to {later_part} in the next {FORECAST_HOURS}h"
+
+
+def _forecast_line(station):
+    outlook = station["outlook"]
+    if not outlook:
+        return f"📅 {station['name']}: no forecast stored yet."
+    return (
+        f"📅 {station['name']} next {FORECAST_HOURS}h: {_fmt(outlook['min_temp'])}–{_fmt(outlook['max_temp'], '°C')}, "
+        f"max rain chance {_fmt(outlook['max_rain'], '%')}, max wind {_fmt(outlook['max_wind'], ' km/h')}"
+    )
+
+
+LINE_BUILDERS = {"weather": _weather_line, "rain": _rain_line, "forecast": _forecast_line}
+
+
+def help_text(snapshot):
+    names = ", ".join(station["name"] for station in list(snapshot["stations"].values())[:MAX_STATIONS_IN_REPLY])
+    return (
+        "☔ RainSafe here! Ask me about \"weather\", \"rain\" or \"forecast\", "
+        f"optionally with a station name ({names or 'no stations yet'}). "
+        "Send \"subscribe <station>\" or \"subscribe barangay <name>\" for alerts."
+    )
+
+
+def match_barangay(tokens):
+    """Words after "barangay"/"brgy" in normalize_barangay() form, or ""."""
+    for i, token in enumerate(tokens):
+        if token in BARANGAY_WORDS:
+            return normalize_barangay(" ".join(tokens[i + 1:]))
+    return ""
+
+
+def _subscription_reply(intent, sender_id, station_id, barangay, snapshot):
+    if sender_id is None:
+        return help_text(snapshot)
+    station_name = snapshot["stations"][station_id]["name"] if station_id is not None else None
+
+    if intent == "unsubscribe":
+        subscriptions = Subscription.objects.filter(psid=sender_id)
+        if station_id is not None:
+            subscriptions = subscriptions.filter(station_id=station_id)
+        elif barangay:
+            subscriptions = subscriptions.filter(barangay=barangay)
+        subscriptions.delete()
+        return f"🔕 You won't get alerts for {station_name or barangay.title() or 'any area'} anymore."
+
+    if station_id is not None:
+        Subscription.objects.get_or_create(psid=sender_id, station_id=station_id)
+        return f"🔔 Subscribed to alerts for {station_name}. Send \"stop\" to unsubscribe."
+    if barangay:
+        Subscription.objects.get_or_create(psid=sender_id, barangay=barangay)
+        return f"🔔 Subscribed to alerts for Barangay {barangay.title()}. Send \"stop\" to unsubscribe."
+    return "Tell me what to follow, e.g. \"subscribe <station name>\" or \"subscribe barangay <name>\"."
+
+
+def reply_for(text, sender_id=None):
+    """Build the bot's reply to one incoming message from `sender_id`."""
+    snapshot = get_snapshot()
+    tokens = tokenize(text)
+    station_id = match_station(tokens, _station_trie(snapshot))
+    intent = match_intent(tokens) or ("weather" if station_id else None)
+
+    if intent in ("subscribe", "unsubscribe"):
+        return _subscription_reply(intent, sender_id, station_id, match_barangay(tokens), snapshot)
+
+    if intent is None or intent == "help" or not snapshot["stations"]:
+        return help_text(snapshot)
+
+    build_line = LINE_BUILDERS[intent]
+    if station_id is not None:
+        return build_line(snapshot["stations"][station_id])
+
+    stations = list(snapshot["stations"].values())
+    lines = [build_line(station) for station in stations[:MAX_STATIONS_IN_REPLY]]
+    if len(stations) > MAX_STATIONS_IN_REPLY:
+        lines.append("Send a station name for other stations.")
+    return "\n".join(lines)
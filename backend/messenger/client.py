@@ -0,0 +1,102 @@
+import json
+from urllib.parse import urlencode
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+
+class SendResult:
+    """Outcome of one outbound message."""
+    __slots__ = ("ok", "retryable", "throttled", "error")
+
+    def __init__(self, ok, retryable=False, error="", throttled=False):
+        self.ok = ok
+        self.retryable = retryable
+        self.throttled = throttled
+        self.error = error
+
+
+def _result_for(status_code, body=""):
+    if 200 <= status_code < 300:
+        return SendResult(True)
+    # Throttled or upstream trouble: try again later. Other 4xx are final.
+    throttled = status_code == 429
+    retryable = throttled or status_code >= 500
+    return SendResult(False, retryable, f"HTTP {status_code}: {body[:200]}", throttled)
+
+
+class GraphAPIClient:
+    """
+    Messenger Send API client over one pooled keep-alive session. Several
+    messages are sent as a single Graph batch request.
+    """
+
+    def __init__(self, base_url=None, access_token=None, timeout=None, pool_size=10):
+        self.base_url = (base_url or settings.MESSENGER_GRAPH_URL).rstrip("/")
+        self.access_token = access_token or settings.MESSENGER_PAGE_ACCESS_TOKEN
+        self.timeout = timeout or settings.MESSENGER_SEND_TIMEOUT
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    @staticmethod
+    def _payload(message):
+        return {
+            "recipient": {"id": message.recipient_id},
+            "message": {"text": message.text},
+            "messaging_type": message.messaging_type,
+        }
+
+    def send(self, messages):
+        """Send messages; returns one SendResult per message, in order."""
+        if not messages:
+            return []
+        if not self.access_token:
+            # Fail closed: final, so nothing is retried until a token is configured
+            return [SendResult(False, False, "MESSENGER_PAGE_ACCESS_TOKEN is not set") for _ in messages]
+        try:
+            if len(messages) == 1:
+                return [self._send_one(messages[0])]
+            return self._send_batch(messages)
+        except requests.RequestException as e:
+            return [SendResult(False, True, str(e)) for _ in messages]
+
+    def _send_one(self, message):
+        response = self.session.post(
+            f"{self.base_url}/me/messages",
+            params={"access_token": self.access_token},
+            json=self._payload(message),
+            timeout=self.timeout,
+        )
+        return _result_for(response.status_code, response.text)
+
+    def _send_batch(self, messages):
+        batch = []
+        for message in messages:
+            payload = self._payload(message)
+            batch.append({
+                "method": "POST",
+                "relative_url": "me/messages",
+                "body": urlencode({key: json.dumps(value) if isinstance(value, dict) else value
+                                   for key, value in payload.items()}),
+            })
+
+        response = self.session.post(
+            f"{self.base_url}/",
+            data={"access_token": self.access_token, "batch": json.dumps(batch)},
+            timeout=self.timeout,
+        )
+        if response.status_code != 200:
+            return [_result_for(response.status_code, response.text) for _ in messages]
+
+        results = []
+        for item in response.json():
+            if item is None:
+                # Graph skipped this request (batch timed out): safe to retry
+                results.append(SendResult(False, True, "not processed"))
+            else:
+                results.append(_result_for(item.get("code", 500), item.get("body") or ""))
+        return results
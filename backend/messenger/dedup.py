@@ -0,0 +1,69 @@
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.utils.timezone import now
+
+from .models import ProcessedEvent
+
+CACHE_KEY = "messenger_event_{}"
+
+_last_prune = 0.0
+_prune_lock = threading.Lock()
+
+
+def event_key(event):
+    """Message id when present, otherwise sender + event timestamp."""
+    for field in ("message", "postback", "reaction"):
+        mid = (event.get(field) or {}).get("mid")
+        if mid:
+            return mid
+    sender = event.get("sender", {}).get("id", "")
+    return f"{sender}:{event.get('timestamp', '')}"
+
+
+def claim_event(event):
+    """
+    True if this process is the first to see the event, False for a
+    redelivery. The unique index makes the claim safe across workers; the
+    cache answers repeat redeliveries without touching the DB.
+    """
+    key = event_key(event)
+    cache_key = CACHE_KEY.format(key)
+    if cache.get(cache_key):
+        return False
+
+    ttl = settings.MESSENGER_DEDUP_TTL
+    try:
+        with transaction.atomic():
+            ProcessedEvent.objects.create(event_id=key[:255])
+        claimed = True
+    except IntegrityError:
+        claimed = False
+
+    cache.set(cache_key, 1, timeout=ttl)
+    _maybe_prune(ttl)
+    return claimed
+
+
+def prune_processed_events(ttl=None):
+    """Forget events older than the TTL (Facebook stops retrying long before)."""
+    ttl = settings.MESSENGER_DEDUP_TTL if ttl is None else ttl
+    deleted, _ = ProcessedEvent.objects.filter(created_at__lt=now() - timedelta(seconds=ttl)).delete()
+    return deleted
+
+
+def _maybe_prune(ttl):
+    # At most one prune per TTL/10 per process keeps the table bounded
+    global _last_prune
+    current = time.monotonic()
+    if current - _last_prune < ttl / 10:
+        return
+    with _prune_lock:
+        if current - _last_prune < ttl / 10:
+            return
+        _last_prune = current
+    prune_processed_events(ttl)
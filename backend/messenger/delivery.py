@@ -0,0 +1,211 @@
+"""
+Alert fan-out to Messenger subscribers. Queuing an alert is one INSERT; the
+background worker expands its subscribers into AlertDelivery rows and sends
+them in Graph batch requests over several concurrent connections, all
+drawing from the shared send-rate bucket, so throughput is set by
+MESSENGER_SEND_RATE rather than per-call latency.
+"""
+import logging
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import Count, F, Q
+from django.utils.timezone import now
+
+from .client import GraphAPIClient
+from .models import AlertDelivery, MessengerAlert, Subscription
+from .outbox import OutboundMessage, get_send_bucket
+from .text import normalize_barangay
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 1000
+# How long a sender may go without starting a chunk before another worker
+# (e.g. the deliver_messenger_alerts command) may take the alert over
+LEASE = timedelta(minutes=5)
+
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="messenger-alerts")
+
+
+def subscriber_psids(station=None, barangay=""):
+    queryset = Subscription.objects.none()
+    query = Q()
+    if station is not None:
+        query |= Q(station=station)
+    if barangay:
+        query |= Q(barangay=normalize_barangay(barangay))
+    if query:
+        queryset = Subscription.objects.filter(query)
+    return queryset.values_list("psid", flat=True).distinct()
+
+
+def queue_messenger_alert(text, station=None, barangay=""):
+    """
+    Record an alert for everyone subscribed to `station` or `barangay` and
+    hand it to the background worker after commit, which creates the
+    per-recipient rows. Callers (alert evaluation, on the ingestion path)
+    only pay for an existence check and one INSERT. Returns the
+    MessengerAlert, or None when nobody is subscribed.
+    """
+    if not subscriber_psids(station, barangay).exists():
+        return None
+    alert = MessengerAlert.objects.create(text=text, station=station, barangay=barangay)
+    transaction.on_commit(lambda: _executor.submit(_run, alert.pk))
+    return alert
+
+
+def expand_recipients(alert):
+    """
+    Create a pending AlertDelivery for every current subscriber of the
+    alert's station/barangay. Safe to repeat (unique alert + psid); returns
+    the alert's recipient count.
+    """
+    batch = []
+    for psid in subscriber_psids(alert.station_id, alert.barangay).iterator(chunk_size=CHUNK_SIZE):
+        batch.append(AlertDelivery(alert=alert, psid=psid))
+        if len(batch) >= CHUNK_SIZE:
+            AlertDelivery.objects.bulk_create(batch, ignore_conflicts=True)
+            batch = []
+    AlertDelivery.objects.bulk_create(batch, ignore_conflicts=True)
+
+    total = AlertDelivery.objects.filter(alert=alert).count()
+    MessengerAlert.objects.filter(pk=alert.pk).update(total=total)
+    return total
+
+
+def _send_batch(client, bucket, batch):
+    bucket.acquire(len(batch))
+    return batch, client.send([message for _, message in batch])
+
+
+def _record(results, bucket):
+    """Write a chunk's outcomes with a handful of UPDATEs."""
+    sent, retry, failed = [], [], defaultdict(list)
+    throttled = False
+    for (delivery_id, _), result in results:
+        if result.ok:
+            sent.append(delivery_id)
+        elif result.retryable:
+            retry.append(delivery_id)
+            throttled = throttled or result.throttled
+        else:
+            failed[result.error[:255]].append(delivery_id)
+
+    if throttled:
+        bucket.pause(settings.MESSENGER_RETRY_BACKOFF)
+
+    if sent:
+        AlertDelivery.objects.filter(id__in=sent).update(status="sent", sent_at=now(), attempts=F("attempts") + 1)
+    if retry:
+        AlertDelivery.objects.filter(id__in=retry).update(attempts=F("attempts") + 1)
+    for error, ids in failed.items():
+        AlertDelivery.objects.filter(id__in=ids).update(status="failed", error=error, attempts=F("attempts") + 1)
+
+
+def claim_alert(alert_id):
+    """
+    Take the sending lease on an unfinished alert. Returns the lease's
+    expiry, which the holder passes back to renew it, or None when the alert
+    is done or another worker holds an unexpired lease.
+    """
+    current = now()
+    lease = current + LEASE
+    claimed = MessengerAlert.objects.filter(
+        Q(leased_until__isnull=True) | Q(leased_until__lt=current),
+        pk=alert_id,
+        status__in=["pending", "sending"],
+    ).update(leased_until=lease)
+    return lease if claimed else None
+
+
+def deliver_alert(alert_id, client=None, bucket=None, concurrency=None):
+    """
+    Send every pending delivery of an alert. Retryable failures stay pending
+    and are picked up by the next pass (after a backoff) until they run out
+    of attempts. DB work stays on the calling thread; only HTTP is pooled.
+    Returns None without sending anything unless the lease could be claimed,
+    and stops (returning None) if the lease was lost to another worker.
+    """
+    lease = claim_alert(alert_id)
+    if lease is None:
+        return None
+    held = MessengerAlert.objects.filter(pk=alert_id, leased_until=lease)
+    alert = MessengerAlert.objects.get(pk=alert_id)
+    if alert.status == "pending":
+        # Not started yet (or interrupted while expanding): create the recipients
+        alert.total = expand_recipients(alert)
+    concurrency = concurrency or settings.MESSENGER_SEND_CONCURRENCY
+    client = client or GraphAPIClient(pool_size=concurrency)
+    bucket = bucket or get_send_bucket()
+    batch_size = settings.MESSENGER_SEND_BATCH
+    max_attempts = settings.MESSENGER_SEND_RETRIES + 1
+
+    MessengerAlert.objects.filter(pk=alert.pk).update(status="sending")
+    pending = AlertDelivery.objects.filter(alert=alert, status="pending", attempts__lt=max_attempts)
+
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="messenger-send") as pool:
+        for attempt in range(max_attempts):
+            if attempt:
+                time.sleep(settings.MESSENGER_RETRY_BACKOFF * 2 ** (attempt - 1))
+
+            last_id = 0
+            while True:
+                chunk = list(pending.filter(id__gt=last_id).order_by("id").values_list("id", "psid")[:CHUNK_SIZE])
+                if not chunk:
+                    break
+                last_id = chunk[-1][0]
+
+                # Renew only a lease this worker still holds, before sending anything
+                renewed = now() + LEASE
+                if not held.update(leased_until=renewed):
+                    logger.warning("Messenger alert %s: lease lost to another worker, stopping", alert.pk)
+                    return None
+                held = MessengerAlert.objects.filter(pk=alert.pk, leased_until=renewed)
+
+                messages = [
+                    (delivery_id, OutboundMessage(psid, alert.text, messaging_type="UPDATE"))
+                    for delivery_id, psid in chunk
+                ]
+                futures = [
+                    pool.submit(_send_batch, client, bucket, messages[i:i + batch_size])
+                    for i in range(0, len(messages), batch_size)
+                ]
+                results = []
+                for future in futures:
+                    batch, batch_results = future.result()
+                    results.extend(zip(batch, batch_results))
+                _record(results, bucket)
+
+            if not pending.exists():
+                break
+
+    with transaction.atomic():
+        if not held.update(leased_until=now() + LEASE):
+            logger.warning("Messenger alert %s: lease lost to another worker, stopping", alert.pk)
+            return None
+        # Whatever is still pending has used up its attempts
+        AlertDelivery.objects.filter(alert=alert, status="pending").update(status="failed", error="Retries exhausted")
+
+        counts = dict(
+            AlertDelivery.objects.filter(alert=alert).values_list("status").annotate(n=Count("id")).values_list("status", "n")
+        )
+        MessengerAlert.objects.filter(pk=alert.pk).update(
+            status="done", sent=counts.get("sent", 0), failed=counts.get("failed", 0), completed_at=now(),
+            leased_until=None,
+        )
+    alert.refresh_from_db()
+    return alert
+
+
+def _run(alert_id):
+    close_old_connections()
+    try:
+        deliver_alert(alert_id)
+    except Exception:
+        logger.exception("Messenger alert %s delivery failed", alert_id)
+    finally:
+        close_old_connections()
@@ -0,0 +1,105 @@
+"""
+Local stand-in for the Graph API Send endpoints, for exercising the outbox
+without Facebook. Point MESSENGER_GRAPH_URL at FakeGraphAPI.url (any
+MESSENGER_PAGE_ACCESS_TOKEN will do).
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+
+class FakeGraphAPI:
+    """
+    Accepts POST /me/messages (JSON) and Graph batch POST / (form-encoded),
+    recording every delivered message. `latency` (seconds) is added per HTTP
+    request; `fail_every` makes every Nth message return HTTP 500.
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, fail_every=0):
+        self.latency = latency
+        self.fail_every = fail_every
+        self.messages = []
+        self.requests = 0
+        self.lock = threading.Lock()
+        self.server = ThreadingHTTPServer((host, port), self._handler_class())
+        self.server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _deliver(self, payload):
+        """Record one message; returns the HTTP code Graph would give it."""
+        with self.lock:
+            count = len(self.messages) + 1
+            if self.fail_every and count % self.fail_every == 0:
+                self.messages.append(None)  # keeps the failure cadence
+                return 500
+            self.messages.append(payload)
+            return 200
+
+    @property
+    def delivered(self):
+        with self.lock:
+            return [m for m in self.messages if m is not None]
+
+    def _handler_class(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, code, body):
+                data = json.dumps(body).encode()
+                self.send_response(code)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_POST(self):
+                raw = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                with fake.lock:
+                    fake.requests += 1
+                if fake.latency:
+                    time.sleep(fake.latency)
+
+                path = self.path.split("?", 1)[0].rstrip("/")
+                if path.endswith("/me/messages"):
+                    code = fake._deliver(json.loads(raw))
+                    return self._reply(code, {"message_id": "m_fake"} if code == 200 else {"error": {}})
+
+                if path == "" or path.count("/") <= 1:
+                    form = parse_qs(raw.decode())
+                    results = []
+                    for item in json.loads(form["batch"][0]):
+                        body = {k: v[0] for k, v in parse_qs(item.get("body", "")).items()}
+                        payload = {k: json.loads(v) if k in ("recipient", "message") else v
+                                   for k, v in body.items()}
+                        code = fake._deliver(payload)
+                        results.append({"code": code, "body": json.dumps({"message_id": "m_fake"})})
+                    return self._reply(200, results)
+
+                self._reply(404, {"error": {"message": "Unknown path"}})
+
+        return Handler
@@ -0,0 +1,38 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import close_old_connections
+
+from .bot import reply_for
+from .dedup import claim_event
+from .outbox import get_outbox
+
+logger = logging.getLogger(__name__)
+
+# Webhook events are handled here, after Facebook already got its 200
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="messenger-events")
+
+
+def handle_event(event):
+    sender_id = event.get("sender", {}).get("id")
+    message = event.get("message") or {}
+    text = message.get("text", "")
+    if sender_id and text and not message.get("is_echo"):
+        get_outbox().send(sender_id, reply_for(text, sender_id))
+
+
+def _handle_events(events):
+    close_old_connections()
+    try:
+        for event in events:
+            try:
+                if claim_event(event):  # skip Facebook redeliveries
+                    handle_event(event)
+            except Exception:
+                logger.exception("Failed to handle Messenger event")
+    finally:
+        close_old_connections()
+
+
+def enqueue_events(events):
+    return _executor.submit(_handle_events, events)
@@ -0,0 +1,44 @@
+import itertools
+import time
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+
+from messenger.bot import SNAPSHOT_KEY, get_snapshot, reply_for
+
+SAMPLE_MESSAGES = [
+    "weather",
+    "will it rain later?",
+    "forecast please",
+    "hello",
+    "what's the temperature now",
+    "ulan ba ugma",
+]
+
+
+class Command(BaseCommand):
+    help = "Benchmark Messenger bot replies/sec against the stored weather snapshot"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--replies", type=int, default=20000)
+
+    def handle(self, *args, **options):
+        cache.delete(SNAPSHOT_KEY)
+        start = time.perf_counter()
+        snapshot = get_snapshot()
+        build_ms = (time.perf_counter() - start) * 1000
+
+        # Mix in station-specific questions
+        names = [station["name"] for station in snapshot["stations"].values()][:5]
+        messages = SAMPLE_MESSAGES + [f"rain in {name}" for name in names] + [f"{name} forecast" for name in names]
+
+        count = options["replies"]
+        start = time.perf_counter()
+        for text in itertools.islice(itertools.cycle(messages), count):
+            reply_for(text)
+        elapsed = time.perf_counter() - start
+
+        self.stdout.write(f"stations: {len(snapshot['stations'])}")
+        self.stdout.write(f"snapshot build (cold): {build_ms:.1f} ms")
+        self.stdout.write(f"replies/sec (warm): {count / elapsed:,.0f}")
+        self.stdout.write(f"µs/reply: {elapsed * 1e6 / count:.1f}")
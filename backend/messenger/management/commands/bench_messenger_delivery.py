@@ -0,0 +1,46 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from messenger.client import GraphAPIClient
+from messenger.delivery import deliver_alert
+from messenger.fake_graph import FakeGraphAPI
+from messenger.models import AlertDelivery, MessengerAlert
+from messenger.outbox import TokenBucket
+
+
+class Command(BaseCommand):
+    help = "Deliver a synthetic alert to N recipients through a local fake Graph API"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--recipients", type=int, default=10000)
+        parser.add_argument("--rate", type=float, default=1000.0, help="Send rate limit (messages/sec)")
+        parser.add_argument("--latency", type=float, default=0.2, help="Fake Graph API latency per request (s)")
+        parser.add_argument("--concurrency", type=int, default=4)
+        parser.add_argument("--fail-every", type=int, default=0, help="Fail every Nth message with HTTP 500")
+
+    def handle(self, *args, **options):
+        count = options["recipients"]
+        with FakeGraphAPI(latency=options["latency"], fail_every=options["fail_every"]) as fake, transaction.atomic():
+            alert = MessengerAlert.objects.create(text="⚠️ Benchmark alert", total=count)
+            AlertDelivery.objects.bulk_create(
+                [AlertDelivery(alert=alert, psid=f"bench-{i}") for i in range(count)], batch_size=2000
+            )
+
+            start = time.perf_counter()
+            alert = deliver_alert(
+                alert.pk,
+                client=GraphAPIClient(base_url=fake.url, access_token="fake-page-token", pool_size=options["concurrency"]),
+                bucket=TokenBucket(options["rate"]),
+                concurrency=options["concurrency"],
+            )
+            elapsed = time.perf_counter() - start
+            requests_made = fake.requests
+
+            # Leave no benchmark rows behind
+            transaction.set_rollback(True)
+
+        self.stdout.write(f"sent {alert.sent}, failed {alert.failed} of {count} in {elapsed:.2f}s")
+        self.stdout.write(f"graph requests: {requests_made}")
+        self.stdout.write(f"throughput: {alert.sent / elapsed:,.0f} msg/s (limit {options['rate']:,.0f} msg/s)")
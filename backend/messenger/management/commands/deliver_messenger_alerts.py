@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from messenger.delivery import deliver_alert
+from messenger.models import MessengerAlert
+
+
+class Command(BaseCommand):
+    help = "Deliver (or resume) Messenger alerts that have pending recipients"
+
+    def handle(self, *args, **kwargs):
+        queue = MessengerAlert.objects.exclude(status="done").order_by("id")
+        for alert_id in queue.values_list("id", flat=True):
+            alert = deliver_alert(alert_id)
+            if alert is None:
+                self.stdout.write(f"Alert {alert_id}: being sent by another worker, skipped")
+                continue
+            self.stdout.write(self.style.SUCCESS(
+                f"Alert {alert.pk}: sent {alert.sent}, failed {alert.failed} of {alert.total}"
+            ))
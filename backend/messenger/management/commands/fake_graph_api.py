@@ -0,0 +1,25 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from messenger.fake_graph import FakeGraphAPI
+
+
+class Command(BaseCommand):
+    help = "Run a local fake Graph API (set MESSENGER_GRAPH_URL to its URL and any MESSENGER_PAGE_ACCESS_TOKEN)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--port", type=int, default=8765)
+        parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to each request")
+        parser.add_argument("--fail-every", type=int, default=0, help="Fail every Nth message with HTTP 500")
+
+    def handle(self, *args, **options):
+        fake = FakeGraphAPI(port=options["port"], latency=options["latency"], fail_every=options["fail_every"])
+        fake.start()
+        self.stdout.write(self.style.SUCCESS(f"Fake Graph API listening on {fake.url}"))
+        try:
+            while True:
+                time.sleep(5)
+                self.stdout.write(f"requests={fake.requests} messages={len(fake.delivered)}")
+        except KeyboardInterrupt:
+            fake.stop()
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from messenger.dedup import prune_processed_events
+
+
+class Command(BaseCommand):
+    help = "Delete processed Messenger event ids older than MESSENGER_DEDUP_TTL"
+
+    def handle(self, *args, **kwargs):
+        deleted = prune_processed_events()
+        self.stdout.write(self.style.SUCCESS(f"Pruned {deleted} processed events"))
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.3 on 2026-10-19 20:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('messenger', '0002_subscriptions_and_alert_delivery'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='messengeralert',
+            name='leased_until',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
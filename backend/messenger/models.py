@@ -1,3 +1,88 @@
 from django.db import models
 
-# Create your models here.
+
+class ProcessedEvent(models.Model):
+    """Webhook events already handled, keyed by message id (pruned after a TTL)."""
+    event_id = models.CharField(max_length=255, unique=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    def __str__(self):
+        return self.event_id
+
+
+class Subscription(models.Model):
+    """A Messenger user (page-scoped id) following a station or a barangay."""
+    psid = models.CharField(max_length=64, db_index=True)
+    station = models.ForeignKey(
+        "weather.Station", on_delete=models.CASCADE, null=True, blank=True,
+        related_name="messenger_subscriptions",
+    )
+    barangay = models.CharField(max_length=100, blank=True, db_index=True)  # stored lowercase
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["psid", "station"], condition=models.Q(station__isnull=False),
+                name="unique_station_subscription",
+            ),
+            models.UniqueConstraint(
+                fields=["psid", "barangay"], condition=~models.Q(barangay=""),
+                name="unique_barangay_subscription",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.psid} -> {self.station_id or self.barangay}"
+
+
+class MessengerAlert(models.Model):
+    """One alert fanned out to Messenger subscribers, with delivery totals."""
+    STATUS_CHOICES = [
+        ("pending", "Pending"),
+        ("sending", "Sending"),
+        ("done", "Done"),
+    ]
+
+    text = models.TextField()
+    station = models.ForeignKey(
+        "weather.Station", on_delete=models.SET_NULL, null=True, blank=True, related_name="+"
+    )
+    barangay = models.CharField(max_length=100, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="pending")
+    total = models.PositiveIntegerField(default=0)
+    sent = models.PositiveIntegerField(default=0)
+    failed = models.PositiveIntegerField(default=0)
+    leased_until = models.DateTimeField(null=True, blank=True)  # held by the worker sending it
+    created_at = models.DateTimeField(auto_now_add=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"Messenger alert {self.pk} ({self.status})"
+
+
+class AlertDelivery(models.Model):
+    """Per-recipient delivery state for a MessengerAlert."""
+    STATUS_CHOICES = [
+        ("pending", "Pending"),
+        ("sent", "Sent"),
+        ("failed", "Failed"),
+    ]
+
+    alert = models.ForeignKey(MessengerAlert, on_delete=models.CASCADE, related_name="deliveries")
+    psid = models.CharField(max_length=64)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="pending")
+    attempts = models.PositiveSmallIntegerField(default=0)
+    error = models.CharField(max_length=255, blank=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["alert", "psid"], name="unique_alert_delivery"),
+        ]
+        indexes = [
+            models.Index(fields=["alert", "status", "id"], name="delivery_pending_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.alert_id} -> {self.psid} ({self.status})"
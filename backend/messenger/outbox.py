@@ -0,0 +1,158 @@
+import logging
+import queue
+import threading
+import time
+
+from django.conf import settings
+
+from .client import GraphAPIClient, SendResult
+
+logger = logging.getLogger(__name__)
+
+
+class OutboundMessage:
+    __slots__ = ("recipient_id", "text", "messaging_type", "attempts", "on_result")
+
+    def __init__(self, recipient_id, text, messaging_type="RESPONSE", on_result=None):
+        self.recipient_id = recipient_id
+        self.text = text
+        self.messaging_type = messaging_type
+        self.attempts = 0
+        self.on_result = on_result  # called with (message, SendResult) once final
+
+
+class TokenBucket:
+    """Blocking token bucket: `rate` tokens/sec, bursts up to `capacity`."""
+
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity or max(rate, 1))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.lock = threading.Lock()
+
+    def pause(self, seconds):
+        """Stop handing out tokens for a while (e.g. after HTTP 429)."""
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+    def acquire(self, n=1):
+        """Block until `n` tokens were taken (n may exceed the capacity)."""
+        with self.lock:
+            while True:
+                current = time.monotonic()
+                if current < self.paused_until:
+                    time.sleep(self.paused_until - current)
+                    continue
+                self.tokens = min(self.capacity, self.tokens + (current - self.updated) * self.rate)
+                self.updated = current
+                if self.tokens >= n:
+                    self.tokens -= n
+                    return
+                if self.tokens >= self.capacity:
+                    # Bucket is full but n is larger: take it all, wait for the rest
+                    n -= self.tokens
+                    self.tokens = 0.0
+                time.sleep((min(n, self.capacity) - self.tokens) / self.rate)
+
+
+class Outbox:
+    """
+    Queue of outgoing Messenger messages drained by one sender thread, so
+    request handlers never wait on the Graph API. The sender groups up to
+    `batch_size` queued messages per Graph request, stays under `rate`
+    messages/sec and retries throttled/failed sends with backoff.
+    """
+
+    def __init__(self, client=None, rate=None, batch_size=None, max_retries=None, backoff=None):
+        self.client = client or GraphAPIClient()
+        self.bucket = TokenBucket(rate) if rate else get_send_bucket()
+        self.batch_size = batch_size or settings.MESSENGER_SEND_BATCH
+        self.max_retries = settings.MESSENGER_SEND_RETRIES if max_retries is None else max_retries
+        self.backoff = backoff or settings.MESSENGER_RETRY_BACKOFF
+        self.queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def send(self, recipient_id, text, **kwargs):
+        self.queue.put(OutboundMessage(recipient_id, text, **kwargs))
+        self._ensure_started()
+
+    def join(self):
+        """Block until every queued message (including retries) is final."""
+        self.queue.join()
+
+    def _ensure_started(self):
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="messenger-outbox", daemon=True)
+                    self._thread.start()
+
+    def _next_batch(self):
+        batch = [self.queue.get()]
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            try:
+                self.bucket.acquire(len(batch))
+                results = self.client.send(batch)
+            except Exception as e:  # never let the sender thread die
+                logger.exception("Messenger send failed")
+                results = [SendResult(False, True, str(e)) for _ in batch]
+            for message, result in zip(batch, results):
+                self._settle(message, result)
+
+    def _settle(self, message, result):
+        if result.throttled:
+            self.bucket.pause(self.backoff)
+        if not result.ok and result.retryable and message.attempts < self.max_retries:
+            message.attempts += 1
+            delay = self.backoff * (2 ** (message.attempts - 1))
+            threading.Timer(delay, self._requeue, [message]).start()
+            return
+
+        if not result.ok:
+            logger.warning("Messenger send to %s failed: %s", message.recipient_id, result.error)
+        if message.on_result:
+            try:
+                message.on_result(message, result)
+            except Exception:
+                logger.exception("Messenger result callback failed")
+        self.queue.task_done()
+
+    def _requeue(self, message):
+        self.queue.put(message)
+        self.queue.task_done()  # the original get() for this message
+
+
+_outbox = None
+_bucket = None
+_outbox_lock = threading.RLock()  # get_outbox() -> Outbox() -> get_send_bucket()
+
+
+def get_send_bucket():
+    """Process-wide MESSENGER_SEND_RATE limiter shared by every sender."""
+    global _bucket
+    if _bucket is None:
+        with _outbox_lock:
+            if _bucket is None:
+                _bucket = TokenBucket(settings.MESSENGER_SEND_RATE)
+    return _bucket
+
+
+def get_outbox():
+    """Process-wide Outbox, created on first use."""
+    global _outbox
+    if _outbox is None:
+        with _outbox_lock:
+            if _outbox is None:
+                _outbox = Outbox()
+    return _outbox
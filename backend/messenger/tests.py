@@ -1,3 +1,274 @@
-from django.test import TestCase
+import hashlib
+import hmac
+import json
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+
+from weather.alerts import evaluate_alert_rules, load_active_rules
+from weather.models import AlertRule, Station
+from . import delivery
+from .bot import reply_for
+from .client import GraphAPIClient, SendResult
+from .dedup import claim_event, event_key
+from .delivery import _run, claim_alert, deliver_alert, expand_recipients, queue_messenger_alert
+from .fake_graph import FakeGraphAPI
+from .handlers import _handle_events
+from .models import AlertDelivery, MessengerAlert, ProcessedEvent, Subscription
+from .outbox import OutboundMessage, Outbox, TokenBucket
+from .text import normalize_barangay
+
+
+class BarangaySubscriptionTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_normalize_keeps_unicode_letters(self):
+        self.assertEqual(normalize_barangay("  Sto.  NIÑO - Poblacion "), "sto niño poblacion")
+        self.assertEqual(normalize_barangay("Sto. Nin\u0303o"), "sto niño")  # decomposed ñ
+
+    def test_subscribe_then_deliver(self):
+        reply = reply_for("subscribe brgy Sto. Niño-Poblacion", sender_id="psid-1")
+        self.assertIn("Barangay Sto Niño Poblacion", reply)
+        self.assertEqual(Subscription.objects.get().barangay, "sto niño poblacion")
+
+        alert = queue_messenger_alert("⚠️ Flood warning", barangay="STO.  NIÑO - POBLACION")
+        self.assertIsNotNone(alert)
+        self.assertEqual(expand_recipients(alert), 1)
+        self.assertEqual(list(alert.deliveries.values_list("psid", flat=True)), ["psid-1"])
+
+        reply_for("stop brgy sto niño poblacion", sender_id="psid-1")
+        self.assertFalse(Subscription.objects.exists())
+        self.assertIsNone(queue_messenger_alert("⚠️ Flood warning", barangay="Sto. Niño-Poblacion"))
+
+
+class AlertFanOutTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.station = Station.objects.create(name="Maramag", latitude=7.76, longitude=125.0)
+        Subscription.objects.create(psid="by-station", station=cls.station)
+        Subscription.objects.create(psid="by-barangay", barangay="poblacion")
+        Subscription.objects.create(psid="both", station=cls.station)
+        Subscription.objects.create(psid="both", barangay="poblacion")
+        AlertRule.objects.create(name="Heavy rain", station=cls.station, barangay="Poblacion",
+                                 metric="precipitation_probability", threshold=70)
+
+    @mock.patch("weather.alerts.schedule_broadcast")
+    def test_emitted_alert_queues_deliveries_after_commit(self, schedule_broadcast):
+        reading = timezone.now().replace(minute=0, second=0, microsecond=0)
+        with self.captureOnCommitCallbacks() as callbacks:
+            fired = evaluate_alert_rules(self.station, [reading], {"precipitation_probability": [85]},
+                                         load_active_rules())
+            # Only the alert row is written on the ingestion path
+            self.assertEqual(len(fired), 1)
+            self.assertEqual(MessengerAlert.objects.count(), 1)
+            self.assertFalse(AlertDelivery.objects.exists())
+
+        alert = MessengerAlert.objects.get()
+        with mock.patch("messenger.delivery._executor") as executor:
+            for callback in callbacks:
+                callback()
+        executor.submit.assert_called_once_with(_run, alert.pk)
+
+        # What the worker does first: one delivery per distinct subscriber, idempotently
+        self.assertEqual(expand_recipients(alert), 3)
+        self.assertEqual(expand_recipients(alert), 3)
+        self.assertEqual(set(alert.deliveries.values_list("psid", flat=True)), {"by-station", "by-barangay", "both"})
+
+    def test_command_skips_alerts_leased_by_another_worker(self):
+        alert = MessengerAlert.objects.create(text="Heavy rain", station=self.station)
+        self.assertTrue(claim_alert(alert.pk))  # e.g. the in-process executor mid-send
+
+        out = StringIO()
+        call_command("deliver_messenger_alerts", stdout=out)
+        alert.refresh_from_db()
+        self.assertEqual(alert.status, "pending")
+        self.assertFalse(alert.deliveries.exists())
+        self.assertIn(f"Alert {alert.pk}: being sent by another worker, skipped", out.getvalue())
+
+    def test_stops_sending_after_losing_the_lease(self):
+        alert = MessengerAlert.objects.create(text="Heavy rain", station=self.station, barangay="poblacion")
+        takeover = timezone.now() + timedelta(hours=1)
+
+        record = delivery._record
+
+        def record_and_take_over(results, bucket):
+            # The first chunk outlives the lease and another worker claims the alert
+            record(results, bucket)
+            MessengerAlert.objects.filter(pk=alert.pk).update(leased_until=takeover)
+
+        client = mock.Mock(send=mock.Mock(side_effect=lambda messages: [SendResult(True) for _ in messages]))
+        with mock.patch("messenger.delivery.CHUNK_SIZE", 2), \
+                mock.patch("messenger.delivery._record", side_effect=record_and_take_over):
+            self.assertIsNone(deliver_alert(alert.pk, client=client, bucket=TokenBucket(10000), concurrency=1))
+        client.send.assert_called_once()
+        alert.refresh_from_db()
+        self.assertEqual((alert.status, alert.leased_until), ("sending", takeover))
+        self.assertEqual(alert.deliveries.filter(status="sent").count(), 2)
+        self.assertEqual(alert.deliveries.filter(status="pending").count(), 1)
+
+
+class EventDedupTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_repeated_mid_is_claimed_once(self):
+        event = {"sender": {"id": "psid-1"}, "timestamp": 1, "message": {"mid": "m.1", "text": "rain"}}
+        self.assertTrue(claim_event(event))
+        self.assertFalse(claim_event(dict(event, timestamp=2)))  # redelivery: same mid
+        cache.clear()
+        self.assertFalse(claim_event(event))  # the table still knows it
+        self.assertEqual(ProcessedEvent.objects.count(), 1)
+
+    def test_events_without_mid_key_on_sender_and_timestamp(self):
+        event = {"sender": {"id": "psid-1"}, "timestamp": 1700000000000, "read": {"watermark": 1}}
+        self.assertEqual(event_key(event), "psid-1:1700000000000")
+        self.assertTrue(claim_event(event))
+        self.assertFalse(claim_event(event))
+        self.assertTrue(claim_event(dict(event, timestamp=1700000000001)))
+
+    def test_redelivered_message_is_answered_once(self):
+        event = {"sender": {"id": "psid-1"}, "message": {"mid": "m.2", "text": "help"}}
+        with mock.patch("messenger.handlers.get_outbox") as get_outbox:
+            _handle_events([event, event])
+        get_outbox.return_value.send.assert_called_once()
+
+
+class SubscriptionCommandTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.station = Station.objects.create(name="CMU Campus", latitude=7.85, longitude=125.05)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_subscribe_and_unsubscribe_station(self):
+        self.assertIn("Subscribed to alerts for CMU Campus", reply_for("Subscribe cmu campus", sender_id="p1"))
+        reply_for("follow CMU campus please", sender_id="p1")  # idempotent
+        self.assertEqual(list(Subscription.objects.values_list("psid", "station", "barangay")),
+                         [("p1", self.station.pk, "")])
+
+        self.assertIn("won't get alerts for CMU Campus", reply_for("unsubscribe cmu campus", sender_id="p1"))
+        self.assertFalse(Subscription.objects.exists())
+
+    def test_stop_alone_removes_every_subscription(self):
+        reply_for("subscribe cmu campus", sender_id="p1")
+        reply_for("subscribe brgy Poblacion", sender_id="p1")
+        reply_for("subscribe barangay Dologon", sender_id="p2")
+        self.assertEqual(Subscription.objects.filter(psid="p1").count(), 2)
+
+        self.assertIn("any area", reply_for("stop", sender_id="p1"))
+        self.assertEqual(list(Subscription.objects.values_list("psid", "barangay")), [("p2", "dologon")])
+
+    def test_subscribe_needs_a_target_and_a_sender(self):
+        self.assertIn("Tell me what to follow", reply_for("subscribe", sender_id="p1"))
+        self.assertIn("Tell me what to follow", reply_for("subscribe brgy", sender_id="p1"))
+        self.assertIn("RainSafe here", reply_for("subscribe cmu campus"))
+        self.assertFalse(Subscription.objects.exists())
+
+
+@override_settings(MESSENGER_VERIFY_TOKEN="verify-me", MESSENGER_APP_SECRET="app-secret")
+class WebhookTests(TestCase):
+    url = "/api/messenger/webhook/"
+
+    def post(self, body, signature=None):
+        raw = json.dumps(body).encode() if not isinstance(body, bytes) else body
+        if signature is None:
+            signature = "sha256=" + hmac.new(b"app-secret", raw, hashlib.sha256).hexdigest()
+        return self.client.post(self.url, raw, content_type="application/json",
+                                HTTP_X_HUB_SIGNATURE_256=signature, HTTP_HOST="127.0.0.1")
+
+    def test_verification(self):
+        params = {"hub.mode": "subscribe", "hub.challenge": "1158201444"}
+        response = self.client.get(self.url, {**params, "hub.verify_token": "verify-me"}, HTTP_HOST="127.0.0.1")
+        self.assertEqual((response.status_code, response.content), (200, b"1158201444"))
+        response = self.client.get(self.url, {**params, "hub.verify_token": "guess"}, HTTP_HOST="127.0.0.1")
+        self.assertEqual(response.status_code, 403)
+
+    @mock.patch("messenger.views.enqueue_events")
+    def test_post_hands_events_to_the_worker(self, enqueue_events):
+        event = {"sender": {"id": "p1"}, "message": {"mid": "m.1", "text": "rain"}}
+        body = {"object": "page", "entry": [{"messaging": [event]}, {"messaging": [event]}]}
+        self.assertEqual(self.post(body).status_code, 200)
+        enqueue_events.assert_called_once_with([event, event])
+
+    @mock.patch("messenger.views.enqueue_events")
+    def test_post_rejects_bad_requests(self, enqueue_events):
+        body = {"object": "page", "entry": []}
+        self.assertEqual(self.post(body, signature="sha256=00").status_code, 403)
+        self.assertEqual(self.post(body, signature="").status_code, 403)
+        self.assertEqual(self.post(b"{not json").status_code, 400)
+        self.assertEqual(self.post({"object": "user"}).status_code, 400)
+        enqueue_events.assert_not_called()
+
+
+class FakeClock:
+    """Stands in for the time module: sleep() advances monotonic()."""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = 0.0
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+        self.slept += seconds
+
+
+class TokenBucketTests(SimpleTestCase):
+    def setUp(self):
+        patcher = mock.patch("messenger.outbox.time", FakeClock())
+        self.clock = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_burst_then_rate(self):
+        bucket = TokenBucket(rate=10, capacity=5)
+        bucket.acquire(5)
+        self.assertEqual(self.clock.slept, 0)
+        bucket.acquire(2)
+        self.assertAlmostEqual(self.clock.slept, 0.2)
+
+    def test_request_larger_than_capacity(self):
+        bucket = TokenBucket(rate=10, capacity=5)
+        bucket.acquire(12)  # 5 now, 7 more at 10/s
+        self.assertAlmostEqual(self.clock.slept, 0.7)
+
+    def test_pause(self):
+        bucket = TokenBucket(rate=10)
+        bucket.pause(3)
+        bucket.acquire(1)
+        self.assertAlmostEqual(self.clock.slept, 3)
+
+
+@override_settings(MESSENGER_SEND_BATCH=50, MESSENGER_SEND_RETRIES=0)
+class GraphBatchingTests(TestCase):
+    def test_outbox_batches_up_to_the_graph_limit(self):
+        outbox = Outbox(client=mock.Mock(), rate=1000)
+        for i in range(120):
+            outbox.queue.put(OutboundMessage(f"p{i}", "hi"))
+        self.assertEqual([len(outbox._next_batch()) for _ in range(3)], [50, 50, 20])
+
+    def test_alert_delivery_splits_into_graph_batches(self):
+        alert = MessengerAlert.objects.create(text="⚠️ Flood warning", barangay="poblacion")
+        Subscription.objects.bulk_create(Subscription(psid=f"p{i}", barangay="poblacion") for i in range(120))
+
+        with FakeGraphAPI() as graph:
+            client = GraphAPIClient(base_url=graph.url, access_token="fake-page-token")
+            alert = deliver_alert(alert.pk, client=client, bucket=TokenBucket(10000), concurrency=2)
+            self.assertEqual(graph.requests, 3)  # 50 + 50 + 20
+            self.assertEqual(len(graph.delivered), 120)
+        self.assertEqual((alert.status, alert.total, alert.sent, alert.failed), ("done", 120, 120, 0))
+
+    @override_settings(MESSENGER_PAGE_ACCESS_TOKEN="")
+    def test_nothing_is_sent_without_a_page_token(self):
+        with FakeGraphAPI() as graph:
+            results = GraphAPIClient(base_url=graph.url).send([OutboundMessage("p1", "hi")])
+            self.assertEqual(graph.requests, 0)
+        self.assertFalse(results[0].ok or results[0].retryable)
@@ -0,0 +1,20 @@
+"""
+Text normalization shared by the bot (what users type) and alert delivery
+(barangay names on alert rules), so both sides store and look up the same
+form. Unicode letters are kept: "Sto. Niño" and "sto  niño" both become
+"sto niño".
+"""
+import re
+import unicodedata
+
+_TOKEN_RE = re.compile(r"[^\W_]+")  # runs of Unicode letters/digits
+
+
+def tokenize(text):
+    # NFC first: a decomposed "ñ" (n + combining tilde) would otherwise split the word
+    return _TOKEN_RE.findall(unicodedata.normalize("NFC", text).casefold())
+
+
+def normalize_barangay(name):
+    """Canonical Subscription.barangay form: lowercase words joined by single spaces."""
+    return " ".join(tokenize(name or ""))
@@ -1,13 +1,21 @@
+import hashlib
+import hmac
 import json
-import requests
-from django.http import HttpResponse, JsonResponse
+from django.conf import settings
+from django.http import HttpResponse
 from django.views.decorators.csrf import csrf_exempt
+from .handlers import enqueue_events
+from .outbox import get_outbox
 
-# 🔐 This must match your VERIFY_TOKEN in Facebook setup
-VERIFY_TOKEN = "rainsafe_verify_token"
 
-# ⚙️ You’ll get this later when connecting your Page (Step 6)
-PAGE_ACCESS_TOKEN = "EAAVuhEtZCLEMBPq1hPYa2DqOf7XPihPBZBpyNejKhDYZCWKeOSg2Di7k6Won0xqghYecep2UmBLMNpswEGbZAEc7cG2x7mtdHxAeSZConjLEnP93AOn6NZBVpZBp3NRNNF58gMqPTWaYZCxNYIZAigrfONOfZAd0TWh2NJqQoOn4hMrI6iHh9Ta7TjoVvaWBA19XbTXuD5"
+def _valid_signature(request):
+    """Check X-Hub-Signature-256 when an app secret is configured."""
+    secret = settings.MESSENGER_APP_SECRET
+    if not secret:
+        return True
+    expected = "sha256=" + hmac.new(secret.encode(), request.body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, request.headers.get("X-Hub-Signature-256", ""))
+
 
 @csrf_exempt
 def webhook(request):
@@ -15,26 +23,32 @@ def webhook(request):
         # Facebook verification step
         verify_token = request.GET.get("hub.verify_token")
         challenge = request.GET.get("hub.challenge")
-        if verify_token == VERIFY_TOKEN:
+        if verify_token == settings.MESSENGER_VERIFY_TOKEN:
             return HttpResponse(challenge)
         else:
             return HttpResponse("Invalid verification token", status=403)
 
     elif request.method == "POST":
-        # Handle incoming messages or events
-        data = json.loads(request.body.decode("utf-8"))
-        print("📩 Received webhook event:", json.dumps(data, indent=2))
-
-        if "entry" in data:
-            for entry in data["entry"]:
-                if "messaging" in entry:
-                    for message_event in entry["messaging"]:
-                        sender_id = message_event["sender"]["id"]
-
-                        if "message" in message_event:
-                            text = message_event["message"].get("text", "")
-                            if text:
-                                reply_to_user(sender_id, f"☔ RainSafe here! You said: {text}")
+        # Validate and hand the events to the background handler; Facebook
+        # only needs a fast 200, replies are sent from the outbox.
+        if not _valid_signature(request):
+            return HttpResponse("Invalid signature", status=403)
+
+        try:
+            data = json.loads(request.body.decode("utf-8"))
+        except (UnicodeDecodeError, ValueError):
+            return HttpResponse("Invalid JSON", status=400)
+
+        if not isinstance(data, dict) or data.get("object") != "page":
+            return HttpResponse("Unsupported object", status=400)
+
+        events = [
+            message_event
+            for entry in data.get("entry", [])
+            for message_event in entry.get("messaging", [])
+        ]
+        if events:
+            enqueue_events(events)
 
         return HttpResponse(status=200)
 
@@ -42,14 +56,8 @@ def webhook(request):
 
 
 def reply_to_user(recipient_id, message_text):
-    """Send a message back to the user."""
-    url = f"https://graph.facebook.com/v19.0/me/messages?access_token={PAGE_ACCESS_TOKEN}"
-    payload = {
-        "recipient": {"id": recipient_id},
-        "message": {"text": message_text},
-    }
-    headers = {"Content-Type": "application/json"}
-    requests.post(url, json=payload, headers=headers)
+    """Queue a message back to the user (sent by the outbox thread)."""
+    get_outbox().send(recipient_id, message_text)
 
 
 
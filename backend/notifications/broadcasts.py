@@ -0,0 +1,123 @@
+# notifications/broadcasts.py
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import close_old_connections, transaction
+from django.db.models import F, Q
+from django.utils.timezone import now
+
+from .models import Broadcast, BroadcastRecipient
+
+logger = logging.getLogger(__name__)
+User = get_user_model()
+
+CHUNK_SIZE = 2000
+# How long a delivery may go without finishing a chunk before another
+# worker (e.g. the deliver_broadcasts command) may take the broadcast over
+LEASE = timedelta(minutes=5)
+
+# One delivery thread per process keeps broadcasts off the request path
+# without competing with request handling for DB writes.
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="broadcast")
+
+
+def target_users(broadcast):
+    """Active residents matching the broadcast's area fields."""
+    queryset = User.objects.filter(is_active=True)
+    for field in ("barangay", "municipal", "province"):
+        value = getattr(broadcast, field)
+        if value:
+            queryset = queryset.filter(**{field: value})
+    return queryset
+
+
+def claim_broadcast(broadcast_id):
+    """
+    Take the delivery lease on an unfinished broadcast. Returns the lease's
+    expiry, which the holder passes back to renew it, or None when the
+    broadcast is done, failed, or another worker holds an unexpired lease.
+    """
+    current = now()
+    lease = current + LEASE
+    claimed = Broadcast.objects.filter(
+        Q(leased_until__isnull=True) | Q(leased_until__lt=current),
+        pk=broadcast_id,
+        status__in=["pending", "running"],
+    ).update(leased_until=lease)
+    return lease if claimed else None
+
+
+def deliver_broadcast(broadcast_id, chunk_size=CHUNK_SIZE):
+    """
+    Write recipient rows in id-ordered chunks, recording progress after each
+    chunk so a restarted delivery resumes where it stopped. Returns None
+    without doing anything unless the lease could be claimed, and stops
+    (returning None) if the lease was lost to another worker.
+    """
+    lease = claim_broadcast(broadcast_id)
+    if lease is None:
+        return None
+    broadcast = Broadcast.objects.get(pk=broadcast_id)
+    held = Broadcast.objects.filter(pk=broadcast.pk, leased_until=lease)
+
+    users = target_users(broadcast)
+    if broadcast.status == "pending":
+        broadcast.total_recipients = users.count()
+        broadcast.status = "running"
+        broadcast.save(update_fields=["total_recipients", "status"])
+
+    last_user_id = broadcast.last_user_id
+    try:
+        while True:
+            ids = list(
+                users.filter(id__gt=last_user_id)
+                .order_by("id")
+                .values_list("id", flat=True)[:chunk_size]
+            )
+            if not ids:
+                break
+
+            with transaction.atomic():
+                # Renew only a lease this worker still holds; the UPDATE also
+                # locks the row, so no other worker writes this chunk meanwhile
+                renewed = now() + LEASE
+                if not held.update(leased_until=renewed, last_user_id=ids[-1]):
+                    logger.warning("Broadcast %s: lease lost to another worker, stopping", broadcast.pk)
+                    return None
+                held = Broadcast.objects.filter(pk=broadcast.pk, leased_until=renewed)
+
+                existing = BroadcastRecipient.objects.filter(broadcast_id=broadcast.pk, user_id__in=ids).count()
+                BroadcastRecipient.objects.bulk_create(
+                    [BroadcastRecipient(broadcast_id=broadcast.pk, user_id=user_id) for user_id in ids],
+                    ignore_conflicts=True,
+                )
+                if existing < len(ids):
+                    Broadcast.objects.filter(pk=broadcast.pk).update(delivered=F("delivered") + len(ids) - existing)
+                last_user_id = ids[-1]
+    except Exception as e:
+        logger.exception("Broadcast %s failed", broadcast.pk)
+        held.update(status="failed", error=str(e), leased_until=None)
+        raise
+
+    if not held.update(status="done", completed_at=now(), leased_until=None):
+        logger.warning("Broadcast %s: lease lost to another worker, stopping", broadcast.pk)
+        return None
+    broadcast.refresh_from_db()
+    return broadcast
+
+
+def _run(broadcast_id):
+    close_old_connections()
+    try:
+        deliver_broadcast(broadcast_id)
+    except Exception:
+        pass  # already recorded on the broadcast row
+    finally:
+        close_old_connections()
+
+
+def schedule_broadcast(broadcast):
+    """Queue delivery once the broadcast row is committed."""
+    transaction.on_commit(lambda: _executor.submit(_run, broadcast.pk))
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from notifications.broadcasts import deliver_broadcast
+from notifications.models import Broadcast
+
+
+class Command(BaseCommand):
+    help = "Deliver (or resume) pending and interrupted area broadcasts"
+
+    def handle(self, *args, **kwargs):
+        queue = Broadcast.objects.filter(status__in=["pending", "running"]).order_by("id")
+        for broadcast_id in queue.values_list("id", flat=True):
+            broadcast = deliver_broadcast(broadcast_id)
+            if broadcast is None:
+                self.stdout.write(f"Broadcast {broadcast_id}: being delivered by another worker, skipped")
+                continue
+            self.stdout.write(self.style.SUCCESS(
+                f"Broadcast {broadcast.pk}: delivered to {broadcast.delivered} of {broadcast.total_recipients}"
+            ))
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.3 on 2026-10-19 19:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0002_broadcasts'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='broadcast',
+            name='leased_until',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
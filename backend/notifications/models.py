@@ -12,3 +12,57 @@ class Notification(models.Model):
 
     def __str__(self):
         return f"Notification for {self.user.email}: {self.title}"
+
+
+class Broadcast(models.Model):
+    """
+    One alert sent to every active resident of an area. The message is
+    stored once; recipients get a narrow BroadcastRecipient row each.
+    """
+    STATUS_CHOICES = [
+        ("pending", "Pending"),
+        ("running", "Running"),
+        ("done", "Done"),
+        ("failed", "Failed"),
+    ]
+
+    title = models.CharField(max_length=255)
+    message = models.TextField()
+
+    # Target area (exact match; empty fields are ignored)
+    barangay = models.CharField(max_length=100, blank=True)
+    municipal = models.CharField(max_length=100, blank=True)
+    province = models.CharField(max_length=100, blank=True)
+
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True,
+        related_name="broadcasts_sent",
+    )
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="pending")
+    total_recipients = models.PositiveIntegerField(default=0)
+    delivered = models.PositiveIntegerField(default=0)
+    last_user_id = models.BigIntegerField(default=0)  # resume point for delivery
+    leased_until = models.DateTimeField(null=True, blank=True)  # held by the worker delivering it
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"Broadcast {self.title} ({self.status})"
+
+
+class BroadcastRecipient(models.Model):
+    """Per-user delivery and read receipt for a Broadcast."""
+    broadcast = models.ForeignKey(Broadcast, on_delete=models.CASCADE, related_name="recipients")
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="broadcast_receipts"
+    )
+    read_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["broadcast", "user"], name="unique_broadcast_recipient"),
+        ]
+
+    def __str__(self):
+        return f"{self.broadcast_id} -> {self.user_id}"
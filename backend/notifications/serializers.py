@@ -1,8 +1,49 @@
 from rest_framework import serializers
-from .models import Notification
+from core.fastpath import iso_datetime
+from .models import Notification, Broadcast, BroadcastRecipient
 
 class NotificationSerializer(serializers.ModelSerializer):
     class Meta:
         model = Notification
         fields = ['id', 'title', 'message', 'is_read', 'created_at']
-        
+
+
+def fast_notification_rows(queryset, context=None):
+    """NotificationSerializer output for a list, built from values()."""
+    return [
+        {'id': pk, 'title': title, 'message': message, 'is_read': is_read, 'created_at': iso_datetime(created_at)}
+        for pk, title, message, is_read, created_at
+        in queryset.values_list('id', 'title', 'message', 'is_read', 'created_at')
+    ]
+
+
+class BroadcastSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Broadcast
+        fields = [
+            'id', 'title', 'message', 'barangay', 'municipal', 'province',
+            'status', 'total_recipients', 'delivered', 'error', 'created_at', 'completed_at',
+        ]
+        read_only_fields = [
+            'status', 'total_recipients', 'delivered', 'error', 'created_at', 'completed_at',
+        ]
+
+    def validate(self, attrs):
+        if not any(attrs.get(field) for field in ('barangay', 'municipal', 'province')):
+            raise serializers.ValidationError("Target at least one of barangay, municipal or province.")
+        return attrs
+
+
+class BroadcastReceiptSerializer(serializers.ModelSerializer):
+    """A broadcast as it appears in a resident's inbox."""
+    title = serializers.CharField(source='broadcast.title', read_only=True)
+    message = serializers.CharField(source='broadcast.message', read_only=True)
+    created_at = serializers.DateTimeField(source='broadcast.created_at', read_only=True)
+    is_read = serializers.SerializerMethodField()
+
+    class Meta:
+        model = BroadcastRecipient
+        fields = ['id', 'title', 'message', 'is_read', 'created_at']
+
+    def get_is_read(self, obj):
+        return obj.read_at is not None
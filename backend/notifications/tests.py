@@ -1,3 +1,158 @@
-from django.test import TestCase
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db.models import QuerySet
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from core.testing import QueryBudgetMixin
+from .broadcasts import _run, claim_broadcast, deliver_broadcast
+from .models import Broadcast, BroadcastRecipient, Notification
+
+
+class NotificationQueryBudgetTests(QueryBudgetMixin, TestCase):
+    query_budgets = {
+        "notifications": ("/api/notifications/", 2),
+        "notifications (all)": ("/api/notifications/all/", 2),
+        "broadcasts": ("/api/notifications/broadcasts/", 2),
+        "broadcast inbox": ("/api/notifications/broadcasts/inbox/", 2),
+    }
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(email="admin@example.com", role="admin")
+
+    def populate(self, size):
+        for i in range(Notification.objects.filter(user=self.user).count(), size):
+            Notification.objects.create(user=self.user, title=f"Alert {i}", message="Heavy rain expected")
+            broadcast = Broadcast.objects.create(title=f"Advisory {i}", message="Stay indoors",
+                                                 municipal="Maramag", created_by=self.user)
+            BroadcastRecipient.objects.create(broadcast=broadcast, user=self.user)
+
+
+@override_settings(FAST_READ_SERIALIZERS=False)
+class NotificationSerializerQueryBudgetTests(NotificationQueryBudgetTests):
+    """Same budgets with the ModelSerializer paths instead of core.fastpath."""
+
+
+class BroadcastDeliveryTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.admin = User.objects.create_user(email="admin@example.com", role="admin")
+        cls.residents = [
+            User.objects.create_user(email=f"resident{i}@example.com", barangay="Poblacion", municipal="Maramag")
+            for i in range(5)
+        ]
+        User.objects.create_user(email="inactive@example.com", barangay="Poblacion", municipal="Maramag",
+                                 is_active=False)
+        User.objects.create_user(email="elsewhere@example.com", barangay="Dologon", municipal="Maramag")
+
+    def create_broadcast(self, **kwargs):
+        return Broadcast.objects.create(title="Flood advisory", message="Move to higher ground",
+                                        barangay="Poblacion", municipal="Maramag", created_by=self.admin, **kwargs)
+
+    def client_for(self, user):
+        client = APIClient()
+        client.force_authenticate(user)
+        return client
+
+    def test_fans_out_to_active_residents_of_the_area(self):
+        broadcast = deliver_broadcast(self.create_broadcast().pk, chunk_size=2)
+        self.assertEqual((broadcast.status, broadcast.total_recipients, broadcast.delivered), ("done", 5, 5))
+        self.assertIsNone(broadcast.leased_until)
+        self.assertEqual(
+            set(broadcast.recipients.values_list("user__email", flat=True)),
+            {user.email for user in self.residents},
+        )
+        # Finished broadcasts are not delivered again
+        self.assertIsNone(deliver_broadcast(broadcast.pk))
+
+    def test_create_endpoint_schedules_delivery_after_commit(self):
+        with mock.patch("notifications.broadcasts._executor") as executor:
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client_for(self.admin).post(
+                    "/api/notifications/broadcasts/",
+                    {"title": "Road closed", "message": "Use the bypass", "municipal": "Maramag"},
+                )
+        self.assertEqual(response.status_code, 202)
+        executor.submit.assert_called_once_with(_run, response.json()["id"])
+
+    def test_read_state(self):
+        deliver_broadcast(self.create_broadcast().pk)
+        client = self.client_for(self.residents[0])
+        (receipt,) = client.get("/api/notifications/broadcasts/inbox/").json()
+        self.assertEqual((receipt["title"], receipt["is_read"]), ("Flood advisory", False))
+
+        url = f"/api/notifications/broadcasts/inbox/{receipt['id']}/mark_as_read/"
+        self.assertEqual(client.patch(url).status_code, 200)
+        read_at = BroadcastRecipient.objects.get(pk=receipt["id"]).read_at
+        self.assertIsNotNone(read_at)
+        self.assertEqual(client.patch(url).status_code, 200)
+        self.assertEqual(BroadcastRecipient.objects.get(pk=receipt["id"]).read_at, read_at)
+        self.assertTrue(client.get("/api/notifications/broadcasts/inbox/").json()[0]["is_read"])
+
+        # Someone else's receipt, or none at all
+        self.assertEqual(self.client_for(self.residents[1]).patch(url).status_code, 404)
+        self.assertEqual(client.patch("/api/notifications/broadcasts/inbox/999999/mark_as_read/").status_code, 404)
+
+    def test_command_skips_broadcasts_leased_by_another_worker(self):
+        broadcast = self.create_broadcast()
+        self.assertTrue(claim_broadcast(broadcast.pk))  # e.g. the in-process executor mid-delivery
+
+        call_command("deliver_broadcasts", stdout=StringIO())
+        broadcast.refresh_from_db()
+        self.assertEqual((broadcast.status, broadcast.delivered), ("pending", 0))
+        self.assertFalse(broadcast.recipients.exists())
+
+    def test_command_resumes_interrupted_broadcast(self):
+        # A worker died after the first chunk; its lease has run out
+        broadcast = self.create_broadcast(status="running", total_recipients=5)
+        BroadcastRecipient.objects.bulk_create(
+            BroadcastRecipient(broadcast=broadcast, user=user) for user in self.residents[:2]
+        )
+        Broadcast.objects.filter(pk=broadcast.pk).update(
+            delivered=2, last_user_id=self.residents[1].pk, leased_until=timezone.now() - timedelta(seconds=1)
+        )
+
+        out = StringIO()
+        call_command("deliver_broadcasts", stdout=out)
+        broadcast.refresh_from_db()
+        self.assertEqual((broadcast.status, broadcast.delivered), ("done", 5))
+        self.assertEqual(broadcast.recipients.count(), 5)
+        self.assertIn("delivered to 5 of 5", out.getvalue())
+
+    def test_resumed_delivery_counts_only_new_recipients(self):
+        # Recipients past the resume point already exist, e.g. written by a
+        # worker that had lost its lease
+        broadcast = self.create_broadcast(status="running", total_recipients=5)
+        BroadcastRecipient.objects.bulk_create(
+            BroadcastRecipient(broadcast=broadcast, user=user) for user in self.residents[:3]
+        )
+        Broadcast.objects.filter(pk=broadcast.pk).update(delivered=3, last_user_id=self.residents[1].pk)
+
+        broadcast = deliver_broadcast(broadcast.pk, chunk_size=2)
+        self.assertEqual((broadcast.status, broadcast.delivered), ("done", 5))
+        self.assertEqual(broadcast.recipients.count(), 5)
+
+    def test_stops_after_losing_the_lease(self):
+        broadcast = self.create_broadcast()
+        takeover = timezone.now() + timedelta(hours=1)
+        bulk_create = QuerySet.bulk_create
+
+        def expire_and_take_over(queryset, *args, **kwargs):
+            # The first chunk outlives the lease and another worker claims the broadcast
+            created = bulk_create(queryset, *args, **kwargs)
+            Broadcast.objects.filter(pk=broadcast.pk).update(leased_until=takeover)
+            return created
+
+        with mock.patch.object(QuerySet, "bulk_create", autospec=True, side_effect=expire_and_take_over):
+            self.assertIsNone(deliver_broadcast(broadcast.pk, chunk_size=2))
+        broadcast.refresh_from_db()
+        self.assertEqual((broadcast.status, broadcast.delivered), ("running", 2))
+        self.assertEqual(broadcast.leased_until, takeover)  # the new owner's lease is left alone
+        self.assertEqual(broadcast.recipients.count(), 2)
@@ -1,14 +1,27 @@
 from django.urls import path, include
-from rest_framework.routers import DefaultRouter
-from .views import NotificationViewSet, NotificationListView, NotificationMarkReadView
+from rest_framework.routers import DefaultRouter, SimpleRouter
+from .views import (
+    NotificationViewSet,
+    NotificationListView,
+    NotificationMarkReadView,
+    BroadcastViewSet,
+    BroadcastInboxViewSet,
+)
 
 router = DefaultRouter()
 router.register(r'', NotificationViewSet, basename='notifications')
 
+broadcast_router = SimpleRouter()
+broadcast_router.register(r'inbox', BroadcastInboxViewSet, basename='broadcast-inbox')
+broadcast_router.register(r'', BroadcastViewSet, basename='broadcasts')
+
 urlpatterns = [
     path("all/", NotificationListView.as_view(), name="notifications-list"),
     path("<int:pk>/read/", NotificationMarkReadView.as_view(), name="notification-read"),
 
+    # Area broadcasts (must come before the catch-all notification router)
+    path("broadcasts/", include(broadcast_router.urls)),
+
     # ✅ Include router URLs so that /api/notifications/ works
     path("", include(router.urls)),
 ]
@@ -1,17 +1,22 @@
-from rest_framework import generics, viewsets, permissions, status
+from rest_framework import generics, mixins, viewsets, permissions, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from .models import Notification
-from .serializers import NotificationSerializer
+from django.utils.timezone import now
+from core.fastpath import FastListMixin
+from users.permissions import IsAdmin
+from .broadcasts import schedule_broadcast
+from .models import Notification, Broadcast, BroadcastRecipient
+from .serializers import NotificationSerializer, BroadcastSerializer, BroadcastReceiptSerializer, fast_notification_rows
 
 # List all notifications for the logged-in user
-class NotificationListView(generics.ListAPIView):
+class NotificationListView(FastListMixin, generics.ListAPIView):
     serializer_class = NotificationSerializer
+    fast_list = fast_notification_rows
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
-        return Notification.objects.filter(user=self.request.user).order_by('-created_at')
+        return Notification.objects.filter(user_id=self.request.user.pk).order_by('-created_at')
 
 
 # Mark notification as read
@@ -27,13 +32,14 @@ class NotificationMarkReadView(generics.UpdateAPIView):
         return Response({"message": "Notification marked as read"}, status=status.HTTP_200_OK)
 
 
-class NotificationViewSet(viewsets.ModelViewSet):
+class NotificationViewSet(FastListMixin, viewsets.ModelViewSet):
     serializer_class = NotificationSerializer
+    fast_list = fast_notification_rows
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
         # Only show notifications belonging to the logged-in user
-        return Notification.objects.filter(user=self.request.user).order_by('-created_at')
+        return Notification.objects.filter(user_id=self.request.user.pk).order_by('-created_at')
 
     @action(detail=True, methods=['patch'])
     def mark_as_read(self, request, pk=None):
@@ -50,5 +56,51 @@ class NotificationViewSet(viewsets.ModelViewSet):
         """
         Delete all notifications for this user.
         """
-        Notification.objects.filter(user=request.user).delete()
-        return Response({'message': 'All notifications cleared'}, status=status.HTTP_200_OK)
\ No newline at end of file
+        Notification.objects.filter(user_id=request.user.pk).delete()
+        return Response({'message': 'All notifications cleared'}, status=status.HTTP_200_OK)
+
+
+class BroadcastViewSet(mixins.CreateModelMixin,
+                       mixins.ListModelMixin,
+                       mixins.RetrieveModelMixin,
+                       viewsets.GenericViewSet):
+    """
+    Admins create area broadcasts here; delivery runs in the background and
+    its progress (status, delivered/total_recipients) is readable by id.
+    """
+    queryset = Broadcast.objects.all().order_by('-created_at')
+    serializer_class = BroadcastSerializer
+    permission_classes = [IsAdmin]
+
+    def perform_create(self, serializer):
+        broadcast = serializer.save(created_by_id=self.request.user.pk)
+        schedule_broadcast(broadcast)
+
+    def create(self, request, *args, **kwargs):
+        response = super().create(request, *args, **kwargs)
+        response.status_code = status.HTTP_202_ACCEPTED
+        return response
+
+
+class BroadcastInboxViewSet(viewsets.ReadOnlyModelViewSet):
+    """Broadcasts delivered to the logged-in user."""
+    serializer_class = BroadcastReceiptSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        return (
+            BroadcastRecipient.objects.filter(user_id=self.request.user.pk)
+            .select_related('broadcast')
+            .order_by('-broadcast_id')
+        )
+
+    @action(detail=True, methods=['patch'])
+    def mark_as_read(self, request, pk=None):
+        """
+        Mark a broadcast as read for this user.
+        """
+        receipt = self.get_object()
+        if receipt.read_at is None:
+            receipt.read_at = now()
+            receipt.save(update_fields=['read_at'])
+        return Response({'message': 'Broadcast marked as read'}, status=status.HTTP_200_OK)
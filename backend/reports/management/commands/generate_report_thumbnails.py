@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from reports.models import Report
+from reports.thumbnails import make_thumbnail
+
+
+class Command(BaseCommand):
+    help = "Create list thumbnails for reports that have an image but no thumbnail yet"
+
+    def handle(self, *args, **kwargs):
+        ids = (
+            Report.objects.exclude(Q(image="") | Q(image__isnull=True))
+            .filter(Q(thumbnail="") | Q(thumbnail__isnull=True))
+            .values_list("id", flat=True)
+        )
+        made = failed = 0
+        for report_id in ids.iterator():
+            try:
+                make_thumbnail(report_id)
+                made += 1
+            except Exception as e:  # missing/corrupt upload: report it, keep going
+                failed += 1
+                self.stderr.write(f"Report {report_id}: {e}")
+        self.stdout.write(self.style.SUCCESS(f"Created {made} thumbnails ({failed} failed)"))
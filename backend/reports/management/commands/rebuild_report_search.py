@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from reports.models import Report
+from reports.search import install_search_index, remove_search_index
+
+
+class Command(BaseCommand):
+    help = "Recreate the report full-text search index (and its SQLite triggers) from the reports table"
+
+    def handle(self, *args, **kwargs):
+        with connection.schema_editor() as schema_editor:
+            remove_search_index(schema_editor)
+            install_search_index(schema_editor)
+        self.stdout.write(self.style.SUCCESS(f"Indexed {Report.objects.count()} reports for search"))
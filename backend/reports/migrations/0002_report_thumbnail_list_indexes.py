@@ -0,0 +1,28 @@
+# Generated by Django 5.0.3 on 2026-10-19 19:11
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='report',
+            name='thumbnail',
+            field=models.ImageField(blank=True, editable=False, null=True, upload_to='reports/thumbnails/'),
+        ),
+        migrations.AddIndex(
+            model_name='report',
+            index=models.Index(fields=['-date_created'], name='report_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='report',
+            index=models.Index(fields=['status', '-date_created'], name='report_status_created_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+from django.db import migrations
+
+from reports.search import install_search_index, remove_search_index
+
+
+def install(apps, schema_editor):
+    install_search_index(schema_editor)
+
+
+def remove(apps, schema_editor):
+    remove_search_index(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0003_report_status_history'),
+    ]
+
+    operations = [
+        # FTS5 table + triggers on SQLite, generated tsvector + GIN on PostgreSQL (reports/search.py)
+        migrations.RunPython(install, remove),
+    ]
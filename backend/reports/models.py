@@ -17,8 +17,33 @@ class Report(models.Model):
     latitude = models.FloatField()
     longitude = models.FloatField()
     image = models.ImageField(upload_to='reports/', null=True, blank=True)
+    thumbnail = models.ImageField(upload_to='reports/thumbnails/', null=True, blank=True, editable=False)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='Pending')
     date_created = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # Admin list: newest first, optionally narrowed by status and date range
+            models.Index(fields=['-date_created'], name='report_created_idx'),
+            models.Index(fields=['status', '-date_created'], name='report_status_created_idx'),
+        ]
+
     def __str__(self):
         return f"{self.name} ({self.status}) - {self.date_created.strftime('%Y-%m-%d %H:%M')}"
+
+
+class ReportStatusChange(models.Model):
+    """Audit trail: one row per report whose status an admin changed."""
+    report = models.ForeignKey(Report, on_delete=models.CASCADE, related_name="status_changes")
+    old_status = models.CharField(max_length=20, choices=Report.STATUS_CHOICES)
+    new_status = models.CharField(max_length=20, choices=Report.STATUS_CHOICES)
+    changed_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name="+")
+    changed_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["report", "-changed_at"], name="report_status_change_idx"),
+        ]
+
+    def __str__(self):
+        return f"Report {self.report_id}: {self.old_status} -> {self.new_status}"
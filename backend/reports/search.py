@@ -0,0 +1,220 @@
+# reports/search.py
+"""
+Full-text search over report name, description and contact.
+
+SQLite: an external-content FTS5 table kept in sync by triggers (so bulk
+inserts and queryset.update() are indexed too), ranked with bm25.
+PostgreSQL: a generated, weighted tsvector column with a GIN index, ranked
+with ts_rank_cd. Other backends fall back to LIKE, newest first.
+
+Django rebuilds SQLite tables for some schema changes, which drops the
+triggers; a post_migrate handler (reports/signals.py) puts them back and
+reindexes. `manage.py rebuild_report_search` does the same by hand.
+"""
+import base64
+import html
+import json
+import re
+
+from django.db import connection
+from django.db.models import Q
+
+from .models import Report
+
+SQLITE_INSTALL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS reports_report_fts USING fts5(
+        name, description, contact,
+        content='reports_report', content_rowid='id',
+        tokenize='porter unicode61 remove_diacritics 2', prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS reports_report_fts_insert AFTER INSERT ON reports_report BEGIN
+        INSERT INTO reports_report_fts(rowid, name, description, contact)
+        VALUES (new.id, new.name, new.description, new.contact);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS reports_report_fts_delete AFTER DELETE ON reports_report BEGIN
+        INSERT INTO reports_report_fts(reports_report_fts, rowid, name, description, contact)
+        VALUES ('delete', old.id, old.name, old.description, old.contact);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS reports_report_fts_update
+    AFTER UPDATE OF name, description, contact ON reports_report BEGIN
+        INSERT INTO reports_report_fts(reports_report_fts, rowid, name, description, contact)
+        VALUES ('delete', old.id, old.name, old.description, old.contact);
+        INSERT INTO reports_report_fts(rowid, name, description, contact)
+        VALUES (new.id, new.name, new.description, new.contact);
+    END
+    """,
+    "INSERT INTO reports_report_fts(reports_report_fts) VALUES ('rebuild')",
+]
+SQLITE_OBJECTS = {
+    ("table", "reports_report_fts"),
+    ("trigger", "reports_report_fts_insert"),
+    ("trigger", "reports_report_fts_delete"),
+    ("trigger", "reports_report_fts_update"),
+}
+SQLITE_REMOVE = [
+    "DROP TRIGGER IF EXISTS reports_report_fts_update",
+    "DROP TRIGGER IF EXISTS reports_report_fts_delete",
+    "DROP TRIGGER IF EXISTS reports_report_fts_insert",
+    "DROP TABLE IF EXISTS reports_report_fts",
+]
+
+POSTGRES_INSTALL = [
+    """
+    ALTER TABLE reports_report ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(name, '')), 'A')
+        || setweight(to_tsvector('english', coalesce(description, '')), 'B')
+        || setweight(to_tsvector('simple', coalesce(contact, '')), 'C')
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS reports_report_search_idx ON reports_report USING GIN (search_vector)",
+]
+POSTGRES_REMOVE = [
+    "DROP INDEX IF EXISTS reports_report_search_idx",
+    "ALTER TABLE reports_report DROP COLUMN IF EXISTS search_vector",
+]
+
+# name, description, contact: a name hit outranks a description hit
+SQLITE_WEIGHTS = (10.0, 1.0, 5.0)
+SNIPPET_TOKENS = 16
+# Highlight markers that can't occur in user text; swapped for <mark> after escaping
+OPEN, CLOSE = "\x02", "\x03"
+
+
+def install_search_index(schema_editor):
+    for statement in {"sqlite": SQLITE_INSTALL, "postgresql": POSTGRES_INSTALL}.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(statement)
+
+
+def remove_search_index(schema_editor):
+    for statement in {"sqlite": SQLITE_REMOVE, "postgresql": POSTGRES_REMOVE}.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(statement)
+
+
+def missing_search_objects(connection):
+    """SQLite FTS table/triggers that should exist but don't (empty elsewhere)."""
+    if connection.vendor != "sqlite":
+        return set()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT type, name FROM sqlite_master WHERE type IN ('table', 'trigger') AND name LIKE 'reports_report_fts%'"
+        )
+        return SQLITE_OBJECTS - set(cursor.fetchall())
+
+
+def search_terms(query):
+    """Words of the user's query; punctuation and search operators are dropped."""
+    return re.findall(r"\w+", query)[:16]
+
+
+def mark(text):
+    """HTML-escape a highlighted fragment and turn the markers into <mark> tags."""
+    if not text:
+        return text
+    return html.escape(text).replace(OPEN, "<mark>").replace(CLOSE, "</mark>")
+
+
+def encode_cursor(rank, pk):
+    return base64.urlsafe_b64encode(json.dumps([rank, pk]).encode()).decode()
+
+
+def decode_cursor(cursor):
+    """(rank, pk) from a cursor, or None if it is malformed."""
+    try:
+        rank, pk = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return float(rank), int(pk)
+    except (ValueError, TypeError):
+        return None
+
+
+def search_reports(query, after=None, limit=20):
+    """
+    One page of matches for `query`, best first, as dicts with id, rank and
+    highlighted name/description/contact. `after` is the (rank, id) of the
+    last row of the previous page (keyset pagination: every page costs the
+    same). Lower rank is better.
+    """
+    terms = search_terms(query)
+    if not terms:
+        return []
+    search = {"sqlite": _search_sqlite, "postgresql": _search_postgres}.get(connection.vendor, _search_like)
+    return search(terms, after, limit)
+
+
+def _search_sqlite(terms, after, limit):
+    # Every word must match; the last one as a prefix, for search-as-you-type
+    match = " ".join(f'"{term}"' for term in terms) + "*"
+    keyset, params = "", [match]
+    if after:
+        keyset = "AND (rank > %s OR (rank = %s AND reports_report_fts.rowid > %s))"
+        params += [after[0], after[0], after[1]]
+    sql = f"""
+        SELECT reports_report_fts.rowid, rank,
+               highlight(reports_report_fts, 0, %s, %s),
+               snippet(reports_report_fts, 1, %s, %s, '…', {SNIPPET_TOKENS}),
+               highlight(reports_report_fts, 2, %s, %s)
+        FROM reports_report_fts
+        WHERE reports_report_fts MATCH %s AND rank MATCH 'bm25({", ".join(map(str, SQLITE_WEIGHTS))})' {keyset}
+        ORDER BY rank, reports_report_fts.rowid
+        LIMIT %s
+    """
+    params = [OPEN, CLOSE] * 3 + params + [limit]
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [_row(*row) for row in cursor.fetchall()]
+
+
+def _search_postgres(terms, after, limit):
+    query = " & ".join(f"{term}:*" for term in terms)
+    keyset, params = "", [query]
+    if after:
+        # ts_rank_cd grows with relevance; negate it so lower is better, as on SQLite
+        keyset = "AND (-ts_rank_cd(search_vector, q) > %s OR (-ts_rank_cd(search_vector, q) = %s AND id > %s))"
+        params += [after[0], after[0], after[1]]
+    sql = f"""
+        WITH page AS (
+            SELECT id, name, description, contact, q, -ts_rank_cd(search_vector, q) AS rank
+            FROM reports_report, to_tsquery('english', %s) q
+            WHERE search_vector @@ q {keyset}
+            ORDER BY rank, id
+            LIMIT %s
+        )
+        SELECT id, rank,
+               ts_headline('simple', name, q, %s),
+               ts_headline('english', description, q, %s),
+               ts_headline('simple', contact, q, %s)
+        FROM page ORDER BY rank, id
+    """
+    whole = f"StartSel={OPEN}, StopSel={CLOSE}, HighlightAll=true"
+    fragment = f"StartSel={OPEN}, StopSel={CLOSE}, MaxWords={SNIPPET_TOKENS}, MinWords=5"
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params + [limit, whole, fragment, whole])
+        return [_row(*row) for row in cursor.fetchall()]
+
+
+def _search_like(terms, after, limit):
+    queryset = Report.objects.all()
+    for term in terms:
+        queryset = queryset.filter(Q(name__icontains=term) | Q(description__icontains=term) | Q(contact__icontains=term))
+    if after:
+        queryset = queryset.filter(pk__lt=after[1])
+    return [
+        # No ranking here: newest first, rank is just the negated id
+        _row(pk, float(-pk), name, description, contact)
+        for pk, name, description, contact in queryset.order_by("-pk").values_list(
+            "pk", "name", "description", "contact")[:limit]
+    ]
+
+
+def _row(pk, rank, name, description, contact):
+    return {
+        "id": pk,
+        "rank": rank,
+        "highlights": {"name": mark(name), "description": mark(description), "contact": mark(contact)},
+    }
@@ -1,4 +1,7 @@
+from django.conf import settings
+from django.db.models.functions import Substr
 from rest_framework import serializers
+from core.fastpath import file_url, iso_datetime
 from .models import Report
 
 class ReportSerializer(serializers.ModelSerializer):
@@ -15,7 +18,98 @@ class ReportSerializer(serializers.ModelSerializer):
             'latitude',
             'longitude',
             'image',
+            'thumbnail',
             'status',
             'date_created',
         ]
-        read_only_fields = ['user_email', 'user', 'date_created']
+        read_only_fields = ['user_email', 'user', 'thumbnail', 'date_created']
+
+
+class BulkStatusSerializer(serializers.Serializer):
+    """Body of the bulk status endpoint: the new status plus report ids or a list filter."""
+    status = serializers.ChoiceField(choices=Report.STATUS_CHOICES)
+    ids = serializers.ListField(child=serializers.IntegerField(min_value=1), required=False, allow_empty=False)
+    filter = serializers.DictField(child=serializers.CharField(), required=False)
+
+    def validate_filter(self, value):
+        unknown = set(value) - {'status', 'date_from', 'date_to'}
+        if unknown:
+            raise serializers.ValidationError(f"Unsupported filter keys: {', '.join(sorted(unknown))}.")
+        return value
+
+    def validate(self, attrs):
+        if ('ids' in attrs) == ('filter' in attrs):
+            raise serializers.ValidationError("Give either ids or filter.")
+        return attrs
+
+
+# --- List representation ---
+# Lists carry what a table row or map marker needs; the full description,
+# contact and original image come from the detail endpoint.
+
+LIST_FIELDS = ['id', 'user__email', 'name', 'status', 'latitude', 'longitude', 'thumbnail', 'date_created']
+
+
+def excerpt(text):
+    """Shorten a description_head annotation to REPORT_LIST_DESCRIPTION_CHARS."""
+    limit = settings.REPORT_LIST_DESCRIPTION_CHARS
+    if text is None or len(text) <= limit:
+        return text
+    return text[:limit].rstrip() + '…'
+
+
+def report_list_queryset(queryset):
+    """
+    Reports joined with their user in one query, loading only the list
+    columns plus the start of the description (cut in the database, so
+    long descriptions never leave it).
+    """
+    return (
+        queryset.select_related('user')
+        .only(*LIST_FIELDS)
+        .annotate(description_head=Substr('description', 1, settings.REPORT_LIST_DESCRIPTION_CHARS + 1))
+    )
+
+
+class ReportListSerializer(serializers.ModelSerializer):
+    """Slim report for lists; expects report_list_queryset() rows."""
+    user_email = serializers.EmailField(source='user.email', read_only=True)
+    description = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Report
+        fields = [
+            'id',
+            'user_email',
+            'name',
+            'description',
+            'latitude',
+            'longitude',
+            'thumbnail',
+            'status',
+            'date_created',
+        ]
+        read_only_fields = fields
+
+    def get_description(self, obj):
+        return excerpt(obj.description_head)
+
+
+def fast_report_rows(queryset, context=None):
+    """ReportListSerializer output for a list, built from one joined values() query."""
+    request = (context or {}).get('request')
+    return [
+        {
+            'id': pk,
+            'user_email': user_email,
+            'name': name,
+            'description': excerpt(description_head),
+            'latitude': latitude,
+            'longitude': longitude,
+            'thumbnail': file_url(thumbnail, request),
+            'status': status,
+            'date_created': iso_datetime(date_created),
+        }
+        for pk, user_email, name, status, latitude, longitude, thumbnail, date_created, description_head
+        in queryset.values_list(*LIST_FIELDS, 'description_head')
+    ]
@@ -0,0 +1,35 @@
+# reports/signals.py
+import logging
+
+from django.db import connections
+from django.db.migrations.recorder import MigrationRecorder
+from django.db.models.signals import post_migrate
+from django.dispatch import receiver
+
+from .search import install_search_index, missing_search_objects, remove_search_index
+
+logger = logging.getLogger(__name__)
+
+SEARCH_MIGRATION = ("reports", "0004_report_search")
+
+
+@receiver(post_migrate)
+def restore_search_index(sender, using="default", **kwargs):
+    """
+    Recreate the SQLite search triggers when a table rebuild of
+    reports_report dropped them, then reindex: writes made without the
+    triggers are missing from the index.
+    """
+    if sender.name != "reports":
+        return
+    connection = connections[using]
+    if SEARCH_MIGRATION not in MigrationRecorder(connection).applied_migrations():
+        return
+    missing = missing_search_objects(connection)
+    if not missing:
+        return
+
+    logger.warning("Report search objects missing after migrate (%s); rebuilding", ", ".join(sorted(n for _, n in missing)))
+    with connection.schema_editor() as schema_editor:
+        remove_search_index(schema_editor)
+        install_search_index(schema_editor)
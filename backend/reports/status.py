@@ -0,0 +1,63 @@
+# reports/status.py
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.functions import Substr
+
+from notifications.models import Notification
+from .models import Report, ReportStatusChange
+
+BATCH_SIZE = 1000
+
+
+class TooManyReports(Exception):
+    pass
+
+
+def _owner_notification(user_id, new_status, descriptions):
+    if len(descriptions) == 1:
+        message = f"Your report '{descriptions[0]}...' has been marked as '{new_status}'."
+    else:
+        message = f"{len(descriptions)} of your reports have been marked as '{new_status}'."
+    return Notification(user_id=user_id, title="📢 Report Status Updated", message=message)
+
+
+def change_report_status(queryset, new_status, changed_by_id=None, limit=None):
+    """
+    Give every report in `queryset` that isn't `new_status` yet that status,
+    in one transaction: a single UPDATE, then the audit rows and one
+    notification per owner as batched inserts. Raises TooManyReports
+    (before writing anything) if more than `limit` reports would change.
+    """
+    limit = limit or settings.REPORT_BULK_STATUS_LIMIT
+    with transaction.atomic():
+        rows = list(
+            queryset.exclude(status=new_status)
+            .select_for_update()
+            .annotate(description_head=Substr("description", 1, 30))
+            .values_list("id", "user_id", "status", "description_head")[:limit + 1]
+        )
+        if len(rows) > limit:
+            raise TooManyReports(f"More than {limit} reports would change; narrow the selection.")
+        if not rows:
+            return {"updated": 0, "notified_users": 0}
+
+        Report.objects.filter(pk__in=[pk for pk, _, _, _ in rows]).update(status=new_status)
+        ReportStatusChange.objects.bulk_create(
+            [
+                ReportStatusChange(report_id=pk, old_status=old_status, new_status=new_status,
+                                   changed_by_id=changed_by_id)
+                for pk, _, old_status, _ in rows
+            ],
+            batch_size=BATCH_SIZE,
+        )
+
+        by_owner = defaultdict(list)
+        for _, user_id, _, description in rows:
+            by_owner[user_id].append(description)
+        Notification.objects.bulk_create(
+            [_owner_notification(user_id, new_status, descriptions) for user_id, descriptions in by_owner.items()],
+            batch_size=BATCH_SIZE,
+        )
+    return {"updated": len(rows), "notified_users": len(by_owner)}
@@ -1,3 +1,249 @@
-from django.test import TestCase
+import io
+import tempfile
+from datetime import datetime
+from unittest import skipUnless
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from PIL import Image
+from rest_framework.test import APIClient
+
+from core.querycount import QueryLog
+from core.testing import QueryBudgetMixin
+from notifications.models import Notification
+from .models import Report, ReportStatusChange
+from .search import missing_search_objects, search_reports
+from .thumbnails import make_thumbnail
+
+
+class ReportQueryBudgetTests(QueryBudgetMixin, TestCase):
+    query_budgets = {
+        "admin report list": ("/api/reports/all/", 2),
+        "report list": ("/api/reports/", 2),
+        "filtered report list": ("/api/reports/all/?status=Pending,In%20Progress&date_from=2020-01-01&date_to=2100-12-31", 2),
+        "report detail": ("/api/reports/{self.report_pk}/", 2),
+    }
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(email="admin@example.com", role="admin")
+
+    def populate(self, size):
+        User = get_user_model()
+        for i in range(Report.objects.count(), size):
+            reporter = User.objects.create_user(email=f"reporter{i}@example.com")
+            Report.objects.create(user=reporter, name=f"Reporter {i}", contact="09170000000",
+                                  description="Flooded road", latitude=7.8, longitude=125.0)
+        self.report_pk = Report.objects.earliest("pk").pk
+
+
+@override_settings(FAST_READ_SERIALIZERS=False)
+class ReportSerializerQueryBudgetTests(ReportQueryBudgetTests):
+    """Same budgets with the ModelSerializer paths instead of core.fastpath."""
+
+
+class ReportListTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.admin = User.objects.create_user(email="admin@example.com", role="admin")
+        reporter = User.objects.create_user(email="reporter@example.com")
+        cls.old = Report.objects.create(user=reporter, name="Old", contact="1", description="x" * 500,
+                                        latitude=7.8, longitude=125.0, status="Resolved")
+        Report.objects.filter(pk=cls.old.pk).update(date_created=timezone.make_aware(datetime(2024, 5, 1, 9)))
+        cls.new = Report.objects.create(user=reporter, name="New", contact="1", description="Knee-deep water",
+                                        latitude=7.8, longitude=125.0)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def ids(self, query):
+        response = self.client.get(f"/api/reports/all/{query}")
+        self.assertEqual(response.status_code, 200, response.content)
+        return [row["id"] for row in response.json()]
+
+    def test_filters(self):
+        self.assertEqual(self.ids(""), [self.new.pk, self.old.pk])
+        self.assertEqual(self.ids("?status=Resolved"), [self.old.pk])
+        self.assertEqual(self.ids("?status=Pending,Resolved"), [self.new.pk, self.old.pk])
+        self.assertEqual(self.ids("?date_to=2024-05-01"), [self.old.pk])  # whole day included
+        self.assertEqual(self.ids("?date_from=2024-05-02"), [self.new.pk])
+        self.assertEqual(self.client.get("/api/reports/all/?status=Lost").status_code, 400)
+        self.assertEqual(self.client.get("/api/reports/all/?date_from=May").status_code, 400)
+
+    def test_list_is_slim_and_detail_is_full(self):
+        for fast in (True, False):
+            with self.subTest(fast=fast), override_settings(FAST_READ_SERIALIZERS=fast):
+                row = self.client.get("/api/reports/all/").json()[1]
+                self.assertNotIn("contact", row)
+                self.assertEqual(row["description"], "x" * 140 + "…")
+        detail = self.client.get(f"/api/reports/{self.old.pk}/").json()
+        self.assertEqual(detail["description"], "x" * 500)
+
+    def test_thumbnail(self):
+        upload = io.BytesIO()
+        Image.new("RGB", (1600, 1200), (40, 90, 160)).save(upload, "JPEG")
+        with tempfile.TemporaryDirectory() as media, override_settings(MEDIA_ROOT=media):
+            self.new.image.save("flood.jpg", ContentFile(upload.getvalue()))
+            make_thumbnail(self.new.pk)
+            self.new.refresh_from_db()
+            with Image.open(self.new.thumbnail.path) as thumbnail:
+                self.assertEqual(thumbnail.size, (320, 240))
+            self.assertTrue(self.client.get("/api/reports/all/").json()[0]["thumbnail"].endswith(".jpg"))
+
+
+class ReportBulkStatusTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.admin = User.objects.create_user(email="admin@example.com", role="admin")
+        cls.owners = [User.objects.create_user(email=f"owner{i}@example.com") for i in range(5)]
+        Report.objects.bulk_create(
+            Report(user=cls.owners[i % 5], name=f"Resident {i}", contact="1", description=f"Flooded street {i}",
+                   latitude=7.8, longitude=125.0, status="In Progress" if i < 40 else "Resolved")
+            for i in range(50)
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def bulk(self, body):
+        return self.client.post("/api/reports/bulk_status/", body, format="json")
+
+    def test_by_ids(self):
+        ids = list(Report.objects.order_by("pk").values_list("pk", flat=True)[35:45])
+        with QueryLog() as log:
+            response = self.bulk({"status": "Resolved", "ids": ids + [999999]})
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(response.json(), {"status": "Resolved", "matched": 10, "updated": 5, "unchanged": 5,
+                                           "not_found": [999999], "notified_users": 5})
+        self.assertFalse(log.repeated(3), log.describe())
+
+        changes = ReportStatusChange.objects.filter(report_id__in=ids)
+        self.assertEqual(changes.count(), 5)
+        self.assertEqual(set(changes.values_list("old_status", "new_status", "changed_by")),
+                         {("In Progress", "Resolved", self.admin.pk)})
+
+    def test_by_filter_notifies_each_owner_once(self):
+        response = self.bulk({"status": "Resolved", "filter": {"status": "In Progress"}})
+        self.assertEqual(response.json()["updated"], 40)
+        self.assertFalse(Report.objects.filter(status="In Progress").exists())
+        self.assertEqual(Notification.objects.count(), 5)
+        self.assertEqual(Notification.objects.first().message, "8 of your reports have been marked as 'Resolved'.")
+
+    def test_validation_and_limit(self):
+        self.assertEqual(self.bulk({"status": "Resolved"}).status_code, 400)
+        self.assertEqual(self.bulk({"status": "Lost", "ids": [1]}).status_code, 400)
+        self.assertEqual(self.bulk({"status": "Pending", "filter": {"name": "x"}}).status_code, 400)
+        with override_settings(REPORT_BULK_STATUS_LIMIT=10):
+            response = self.bulk({"status": "Pending", "filter": {"status": "In Progress"}})
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(ReportStatusChange.objects.exists())
+
+    def test_single_update_is_audited(self):
+        report = Report.objects.filter(status="In Progress").first()
+        response = self.client.patch(f"/api/reports/{report.pk}/update_status/", {"status": "Resolved"}, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(report.status_changes.get().old_status, "In Progress")
+        self.assertEqual(Notification.objects.get(user=report.user).message,
+                         f"Your report '{report.description[:30]}...' has been marked as 'Resolved'.")
+
+
+class ReportSearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.admin = User.objects.create_user(email="admin@example.com", role="admin")
+        owner = User.objects.create_user(email="owner@example.com")
+        cls.by_name = Report.objects.create(user=owner, name="Flores Drainage", contact="1",
+                                            description="Clogged canal", latitude=7.8, longitude=125.0)
+        cls.by_description = Report.objects.create(user=owner, name="Juan", contact="1",
+                                                   description="Drainage <b>overflow</b> near school",
+                                                   latitude=7.8, longitude=125.0)
+        Report.objects.bulk_create(
+            Report(user=owner, name=f"Resident {i}", contact="1", description=f"Flooded street {i}",
+                   latitude=7.8, longitude=125.0)
+            for i in range(25)
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def search(self, query, **params):
+        return self.client.get("/api/reports/search/", {"q": query, **params})
+
+    def test_name_match_ranks_first_and_is_highlighted(self):
+        response = self.search("drainage")
+        self.assertEqual(response.status_code, 200, response.content)
+        results = response.json()["results"]
+        self.assertEqual([r["id"] for r in results], [self.by_name.pk, self.by_description.pk])
+        self.assertEqual(results[0]["highlights"]["name"], "Flores <mark>Drainage</mark>")
+        # User text is escaped; only the markers become tags
+        self.assertEqual(results[1]["highlights"]["description"],
+                         "<mark>Drainage</mark> &lt;b&gt;overflow&lt;/b&gt; near school")
+        self.assertEqual(results[1]["user_email"], "owner@example.com")
+
+    def test_prefix_and_all_words(self):
+        self.assertEqual(len(self.search("flood").json()["results"]), 20)
+        self.assertEqual([r["id"] for r in self.search("drainage scho").json()["results"]], [self.by_description.pk])
+        self.assertEqual(self.search("  ").json(), {"next": None, "results": []})
+
+    def test_keyset_pages(self):
+        seen = []
+        response = self.search("flooded street", page_size=10)
+        while True:
+            body = response.json()
+            seen += [r["id"] for r in body["results"]]
+            if not body["next"]:
+                break
+            with QueryLog() as log:
+                response = self.client.get(body["next"])
+            self.assertLessEqual(log.count, 2, log.describe())
+        self.assertEqual(len(seen), 25)
+        self.assertEqual(len(set(seen)), 25)
+        self.assertEqual(self.search("x", cursor="garbage").status_code, 400)
+
+    def test_index_follows_writes(self):
+        report = self.by_description
+        Report.objects.filter(pk=report.pk).update(description="Broken streetlight")
+        self.assertEqual([r["id"] for r in self.search("streetlight").json()["results"]], [report.pk])
+        self.assertEqual(len(self.search("overflow").json()["results"]), 0)
+        report.delete()
+        self.assertEqual(len(self.search("streetlight").json()["results"]), 0)
+
+    def test_admin_only(self):
+        self.client.force_authenticate(get_user_model().objects.get(email="owner@example.com"))
+        self.assertEqual(self.search("drainage").status_code, 403)
+
+
+@skipUnless(connection.vendor == "sqlite", "FTS5 triggers are SQLite-only")
+class ReportSearchTriggerTests(TransactionTestCase):
+    def create_report(self, name):
+        owner, _ = get_user_model().objects.get_or_create(email="owner@example.com")
+        return Report.objects.create(user=owner, name=name, contact="1", description="Flooded street",
+                                     latitude=7.8, longitude=125.0)
+
+    def test_migrate_restores_dropped_triggers(self):
+        self.assertEqual(missing_search_objects(connection), set())
+
+        # What a table rebuild of reports_report leaves behind
+        with connection.cursor() as cursor:
+            cursor.execute("DROP TRIGGER reports_report_fts_insert")
+            cursor.execute("DROP TRIGGER reports_report_fts_update")
+        self.assertEqual(missing_search_objects(connection),
+                         {("trigger", "reports_report_fts_insert"), ("trigger", "reports_report_fts_update")})
+        report = self.create_report("Unindexed Culvert")
+        self.assertEqual(search_reports("culvert"), [])
+
+        with self.assertLogs("reports.signals", "WARNING"):
+            call_command("migrate", verbosity=0)
+        self.assertEqual(missing_search_objects(connection), set())
+        self.assertEqual([r["id"] for r in search_reports("culvert")], [report.pk])  # reindexed
+        self.assertEqual(len(search_reports(self.create_report("Another Culvert").name)), 1)
@@ -0,0 +1,59 @@
+# reports/thumbnails.py
+import io
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.files.base import ContentFile
+from django.db import close_old_connections, transaction
+from PIL import Image, ImageOps
+
+from .models import Report
+
+logger = logging.getLogger(__name__)
+
+THUMBNAIL_SIZE = (320, 320)
+
+# Resizing uploads is CPU work; keep it off the request path, one at a time.
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="report-thumbnails")
+
+
+def render_thumbnail(fileobj, size=THUMBNAIL_SIZE):
+    """JPEG bytes of the image scaled to fit `size`, EXIF rotation applied."""
+    with Image.open(fileobj) as image:
+        image.draft("RGB", size)  # JPEG: decode at reduced scale, much cheaper than full size
+        image = ImageOps.exif_transpose(image)
+        image.thumbnail(size)
+        buffer = io.BytesIO()
+        image.convert("RGB").save(buffer, "JPEG", quality=80, optimize=True)
+    return buffer.getvalue()
+
+
+def make_thumbnail(report_id):
+    """Create the list thumbnail for one report's image; returns the stored name or None."""
+    report = Report.objects.only("id", "image", "thumbnail").get(pk=report_id)
+    if not report.image or report.thumbnail:
+        return report.thumbnail.name or None
+
+    with report.image.open("rb") as source:
+        data = render_thumbnail(source)
+    name = os.path.splitext(os.path.basename(report.image.name))[0] + ".jpg"
+    report.thumbnail.save(name, ContentFile(data), save=False)
+    Report.objects.filter(pk=report_id).update(thumbnail=report.thumbnail.name)
+    return report.thumbnail.name
+
+
+def _run(report_id):
+    close_old_connections()
+    try:
+        make_thumbnail(report_id)
+    except Exception:
+        logger.exception("Thumbnail for report %s failed", report_id)
+    finally:
+        close_old_connections()
+
+
+def schedule_thumbnail(report):
+    """Queue thumbnail creation once the report row is committed."""
+    if report.image:
+        transaction.on_commit(lambda: _executor.submit(_run, report.pk))
@@ -1,22 +1,74 @@
+from datetime import datetime, time, timedelta
 from rest_framework import generics, permissions, viewsets, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.utils.dateparse import parse_date, parse_datetime
+from django.utils.timezone import is_naive, make_aware
 from .models import Report
-from .serializers import ReportSerializer
+from .serializers import (
+    BulkStatusSerializer, ReportSerializer, ReportListSerializer, fast_report_rows, report_list_queryset,
+)
+from .search import decode_cursor, encode_cursor, search_reports
+from .status import TooManyReports, change_report_status
+from .thumbnails import schedule_thumbnail
 from .permissions import IsCustomAdmin  # ✅ use your custom permission
 from notifications.models import Notification  # ✅ import notification model
+from core.fastpath import FastListMixin
 
 User = get_user_model()
 
 
+def _date_bound(params, name, end=False):
+    """(lookup, value) for ?date_from= / ?date_to=; whole days are inclusive."""
+    raw = params.get(name)
+    if not raw:
+        return None
+    try:
+        day = parse_date(raw)
+        if day is not None:
+            if end:
+                return "date_created__lt", make_aware(datetime.combine(day + timedelta(days=1), time.min))
+            return "date_created__gte", make_aware(datetime.combine(day, time.min))
+        value = parse_datetime(raw)
+        if value is None:
+            raise ValueError
+    except ValueError:
+        raise ValidationError({name: "Use YYYY-MM-DD or an ISO 8601 datetime."})
+    if is_naive(value):
+        value = make_aware(value)
+    return ("date_created__lte" if end else "date_created__gte"), value
+
+
+def filter_reports(queryset, params):
+    """
+    Narrow a report list by ?status= (comma-separated) and ?date_from= /
+    ?date_to=; both are served by the (status, date_created) indexes.
+    """
+    statuses = [value for value in params.get("status", "").split(",") if value]
+    if statuses:
+        choices = [choice for choice, _ in Report.STATUS_CHOICES]
+        unknown = [value for value in statuses if value not in choices]
+        if unknown:
+            raise ValidationError({"status": f"Unknown status {', '.join(unknown)}; use {', '.join(choices)}."})
+        queryset = queryset.filter(status__in=statuses)
+
+    for bound in (_date_bound(params, "date_from"), _date_bound(params, "date_to", end=True)):
+        if bound:
+            queryset = queryset.filter(**{bound[0]: bound[1]})
+    return queryset
+
+
 # 🧭 User can submit a report
 class ReportCreateView(generics.CreateAPIView):
     serializer_class = ReportSerializer
     permission_classes = [permissions.IsAuthenticated]
 
     def perform_create(self, serializer):
-        report = serializer.save(user=self.request.user)
+        report = serializer.save(user_id=self.request.user.pk)
+        schedule_thumbnail(report)
 
         # ✅ Notify all admin users
         admins = User.objects.filter(role="admin")
@@ -33,28 +85,49 @@ class ReportCreateView(generics.CreateAPIView):
 
 
 # 🧭 Admin can view all reports
-class ReportListView(generics.ListAPIView):
-    serializer_class = ReportSerializer
-    queryset = Report.objects.all().order_by("-date_created")
+class ReportListView(FastListMixin, generics.ListAPIView):
+    serializer_class = ReportListSerializer
+    fast_list = fast_report_rows
     permission_classes = [IsCustomAdmin]  # ✅ replaced IsAdminUser
 
+    def get_queryset(self):
+        queryset = report_list_queryset(Report.objects.order_by("-date_created"))
+        return filter_reports(queryset, self.request.query_params)
+
 
 # 🧭 Admin can update report status
 class ReportUpdateView(generics.UpdateAPIView):
     serializer_class = ReportSerializer
-    queryset = Report.objects.all()
+    queryset = Report.objects.select_related("user")
     permission_classes = [IsCustomAdmin]  # ✅ replaced IsAdminUser
 
+    def perform_update(self, serializer):
+        report = serializer.save()
+        if "image" in serializer.validated_data:
+            # New (or removed) image: the old thumbnail no longer matches
+            Report.objects.filter(pk=report.pk).update(thumbnail=None)
+            report.thumbnail = None
+            schedule_thumbnail(report)
+
 
-class ReportViewSet(viewsets.ModelViewSet):
-    queryset = Report.objects.all().order_by('-date_created')
+class ReportViewSet(FastListMixin, viewsets.ModelViewSet):
+    queryset = Report.objects.select_related('user').order_by('-date_created')
     serializer_class = ReportSerializer
+    fast_list = fast_report_rows
+
+    def get_queryset(self):
+        if self.action == 'list':
+            return filter_reports(report_list_queryset(super().get_queryset()), self.request.query_params)
+        return super().get_queryset()
+
+    def get_serializer_class(self):
+        return ReportListSerializer if self.action == 'list' else ReportSerializer
 
     def get_permissions(self):
         """
         Apply admin-only permissions for certain actions.
         """
-        if self.action in ['update_status', 'destroy']:
+        if self.action in ['update_status', 'bulk_status', 'search', 'destroy']:
             permission_classes = [IsCustomAdmin]
         elif self.action in ['create']:
             permission_classes = [permissions.IsAuthenticated]
@@ -74,16 +147,8 @@ class ReportViewSet(viewsets.ModelViewSet):
             if not new_status or new_status not in ['Pending', 'In Progress', 'Resolved']:
                 return Response({'error': 'Invalid status value.'}, status=status.HTTP_400_BAD_REQUEST)
 
-            # Update status
-            report.status = new_status
-            report.save()
-
-            # 🔔 Create a notification for the report owner
-            Notification.objects.create(
-                user=report.user,
-                title="📢 Report Status Updated",
-                message=f"Your report '{report.description[:30]}...' has been marked as '{new_status}'."
-            )
+            # Update status, audit it and notify the owner
+            change_report_status(Report.objects.filter(pk=report.pk), new_status, request.user.pk)
 
             return Response(
                 {'message': 'Status updated successfully.', 'status': new_status},
@@ -93,3 +158,81 @@ class ReportViewSet(viewsets.ModelViewSet):
         except Report.DoesNotExist:
             return Response({'error': 'Report not found'}, status=status.HTTP_404_NOT_FOUND)
 
+    @action(detail=False, methods=['post'], url_path='bulk_status', permission_classes=[IsCustomAdmin])
+    def bulk_status(self, request):
+        """
+        Set one status on many reports, chosen by id or by the list filters:
+        {"status": "Resolved", "ids": [1, 2, 3]} or
+        {"status": "Resolved", "filter": {"status": "In Progress", "date_to": "2025-01-31"}}.
+        """
+        serializer = BulkStatusSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        not_found = []
+        if 'ids' in data:
+            ids = set(data['ids'])
+            queryset = Report.objects.filter(pk__in=ids)
+            found = set(queryset.values_list('pk', flat=True))
+            not_found = sorted(ids - found)
+            matched = len(found)
+        else:
+            queryset = filter_reports(Report.objects.all(), data['filter'])
+            matched = queryset.count()
+
+        try:
+            result = change_report_status(queryset, data['status'], request.user.pk)
+        except TooManyReports as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(
+            {
+                'status': data['status'],
+                'matched': matched,
+                'updated': result['updated'],
+                'unchanged': matched - result['updated'],
+                'not_found': not_found,
+                'notified_users': result['notified_users'],
+            },
+            status=status.HTTP_200_OK,
+        )
+
+    @action(detail=False, methods=['get'], url_path='search', permission_classes=[IsCustomAdmin])
+    def search(self, request):
+        """
+        Full-text search over name, description and contact, best match first:
+        ?q=flooded drain&page_size=20, then follow `next` (a keyset cursor).
+        Each result is a list row plus `rank` and <mark>-highlighted fields.
+        """
+        params = request.query_params
+        after = None
+        if params.get('cursor'):
+            after = decode_cursor(params['cursor'])
+            if after is None:
+                return Response({'error': 'Invalid cursor.'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            page_size = int(params.get('page_size', settings.REPORT_SEARCH_PAGE_SIZE))
+        except ValueError:
+            return Response({'error': 'page_size must be a number.'}, status=status.HTTP_400_BAD_REQUEST)
+        page_size = max(1, min(page_size, settings.REPORT_SEARCH_MAX_PAGE_SIZE))
+
+        # One row more than the page tells us whether there is a next page
+        hits = search_reports(params.get('q', ''), after=after, limit=page_size + 1)
+        more, hits = len(hits) > page_size, hits[:page_size]
+
+        rows = fast_report_rows(
+            report_list_queryset(Report.objects.filter(pk__in=[hit['id'] for hit in hits])),
+            self.get_serializer_context(),
+        )
+        by_id = {row['id']: row for row in rows}
+        results = [
+            {**by_id[hit['id']], 'rank': hit['rank'], 'highlights': hit['highlights']}
+            for hit in hits if hit['id'] in by_id
+        ]
+
+        next_url = None
+        if more:
+            query = params.copy()
+            query['cursor'] = encode_cursor(hits[-1]['rank'], hits[-1]['id'])
+            next_url = request.build_absolute_uri(f"{request.path}?{query.urlencode()}")
+        return Response({'next': next_url, 'results': results}, status=status.HTTP_200_OK)
@@ -13,15 +13,16 @@ class SchedulerConfig(AppConfig):
         from apscheduler.triggers.interval import IntervalTrigger
         from django_apscheduler.jobstores import DjangoJobStore, register_events
         from weather.views import fetch_and_store_weather_data
+        from django.conf import settings
         import atexit
 
         scheduler = BackgroundScheduler()
         scheduler.add_jobstore(DjangoJobStore(), "default")
 
-        # Run every hour
+        # Run every WEATHER_INGEST_INTERVAL seconds (default: hourly)
         scheduler.add_job(
             fetch_and_store_weather_data,
-            trigger=IntervalTrigger(hours=1),
+            trigger=IntervalTrigger(seconds=settings.WEATHER_INGEST_INTERVAL),
             id="fetch_weather_job",
             replace_existing=True,
         )
@@ -0,0 +1,95 @@
+# users/authentication.py
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.utils.functional import cached_property
+from rest_framework_simplejwt.authentication import JWTStatelessUserAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+
+User = get_user_model()
+
+REVOKED_USER_KEY = "revoked_user_{}"
+# Sub-second issue time set by add_role_claims(); "iat" is whole seconds, too
+# coarse to order a token against a revocation in the same second
+ISSUED_AT_CLAIM = "issued_at"
+
+
+def revoke_user_tokens(user_id, revoked_at):
+    """
+    Reject every access token issued to this user before `revoked_at` (unix
+    seconds, fractional). The entry only needs to outlive the access tokens
+    it guards, so it expires with ACCESS_TOKEN_LIFETIME.
+    """
+    timeout = int(api_settings.ACCESS_TOKEN_LIFETIME.total_seconds())
+    cache.set(REVOKED_USER_KEY.format(user_id), float(revoked_at), timeout=timeout)
+
+
+def token_issued_at(token):
+    """
+    When `token` was issued. Tokens minted before ISSUED_AT_CLAIM existed
+    count from the start of their "iat" second, so a revocation in that
+    second still rejects them.
+    """
+    return token.get(ISSUED_AT_CLAIM, token.get("iat", 0))
+
+
+def get_user_instance(user):
+    """Return a CustomUser for request.user, loading it only for token users."""
+    if isinstance(user, User):
+        return user
+    return User.objects.get(pk=user.pk)
+
+
+class RoleTokenUser(TokenUser):
+    """
+    Lightweight request.user built from the role-scoped claims put in the
+    access token by CustomTokenObtainPairSerializer.get_token().
+    """
+
+    @cached_property
+    def email(self):
+        return self.token.get("email", "")
+
+    @cached_property
+    def role(self):
+        return self.token.get("role")
+
+    @cached_property
+    def is_active(self):
+        return self.token.get("is_active", True)
+
+    def get_username(self):
+        return self.email
+
+    def __str__(self):
+        return f"{self.email} ({self.role})"
+
+    def __eq__(self, other):
+        # Let ownership checks compare a token user against a CustomUser row
+        if isinstance(other, (TokenUser, User)):
+            return self.pk == other.pk
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self.pk)
+
+
+class StatelessJWTAuthentication(JWTStatelessUserAuthentication):
+    """
+    Authenticates from the token claims alone (no CustomUser query), while
+    honouring the short-lived revocation entries written when an account is
+    deactivated or its role changes.
+    """
+
+    def get_user(self, validated_token):
+        user = super().get_user(validated_token)
+
+        revoked_at = cache.get(REVOKED_USER_KEY.format(user.pk))
+        if revoked_at is not None and token_issued_at(validated_token) < revoked_at:
+            raise AuthenticationFailed("Token has been revoked.", code="token_revoked")
+
+        if not user.is_active:
+            raise AuthenticationFailed("User is inactive", code="user_inactive")
+
+        return user
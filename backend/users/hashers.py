@@ -0,0 +1,24 @@
+# users/hashers.py
+from django.conf import settings
+from django.contrib.auth.hashers import Argon2PasswordHasher
+
+
+class TunedArgon2PasswordHasher(Argon2PasswordHasher):
+    """
+    Argon2 with cost parameters taken from settings, so login CPU/memory per
+    request can be sized for the deployment. Changing the parameters makes
+    existing argon2 hashes rehash on their next successful login.
+    """
+
+    # Read on every use, so settings changed after import (override_settings) apply
+    @property
+    def time_cost(self):
+        return getattr(settings, "ARGON2_TIME_COST", Argon2PasswordHasher.time_cost)
+
+    @property
+    def memory_cost(self):
+        return getattr(settings, "ARGON2_MEMORY_COST", Argon2PasswordHasher.memory_cost)
+
+    @property
+    def parallelism(self):
+        return getattr(settings, "ARGON2_PARALLELISM", Argon2PasswordHasher.parallelism)
@@ -0,0 +1,172 @@
+# users/importers.py
+import csv
+import io
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import IntegrityError, transaction
+
+from .serializers import ResidentImportSerializer
+
+User = get_user_model()
+
+DEFAULT_BATCH_SIZE = 500
+HASH_CHUNK_SIZE = 16  # passwords per pool task
+
+# One hashing pool for the whole process, shared by concurrent uploads
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _init_worker():
+    # Needed on spawn-based platforms; a no-op after fork
+    django.setup()
+
+
+def _hashing_pool(workers):
+    return ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) if workers > 0 else None
+
+
+def _shared_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = _hashing_pool(settings.USER_IMPORT_WORKERS)
+        return _pool
+
+
+def _hash_passwords(passwords, executor):
+    """Hash a batch of passwords, spread across the process pool if any."""
+    if executor is None:
+        return [make_password(p) for p in passwords]
+    return list(executor.map(make_password, passwords, chunksize=HASH_CHUNK_SIZE))
+
+
+def _insert_batch(batch, report):
+    """
+    Insert one batch with a single bulk_create. If a concurrent writer beat
+    us to an email, fall back to row-by-row inserts to pinpoint the rows.
+    """
+    try:
+        with transaction.atomic():
+            User.objects.bulk_create([user for _, user in batch])
+        report["created"] += len(batch)
+        return
+    except IntegrityError:
+        pass
+
+    for row_number, user in batch:
+        try:
+            with transaction.atomic():
+                user.pk = None
+                user.save(force_insert=True)
+            report["created"] += 1
+        except IntegrityError:
+            report["errors"].append({
+                "row": row_number,
+                "email": user.email,
+                "errors": {"email": ["This email is already registered."]},
+            })
+
+
+def _flush(pending, report, executor):
+    if not pending:
+        return
+
+    emails = [data["email"] for _, data in pending]
+    existing = set(User.objects.filter(email__in=emails).values_list("email", flat=True))
+
+    rows = []
+    for row_number, data in pending:
+        if data["email"] in existing:
+            report["errors"].append({
+                "row": row_number,
+                "email": data["email"],
+                "errors": {"email": ["This email is already registered."]},
+            })
+        else:
+            rows.append((row_number, data))
+
+    to_hash = [data["password"] for _, data in rows if data.get("password")]
+    hashes = iter(_hash_passwords(to_hash, executor))
+
+    batch = []
+    for row_number, data in rows:
+        password = data.pop("password", "")
+        user = User(role="user", **data)
+        if password:
+            user.password = next(hashes)
+        else:
+            user.set_unusable_password()
+        batch.append((row_number, user))
+
+    _insert_batch(batch, report)
+
+
+def _import_rows(csv_file, batch_size, executor):
+    report = {"total": 0, "created": 0, "errors": []}
+    seen = set()
+    pending = []
+    for row_number, row in enumerate(csv.DictReader(csv_file), start=2):
+        report["total"] += 1
+        # Treat empty cells as missing values
+        row = {k.strip(): v.strip() for k, v in row.items() if k and v and v.strip()}
+
+        serializer = ResidentImportSerializer(data=row)
+        if not serializer.is_valid():
+            report["errors"].append({
+                "row": row_number,
+                "email": row.get("email"),
+                "errors": serializer.errors,
+            })
+            continue
+
+        data = dict(serializer.validated_data)
+        data["email"] = User.objects.normalize_email(data["email"])
+        if data["email"] in seen:
+            report["errors"].append({
+                "row": row_number,
+                "email": data["email"],
+                "errors": {"email": ["Duplicate email in file."]},
+            })
+            continue
+        seen.add(data["email"])
+
+        pending.append((row_number, data))
+        if len(pending) >= batch_size:
+            _flush(pending, report, executor)
+            pending = []
+
+    _flush(pending, report, executor)
+
+    report["errors"].sort(key=lambda e: e["row"])
+    return report
+
+
+def import_residents(csv_file, batch_size=DEFAULT_BATCH_SIZE, workers=None):
+    """
+    Create resident accounts from a CSV with a header row matching
+    ResidentImportSerializer's fields. Rows are validated individually and
+    inserted in batches. Passwords are hashed on the process-wide pool of
+    USER_IMPORT_WORKERS processes, or on a pool of `workers` processes
+    owned by this call (0 hashes in-process). Bytes must be UTF-8
+    (UnicodeDecodeError otherwise).
+
+    Returns {"total", "created", "errors": [{"row", "email", "errors"}]}.
+    """
+    if isinstance(csv_file, (bytes, bytearray)):
+        csv_file = io.StringIO(csv_file.decode("utf-8-sig"))
+
+    if workers is None:
+        executor, owned = _shared_pool(), False
+    else:
+        executor, owned = _hashing_pool(workers), True
+    try:
+        return _import_rows(csv_file, batch_size, executor)
+    finally:
+        if owned and executor is not None:
+            executor.shutdown()
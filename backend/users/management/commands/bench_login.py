@@ -0,0 +1,62 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test.utils import override_settings
+from rest_framework.test import APIRequestFactory
+
+from users.models import CustomUser
+from users.tokens import CustomTokenObtainPairView
+
+HASHERS = {
+    "pbkdf2": "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+    "argon2": "users.hashers.TunedArgon2PasswordHasher",
+    "pbkdf2_sha1": "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+}
+
+BENCH_EMAIL = "bench-login@rainsafe.local"
+BENCH_PASSWORD = "bench-Password-123"
+
+
+class Command(BaseCommand):
+    help = "Measure single-core login throughput (logins/sec) per password hasher"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--logins", type=int, default=20, help="Logins per hasher")
+        parser.add_argument(
+            "--hashers",
+            nargs="+",
+            default=["pbkdf2", "argon2"],
+            choices=sorted(HASHERS),
+            help="Hashers to compare (first one is the baseline)",
+        )
+
+    def handle(self, *args, **options):
+        # Throttles off: we're measuring hashing + token issuing, not limits
+        view = CustomTokenObtainPairView.as_view(throttle_classes=[])
+        factory = APIRequestFactory()
+        payload = {"email": BENCH_EMAIL, "password": BENCH_PASSWORD}
+
+        results = []
+        for name in options["hashers"]:
+            with override_settings(PASSWORD_HASHERS=[HASHERS[name]]), transaction.atomic():
+                CustomUser.objects.create_user(
+                    BENCH_EMAIL, BENCH_PASSWORD, first_name="Bench", last_name="User"
+                )
+
+                start = time.perf_counter()
+                for _ in range(options["logins"]):
+                    response = view(factory.post("/api/token/", payload, format="json"))
+                    if response.status_code != 200:
+                        raise RuntimeError(f"Login failed with {name}: {response.data}")
+                elapsed = time.perf_counter() - start
+
+                # Never keep the benchmark user
+                transaction.set_rollback(True)
+
+            results.append((name, options["logins"] / elapsed, elapsed * 1000 / options["logins"]))
+
+        baseline = results[0][1]
+        self.stdout.write(f"{'hasher':<12} {'logins/sec':>12} {'ms/login':>10} {'speedup':>9}")
+        for name, rate, ms in results:
+            self.stdout.write(f"{name:<12} {rate:>12.1f} {ms:>10.2f} {rate / baseline:>8.2f}x")
@@ -0,0 +1,35 @@
+import json
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from users.importers import DEFAULT_BATCH_SIZE, import_residents
+
+
+class Command(BaseCommand):
+    help = "Bulk-create resident accounts from a CSV file"
+
+    def add_arguments(self, parser):
+        parser.add_argument("csv_path", help="CSV with a header row (email, first_name, last_name, password, purok, barangay, municipal, province, ...)")
+        parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+        parser.add_argument("--workers", type=int, default=None, help="Password hashing processes (default: CPU count, 0 = in-process)")
+        parser.add_argument("--report", help="Write the per-row error report to this JSON file")
+
+    def handle(self, *args, **options):
+        workers = os.cpu_count() if options["workers"] is None else options["workers"]
+        try:
+            with open(options["csv_path"], newline="", encoding="utf-8-sig") as f:
+                report = import_residents(f, batch_size=options["batch_size"], workers=workers)
+        except (OSError, UnicodeDecodeError) as e:
+            raise CommandError(f"Cannot read {options['csv_path']}: {e}")
+
+        if options["report"]:
+            with open(options["report"], "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2)
+
+        for error in report["errors"]:
+            self.stdout.write(self.style.WARNING(f"Row {error['row']} ({error['email']}): {error['errors']}"))
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {report['created']} of {report['total']} rows ({len(report['errors'])} errors)"
+        ))
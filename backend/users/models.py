@@ -1,5 +1,6 @@
 from django.contrib.auth.models import AbstractUser, BaseUserManager
 from django.db import models
+from django.db.models.functions import Lower
 
 
 class CustomUserManager(BaseUserManager):
@@ -56,5 +57,19 @@ class CustomUser(AbstractUser):
 
     objects = CustomUserManager()  # ✅ attach custom manager
 
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            # Area/role filters in the admin directory search, with id as the
+            # keyset pagination column
+            models.Index(fields=["barangay", "id"], name="user_barangay_id_idx"),
+            models.Index(fields=["municipal", "id"], name="user_municipal_id_idx"),
+            models.Index(fields=["province", "id"], name="user_province_id_idx"),
+            models.Index(fields=["role", "id"], name="user_role_id_idx"),
+            # Case-insensitive prefix search (range scans on lower(...))
+            models.Index(Lower("email"), name="user_email_lower_idx"),
+            models.Index(Lower("first_name"), name="user_first_name_lower_idx"),
+            models.Index(Lower("last_name"), name="user_last_name_lower_idx"),
+        ]
+
     def __str__(self):
         return f"{self.email} ({self.role})"
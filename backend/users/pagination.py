@@ -0,0 +1,10 @@
+# users/pagination.py
+from rest_framework.pagination import CursorPagination
+
+
+class UserDirectoryPagination(CursorPagination):
+    """Keyset pagination on id: each page is one index range scan."""
+    ordering = "id"
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 200
@@ -1,4 +1,5 @@
 # users/permissions.py
+from django.contrib.auth import get_user_model
 from rest_framework.permissions import BasePermission, SAFE_METHODS
 
 
@@ -38,13 +39,15 @@ class IsOwnerOrAdmin(BasePermission):
         return request.user and request.user.is_authenticated
 
     def has_object_permission(self, request, view, obj):
+        # Compare ids so this works for CustomUser and stateless token users
         user = request.user
         if getattr(user, "role", None) == "admin":
             return True
+        if isinstance(obj, get_user_model()):
+            return obj.pk == user.pk
         return (
-            obj == user
-            or getattr(obj, "user", None) == user
-            or getattr(obj, "owner", None) == user
+            getattr(obj, "user_id", None) == user.pk
+            or getattr(obj, "owner_id", None) == user.pk
         )
 
 
@@ -1,3 +1,4 @@
+from django.db import IntegrityError, transaction
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
 from django.contrib.auth.password_validation import validate_password
@@ -49,16 +50,15 @@ class RegisterSerializer(serializers.ModelSerializer):
             "municipal",
             "province",
         ]
+        # Uniqueness is enforced by the DB constraint in create(), not by an
+        # extra SELECT that can race with a concurrent registration.
+        extra_kwargs = {"email": {"validators": []}}
 
     def validate(self, attrs):
         # Check password match
         if attrs["password"] != attrs["password2"]:
             raise serializers.ValidationError({"password": "Passwords didn’t match."})
 
-        # Check for duplicate email
-        if User.objects.filter(email=attrs["email"]).exists():
-            raise serializers.ValidationError({"email": "This email is already registered."})
-
         return attrs
 
     def create(self, validated_data):
@@ -66,10 +66,40 @@ class RegisterSerializer(serializers.ModelSerializer):
         password = validated_data.pop("password")
 
         # Use custom manager so email is respected
-        user = User.objects.create_user(
-            password=password,
-            role="user",  # default role
-            **validated_data
-        )
+        try:
+            with transaction.atomic():
+                user = User.objects.create_user(
+                    password=password,
+                    role="user",  # default role
+                    **validated_data
+                )
+        except IntegrityError:
+            raise serializers.ValidationError({"email": "This email is already registered."})
         return user
 
+
+class ResidentImportSerializer(serializers.ModelSerializer):
+    """Validates one CSV row of the admin bulk resident import."""
+    password = serializers.CharField(
+        required=False,
+        allow_blank=True,
+        validators=[validate_password]
+    )
+
+    class Meta:
+        model = User
+        fields = [
+            "email",
+            "first_name",
+            "last_name",
+            "password",
+            "age",
+            "contact_number",
+            "sex",
+            "purok",
+            "barangay",
+            "municipal",
+            "province",
+        ]
+        # Duplicates are checked per batch by the importer
+        extra_kwargs = {"email": {"validators": []}}
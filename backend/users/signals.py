@@ -0,0 +1,36 @@
+# users/signals.py
+import time
+
+from django.db.models.signals import post_delete, pre_save
+from django.dispatch import receiver
+
+from .authentication import revoke_user_tokens
+from .models import CustomUser
+
+# Fields carried as claims in the access token
+TOKEN_CLAIM_FIELDS = ("is_active", "role", "is_staff")
+
+
+@receiver(pre_save, sender=CustomUser)
+def revoke_stale_claims(sender, instance, update_fields=None, **kwargs):
+    """Revoke outstanding tokens when a claim-backed field changes."""
+    if instance.pk is None:
+        return
+    if update_fields is not None and not set(update_fields) & set(TOKEN_CLAIM_FIELDS):
+        return
+
+    previous = (
+        CustomUser.objects.filter(pk=instance.pk)
+        .values(*TOKEN_CLAIM_FIELDS)
+        .first()
+    )
+    if previous is None:
+        return
+
+    if any(previous[field] != getattr(instance, field) for field in TOKEN_CLAIM_FIELDS):
+        revoke_user_tokens(instance.pk, time.time())
+
+
+@receiver(post_delete, sender=CustomUser)
+def revoke_deleted_user(sender, instance, **kwargs):
+    revoke_user_tokens(instance.pk, time.time())
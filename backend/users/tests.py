@@ -1,3 +1,240 @@
-from django.test import TestCase
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from rest_framework.throttling import SimpleRateThrottle
+from rest_framework_simplejwt.tokens import AccessToken
+
+from core.testing import QueryBudgetMixin
+from .authentication import ISSUED_AT_CLAIM, StatelessJWTAuthentication, revoke_user_tokens
+from .hashers import TunedArgon2PasswordHasher
+from .importers import import_residents
+from .views import CurrentUserView
+
+
+class UserQueryBudgetTests(QueryBudgetMixin, TestCase):
+    query_budgets = {
+        "current user": ("/api/users/me/", 1),
+        "user list": ("/api/users/list/", 2),
+        "user search": ("/api/users/search/?municipal=Maramag&q=res", 2),
+        "user detail": ("/api/users/{self.user.pk}/", 2),
+    }
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(email="admin@example.com", role="admin")
+
+    def populate(self, size):
+        User = get_user_model()
+        for i in range(User.objects.count(), size + 1):
+            User.objects.create_user(email=f"resident{i}@example.com", municipal="Maramag")
+
+
+class UserSearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.admin = User.objects.create_user(email="admin@example.com", role="admin")
+        User.objects.create_user(email="nono@example.com", first_name="Ñoño", last_name="Cruz")
+        User.objects.create_user(email="jose@example.com", first_name="José", last_name="Niño")
+        User.objects.create_user(email="nora@example.com", first_name="Nora", last_name="Santos")
+
+    def search(self, q):
+        client = APIClient()
+        client.force_authenticate(self.admin)
+        response = client.get("/api/users/search/", {"q": q})
+        self.assertEqual(response.status_code, 200)
+        return sorted(user["email"] for user in response.json()["results"])
+
+    def test_ascii_prefix(self):
+        self.assertEqual(self.search("NO"), ["nono@example.com", "nora@example.com"])
+        self.assertEqual(self.search("cru"), ["nono@example.com"])
+
+    def test_non_ascii_prefix_in_any_case(self):
+        for q in ("Ñ", "ñ", "ñoñ", "ÑOÑO", "Ñoño"):
+            self.assertEqual(self.search(q), ["nono@example.com"], q)
+        self.assertEqual(self.search("niñ"), ["jose@example.com"])
+        self.assertEqual(self.search("JOSÉ"), ["jose@example.com"])
+
+
+@override_settings(USER_IMPORT_WORKERS=0)
+class ResidentImportTests(TestCase):
+    CSV = (
+        "email,first_name,last_name,password,age,barangay\n"
+        "ana@example.com,Ana,Cruz,Tr1cky-pass-42,31,Poblacion\n"
+        "ana@EXAMPLE.com,Ana,Cruz,,,\n"
+        "not-an-email,Ben,Reyes,,,\n"
+        "carlo@example.com,Carlo,Santos,,,Sto. Niño\n"
+    )
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.admin = User.objects.create_user(email="admin@example.com", role="admin")
+        cls.resident = User.objects.create_user(email="resident@example.com")
+
+    def upload(self, content, user=None):
+        client = APIClient()
+        client.force_authenticate(user or self.admin)
+        return client.post("/api/users/import/", {"file": SimpleUploadedFile("residents.csv", content)})
+
+    def test_import_reports_row_errors(self):
+        report = import_residents(("\ufeff" + self.CSV).encode())
+        self.assertEqual((report["total"], report["created"]), (4, 2))
+        self.assertEqual([e["row"] for e in report["errors"]], [3, 4])
+        self.assertIn("email", report["errors"][1]["errors"])
+
+        User = get_user_model()
+        ana = User.objects.get(email="ana@example.com")
+        self.assertEqual((ana.role, ana.age), ("user", 31))
+        self.assertTrue(ana.check_password("Tr1cky-pass-42"))
+        self.assertFalse(User.objects.get(email="carlo@example.com").has_usable_password())
+
+        # Re-importing creates nothing new
+        report = import_residents(self.CSV.encode())
+        self.assertEqual(report["created"], 0)
+        self.assertEqual(User.objects.filter(email__in=["ana@example.com", "carlo@example.com"]).count(), 2)
+
+    def test_endpoint(self):
+        response = self.upload(self.CSV.encode())
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["created"], 2)
+
+        self.assertEqual(self.upload(self.CSV.encode(), user=self.resident).status_code, 403)
+        self.assertEqual(APIClient().post("/api/users/import/").status_code, 401)
+
+    def test_endpoint_rejects_non_utf8_file(self):
+        response = self.upload(self.CSV.encode("cp1252"))
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("UTF-8", response.json()["error"])
+        self.assertFalse(get_user_model().objects.filter(email="ana@example.com").exists())
+
+    @override_settings(USER_IMPORT_WORKERS=2)
+    def test_uploads_share_one_hashing_pool(self):
+        with mock.patch("users.importers._pool", None), \
+                mock.patch("users.importers.ProcessPoolExecutor") as pool_class:
+            pool_class.return_value.map.side_effect = lambda fn, items, chunksize: map(fn, items)
+            self.upload(self.CSV.encode())
+            self.upload(self.CSV.replace("@example", "@example2").encode())
+        pool_class.assert_called_once()
+        self.assertEqual(pool_class.call_args.kwargs["max_workers"], 2)
+        pool_class.return_value.shutdown.assert_not_called()
+
+
+@mock.patch.object(CurrentUserView, "authentication_classes", [StatelessJWTAuthentication])
+class TokenRevocationTests(TestCase):
+    """Revocation as enforced in JWT_STATELESS_AUTH mode."""
+    password = "Tr1cky-pass-42"
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(email="resident@example.com", password=cls.password)
+
+    def setUp(self):
+        cache.clear()
+
+    def login(self):
+        response = self.client.post(
+            "/api/users/login/", {"email": self.user.email, "password": self.password}, HTTP_HOST="127.0.0.1"
+        )
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def me(self, access):
+        return self.client.get("/api/users/me/", HTTP_AUTHORIZATION=f"Bearer {access}", HTTP_HOST="127.0.0.1")
+
+    def test_claim_change_revokes_outstanding_tokens(self):
+        access = self.login()["access"]
+        self.user.first_name = "Ana"
+        self.user.save()
+        self.assertEqual(self.me(access).status_code, 200)
+
+        self.user.role = "admin"
+        self.user.save()
+        response = self.me(access)
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.json()["code"], "token_revoked")
+
+        # Logging in again right away is fine, even within the same second
+        self.assertEqual(self.me(self.login()["access"]).json()["role"], "admin")
+
+    def test_revocation_is_ordered_within_a_second(self):
+        access = AccessToken(self.login()["access"])
+        issued_at = access[ISSUED_AT_CLAIM]
+        revoke_user_tokens(self.user.pk, issued_at - 0.001)
+        self.assertEqual(self.me(str(access)).status_code, 200)
+        revoke_user_tokens(self.user.pk, issued_at + 0.001)
+        self.assertEqual(self.me(str(access)).status_code, 401)
+
+        # Without the precise claim, the whole "iat" second counts as revoked
+        del access[ISSUED_AT_CLAIM]
+        revoke_user_tokens(self.user.pk, access["iat"] + 0.5)
+        self.assertEqual(self.me(str(access)).status_code, 401)
+
+    def test_deleting_user_revokes_tokens(self):
+        access = self.login()["access"]
+        self.user.delete()
+        self.assertEqual(self.me(access).status_code, 401)
+
+    def test_refresh_reissues_current_claims(self):
+        tokens = self.login()
+        self.user.role = "admin"
+        self.user.save()
+
+        response = self.client.post("/api/users/token/refresh/", {"refresh": tokens["refresh"]}, HTTP_HOST="127.0.0.1")
+        self.assertEqual(response.status_code, 200)
+        access = response.json()["access"]
+        self.assertEqual(AccessToken(access)["role"], "admin")
+        self.assertEqual(self.me(access).status_code, 200)
+
+        self.user.is_active = False
+        self.user.save()
+        response = self.client.post("/api/users/token/refresh/", {"refresh": tokens["refresh"]}, HTTP_HOST="127.0.0.1")
+        self.assertEqual(response.status_code, 401)
+
+
+@mock.patch.object(SimpleRateThrottle, "THROTTLE_RATES", {"login_ip": "5/min", "login_email": "2/min"})
+class LoginThrottleTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def login(self, email, **extra):
+        return APIClient().post(
+            "/api/users/login/", {"email": email, "password": "wrong"}, format="json", HTTP_HOST="127.0.0.1", **extra
+        )
+
+    def test_email_limit_ignores_case_and_spacing(self):
+        self.assertEqual(self.login("ana@example.com").status_code, 401)
+        self.assertEqual(self.login(" ANA@example.com ").status_code, 401)
+        self.assertEqual(self.login("Ana@Example.com").status_code, 429)
+        self.assertEqual(self.login("ben@example.com").status_code, 401)
+
+    def test_ip_limit_spans_emails(self):
+        for i in range(5):
+            self.assertNotEqual(self.login(f"user{i}@example.com").status_code, 429)
+        self.assertEqual(self.login("another@example.com").status_code, 429)
+        self.assertEqual(self.login("another@example.com", REMOTE_ADDR="10.0.0.2").status_code, 401)
+
+    def test_non_string_email_is_left_to_the_serializer(self):
+        for email in (["x"], {"a": 1}, None):
+            response = self.login(email)
+            self.assertEqual(response.status_code, 400, email)
+            self.assertIn("email", response.json())
+        self.assertEqual(self.login(123).status_code, 401)  # coerced to "123"; no such user
+
+
+class TunedArgon2HasherTests(TestCase):
+    def test_cost_settings_are_read_when_hashing(self):
+        hasher = TunedArgon2PasswordHasher()
+        with override_settings(ARGON2_TIME_COST=1, ARGON2_MEMORY_COST=8192, ARGON2_PARALLELISM=2):
+            encoded = hasher.encode("correct horse", hasher.salt())
+            self.assertEqual(
+                {key: hasher.decode(encoded)[key] for key in ("time_cost", "memory_cost", "parallelism")},
+                {"time_cost": 1, "memory_cost": 8192, "parallelism": 2},
+            )
+            self.assertFalse(hasher.must_update(encoded))
+        self.assertTrue(hasher.verify("correct horse", encoded))
+        self.assertTrue(hasher.must_update(encoded))  # rehashed with the configured costs on next login
@@ -0,0 +1,27 @@
+# users/throttles.py
+from rest_framework.throttling import SimpleRateThrottle
+
+
+class LoginIPRateThrottle(SimpleRateThrottle):
+    """Limits login attempts per client IP (rate: 'login_ip')."""
+    scope = "login_ip"
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {
+            "scope": self.scope,
+            "ident": self.get_ident(request),
+        }
+
+
+class LoginEmailRateThrottle(SimpleRateThrottle):
+    """Limits login attempts per submitted email (rate: 'login_email')."""
+    scope = "login_email"
+
+    def get_cache_key(self, request, view):
+        email = request.data.get("email") if hasattr(request.data, "get") else None
+        if not isinstance(email, str) or not email.strip():
+            return None  # nothing to key on (or not a string); the IP throttle still applies
+        return self.cache_format % {
+            "scope": self.scope,
+            "ident": email.strip().lower(),
+        }
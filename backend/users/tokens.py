@@ -1,7 +1,26 @@
 # users/tokens.py
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
-from rest_framework_simplejwt.views import TokenObtainPairView
+import time
+
+from django.contrib.auth import get_user_model
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 from rest_framework import serializers
+from .authentication import ISSUED_AT_CLAIM
+from .throttles import LoginEmailRateThrottle, LoginIPRateThrottle
+
+User = get_user_model()
+
+
+def add_role_claims(token, user):
+    """Claims read by RoleTokenUser so permissions need no user lookup."""
+    token["email"] = user.email
+    token["role"] = user.role
+    token["is_staff"] = user.is_staff
+    token["is_active"] = user.is_active
+    token[ISSUED_AT_CLAIM] = time.time()
+    return token
 
 
 class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
@@ -30,10 +49,32 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
     @classmethod
     def get_token(cls, user):
         token = super().get_token(user)
-        token["email"] = user.email
-        token["role"] = user.role
-        return token
+        return add_role_claims(token, user)
 
 
 class CustomTokenObtainPairView(TokenObtainPairView):
     serializer_class = CustomTokenObtainPairSerializer
+    throttle_classes = [LoginIPRateThrottle, LoginEmailRateThrottle]
+
+
+class CustomTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Re-reads the user on refresh so the new access token carries current
+    claims instead of the ones copied from the refresh token.
+    """
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs["refresh"])
+        user = User.objects.filter(pk=refresh[api_settings.USER_ID_CLAIM]).first()
+        if user is None or not user.is_active:
+            raise InvalidToken("User is inactive or no longer exists.")
+
+        data = super().validate(attrs)
+        access = refresh.access_token
+        add_role_claims(access, user)
+        data["access"] = str(access)
+        return data
+
+
+class CustomTokenRefreshView(TokenRefreshView):
+    serializer_class = CustomTokenRefreshSerializer
@@ -1,7 +1,6 @@
 from django.urls import path
-from .views import RegisterView, CurrentUserView, UserDetailAdminView, UserListView
-from .tokens import CustomTokenObtainPairView  # <-- use custom JWT
-from rest_framework_simplejwt.views import TokenRefreshView
+from .views import RegisterView, CurrentUserView, UserDetailAdminView, UserListView, UserBulkImportView, UserSearchView
+from .tokens import CustomTokenObtainPairView, CustomTokenRefreshView  # <-- use custom JWT
 
 urlpatterns = [
     # Registration
@@ -9,12 +8,14 @@ urlpatterns = [
 
     # Authentication
     path("login/", CustomTokenObtainPairView.as_view(), name="login"),
-    path("token/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
+    path("token/refresh/", CustomTokenRefreshView.as_view(), name="token_refresh"),
 
     # User info
     path("me/", CurrentUserView.as_view(), name="current-user"),
 
     # Admin-only
     path("list/", UserListView.as_view(), name="user-list"),  
+    path("search/", UserSearchView.as_view(), name="user-search"),
+    path("import/", UserBulkImportView.as_view(), name="user-bulk-import"),
     path("<int:pk>/", UserDetailAdminView.as_view(), name="user-detail-admin"),
 ]
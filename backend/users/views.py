@@ -1,11 +1,18 @@
-from rest_framework import generics, permissions
+from rest_framework import generics, permissions, status
+from rest_framework.parsers import MultiPartParser
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.views import APIView
 from django.contrib.auth import get_user_model
+from django.db.models import Q
+from django.db.models.functions import Lower
+from django.db.models.lookups import GreaterThanOrEqual, LessThan
 from .serializers import RegisterSerializer, UserSerializer
 from .models import CustomUser
 from .permissions import IsAdmin, IsUser, IsOwnerOrAdmin
+from .authentication import get_user_instance
+from .importers import import_residents
+from .pagination import UserDirectoryPagination
 
 User = get_user_model()
 
@@ -24,7 +31,7 @@ class UserDetailView(generics.RetrieveAPIView):
     permission_classes = [IsOwnerOrAdmin]  # owner or admin can access
 
     def get_object(self):
-        return self.request.user
+        return get_user_instance(self.request.user)
 
 
 # ✅ Get current user data (for frontend auth sync)
@@ -32,7 +39,7 @@ class CurrentUserView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        serializer = UserSerializer(request.user)
+        serializer = UserSerializer(get_user_instance(request.user))
         return Response(serializer.data)
 
 
@@ -43,8 +50,70 @@ class UserListView(generics.ListAPIView):
     permission_classes = [IsAdmin]
 
 
+def _prefix_match(field, prefix):
+    """Case-insensitive prefix match as a range on lower(field), so it can use the functional index."""
+    if not prefix.isascii():
+        # SQLite's LOWER() and LIKE only fold ASCII, so the range would miss
+        # "Ñ"/"ñ"; match the usual casings of the prefix instead (no index).
+        variants = {prefix, prefix.lower(), prefix.upper(), prefix.capitalize()}
+        query = Q()
+        for variant in variants:
+            query |= Q(**{f"{field}__istartswith": variant})
+        return query
+    prefix = prefix.lower()
+    upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+    return Q(GreaterThanOrEqual(Lower(field), prefix), LessThan(Lower(field), upper))
+
+
+# ✅ Search the user directory by area, role and name/email prefix (admin-only access)
+class UserSearchView(generics.ListAPIView):
+    """
+    Filters: ?barangay=&municipal=&province=&role= (exact) and ?q= (prefix of
+    email, first or last name). Results are keyset-paginated by id.
+    """
+    serializer_class = UserSerializer
+    permission_classes = [IsAdmin]
+    pagination_class = UserDirectoryPagination
+
+    def get_queryset(self):
+        params = self.request.query_params
+        queryset = CustomUser.objects.all()
+
+        for field in ("barangay", "municipal", "province", "role"):
+            value = params.get(field)
+            if value:
+                queryset = queryset.filter(**{field: value})
+
+        q = params.get("q", "").strip()
+        if q:
+            queryset = queryset.filter(
+                _prefix_match("email", q)
+                | _prefix_match("first_name", q)
+                | _prefix_match("last_name", q)
+            )
+
+        return queryset
+
+
 # ✅ Retrieve, Update, or Delete a user (admin-only access)
 class UserDetailAdminView(generics.RetrieveUpdateDestroyAPIView):
     queryset = CustomUser.objects.all()
     serializer_class = UserSerializer
     permission_classes = [IsAdmin]
+
+
+# ✅ Bulk-import residents from a CSV upload (admin-only access)
+class UserBulkImportView(APIView):
+    permission_classes = [IsAdmin]
+    parser_classes = [MultiPartParser]
+
+    def post(self, request):
+        upload = request.FILES.get("file")
+        if not upload:
+            return Response({"error": "Upload a CSV file in the 'file' field."}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            report = import_residents(upload.read())
+        except UnicodeDecodeError:
+            return Response({"error": "The CSV file must be UTF-8 encoded."}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(report, status=status.HTTP_200_OK)
@@ -0,0 +1,142 @@
+# backend/weather/alerts.py
+"""
+Threshold alert rules, evaluated on each station's freshly ingested hourly
+window. Work per run is O(rules x new rows) with no history queries.
+"""
+from collections import defaultdict
+from datetime import timedelta
+
+import numpy as np
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
+from django.db.models import Max
+from django.utils.timezone import now
+
+from messenger.delivery import queue_messenger_alert
+from notifications.broadcasts import schedule_broadcast
+from notifications.models import Broadcast, Notification
+from .models import AlertEvent, AlertRule
+
+User = get_user_model()
+
+# Only runs ending in [now - LOOKBACK, now + LOOKAHEAD] fire; older ones were
+# covered by earlier ingestions and far-ahead forecast hours are too uncertain.
+ALERT_LOOKBACK = timedelta(hours=1)
+ALERT_LOOKAHEAD = timedelta(hours=getattr(settings, "ALERT_LOOKAHEAD_HOURS", 6))
+
+
+def load_active_rules():
+    """Active rules grouped by station id (None = rules for every station)."""
+    rules = defaultdict(list)
+    for rule in AlertRule.objects.filter(is_active=True):
+        rules[rule.station_id].append(rule)
+    return rules
+
+
+def first_sustained_breach(values, rule, eligible):
+    """
+    Index of the first reading that completes a run of `duration_hours`
+    consecutive breaches and lies in `eligible`, or None.
+    """
+    with np.errstate(invalid="ignore"):  # NaN (missing) never breaches
+        if rule.operator == "lte":
+            breach = values <= rule.threshold
+        else:
+            breach = values >= rule.threshold
+
+    # Length of the breach run ending at each index
+    idx = np.arange(values.size)
+    last_ok = np.maximum.accumulate(np.where(breach, -1, idx))
+    run_length = idx - last_ok
+
+    hits = np.flatnonzero((run_length >= max(rule.duration_hours, 1)) & eligible)
+    return int(hits[0]) if hits.size else None
+
+
+def evaluate_alert_rules(station, timestamps, columns, rules):
+    """
+    Check `rules` (from load_active_rules) against one station's ingested
+    window. `timestamps` are the hourly reading times in ascending order and
+    `columns` maps metric name to the values aligned with them.
+    Returns the AlertEvents that fired.
+    """
+    station_rules = rules.get(station.id, []) + rules.get(None, [])
+    if not station_rules or not timestamps:
+        return []
+
+    current = now()
+    times = np.array([ts.timestamp() for ts in timestamps])
+    eligible = (
+        (times >= (current - ALERT_LOOKBACK).timestamp())
+        & (times <= (current + ALERT_LOOKAHEAD).timestamp())
+    )
+    arrays = {}
+
+    breaches = []
+    for rule in station_rules:
+        if rule.metric not in arrays:
+            arrays[rule.metric] = np.array(columns.get(rule.metric, []), dtype=float)
+        values = arrays[rule.metric]
+        if values.size != times.size:
+            continue
+
+        hit = first_sustained_breach(values, rule, eligible)
+        if hit is not None:
+            breaches.append((rule, timestamps[hit], float(values[hit])))
+
+    if not breaches:
+        return []
+
+    # Cooldowns: one query for the last firing of every breached rule here
+    last_fired = dict(
+        AlertEvent.objects.filter(station=station, rule__in=[rule for rule, _, _ in breaches])
+        .values("rule_id")
+        .annotate(last=Max("created_at"))
+        .values_list("rule_id", "last")
+    )
+
+    fired = []
+    for rule, reading_time, value in breaches:
+        last = last_fired.get(rule.id)
+        if last and last > current - timedelta(minutes=rule.cooldown_minutes):
+            continue
+        try:
+            with transaction.atomic():
+                event = AlertEvent.objects.create(
+                    rule=rule, station=station, reading_time=reading_time, value=value
+                )
+                _emit(event)
+        except IntegrityError:
+            continue  # same reading already alerted (e.g. concurrent run)
+        fired.append(event)
+
+    return fired
+
+
+def _emit(event):
+    rule, station = event.rule, event.station
+    title = f"⚠️ {rule.name}: {station.name}"
+    comparison = "at or above" if rule.operator == "gte" else "at or below"
+    message = (
+        f"{rule.get_metric_display()} at {station.name} is {comparison} {rule.threshold:g} "
+        f"for {rule.duration_hours}h (reading {event.value:g} at {event.reading_time:%Y-%m-%d %H:%M})."
+    )
+
+    # Messenger subscribers of this station or the rule's barangay
+    queue_messenger_alert(f"{title}\n{message}", station=station, barangay=rule.barangay)
+
+    if rule.barangay or rule.municipal or rule.province:
+        broadcast = Broadcast.objects.create(
+            title=title,
+            message=message,
+            barangay=rule.barangay,
+            municipal=rule.municipal,
+            province=rule.province,
+        )
+        schedule_broadcast(broadcast)
+    else:
+        Notification.objects.bulk_create([
+            Notification(user_id=admin_id, title=title, message=message)
+            for admin_id in User.objects.filter(role="admin").values_list("id", flat=True)
+        ])
@@ -7,4 +7,4 @@ class WeatherConfig(AppConfig):
 
     def ready(self):
         # do not auto-start scheduler here (start centrally in core.apps)
-        pass
+        from . import signals  # noqa: F401
@@ -0,0 +1,94 @@
+"""
+Native async versions of the views that wait on Open-Meteo: live and
+manual fetch. They share one pooled aiohttp session (weather.upstream), so
+an ASGI worker can hold many upstream waits without a thread each. Enabled
+in urls.py by WEATHER_ASYNC_VIEWS.
+"""
+import asyncio
+
+from asgiref.sync import sync_to_async
+from rest_framework import status
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+
+from core.async_views import async_api_view
+from users.permissions import IsAdmin
+from .alerts import load_active_rules
+from .caching import bump_data_version
+from .models import Station, WeatherData
+from .upstream import UpstreamError, fetch_json
+from .views import (
+    live_payload,
+    live_url,
+    reading_summary,
+    station_ingest_url,
+    store_station_weather,
+)
+
+
+async def afetch_and_store_weather_data():
+    """
+    fetch_and_store_weather_data with every station fetched concurrently.
+    Storing stays sync (batched upsert + alert rules), off the event loop.
+    """
+    stations = [station async for station in Station.objects.all()]
+    fetched = await asyncio.gather(
+        *(fetch_json(station_ingest_url(station)) for station in stations),
+        return_exceptions=True,
+    )
+
+    def store():
+        results, rules = [], load_active_rules()
+        for station, data in zip(stations, fetched):
+            if isinstance(data, Exception):
+                results.append({"station": station.name, "error": f"Fetch failed: {str(data)}"})
+                continue
+            results.append(store_station_weather(station, data, rules))
+        bump_data_version()  # new ETags for station/history responses
+        return results
+
+    results = await sync_to_async(store)()
+    return {"message": "Weather data (current + 24h history) updated", "results": results}
+
+
+@async_api_view([IsAdmin])
+async def fetch_weather_data_view(request):
+    """Manual API fetch endpoint (Admin only)."""
+    result = await afetch_and_store_weather_data()
+    has_error = any("error" in r for r in result["results"])
+    status_code = status.HTTP_502_BAD_GATEWAY if has_error else status.HTTP_200_OK
+
+    latest = await WeatherData.objects.select_related("station").order_by("-timestamp").afirst()
+    payload = {
+        "message": result["message"],
+        "results": result["results"],
+        "data": reading_summary(latest),
+    }
+    return Response(payload, status=status_code)
+
+
+@async_api_view([AllowAny])
+async def live_weather_view(request):
+    """
+    Fetch live weather data from Open-Meteo for given coordinates (no DB storage).
+    Example: /api/weather/live/?lat=8.1017&lon=125.1279
+    """
+    lat = request.GET.get("lat")
+    lon = request.GET.get("lon")
+
+    if not lat or not lon:
+        return Response(
+            {"error": "Missing latitude or longitude parameters."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    try:
+        data = await fetch_json(live_url(lat, lon))
+    except UpstreamError as e:
+        return Response(
+            {"error": f"Failed to fetch live data: {str(e)}"},
+            status=status.HTTP_502_BAD_GATEWAY,
+        )
+
+    payload, status_code = live_payload(lat, lon, data)
+    return Response(payload, status=status_code)
@@ -0,0 +1,112 @@
+# backend/weather/caching.py
+"""
+HTTP caching for weather read endpoints. Their data only changes when an
+ingestion run finishes or a station is edited, so one "data version"
+timestamp kept in the cache drives ETag/Last-Modified and Cache-Control,
+and conditional GETs are answered with 304 before any DB work. Full
+responses are also cached as rendered bytes under that version, so a
+bump invalidates them all at once.
+"""
+from datetime import datetime, timezone
+from functools import wraps
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import condition
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+DATA_VERSION_KEY = "weather_data_version"
+RESPONSE_KEY = "weather_response:{version}:{digest}"
+
+
+def bump_data_version():
+    """Mark weather data as changed (end of ingestion, station CRUD)."""
+    version = time.time()
+    cache.set(DATA_VERSION_KEY, version, timeout=None)
+    return version
+
+
+def get_data_version():
+    version = cache.get(DATA_VERSION_KEY)
+    if version is None:
+        # Unknown (fresh cache): start a new version rather than query the DB
+        version = bump_data_version()
+    return version
+
+
+def _etag(request, *args, **kwargs):
+    # The date keeps "last N days" windows from being served across midnight
+    return f'"{int(get_data_version() * 1000)}-{datetime.now(timezone.utc):%Y%m%d}"'
+
+
+def _last_modified(request, *args, **kwargs):
+    return datetime.fromtimestamp(int(get_data_version()), tz=timezone.utc)
+
+
+def _max_age():
+    """Seconds until the next scheduled ingestion is expected."""
+    age = time.time() - get_data_version()
+    return max(0, int(settings.WEATHER_INGEST_INTERVAL - age))
+
+
+def conditional_weather_get(view_func):
+    """Decorate a GET handler with ingestion-driven ETag/Last-Modified/Cache-Control."""
+    conditional = condition(etag_func=_etag, last_modified_func=_last_modified)(view_func)
+
+    def wrapper(request, *args, **kwargs):
+        response = conditional(request, *args, **kwargs)
+        if response.status_code in (200, 304):
+            if settings.WEATHER_CACHE_PUBLIC:
+                patch_cache_control(response, public=True, max_age=_max_age())
+            else:
+                patch_cache_control(response, private=True, max_age=_max_age())
+        return response
+
+    return wrapper
+
+
+def _response_key(request):
+    parts = [
+        request.path,
+        request.META.get("QUERY_STRING", ""),
+        request.accepted_media_type or "",
+        f"{datetime.now(timezone.utc):%Y%m%d}",  # same reason as in _etag
+    ]
+    digest = hashlib.md5("|".join(parts).encode()).hexdigest()
+    return RESPONSE_KEY.format(version=int(get_data_version() * 1000), digest=digest)
+
+
+def cache_weather_response(method):
+    """
+    Decorate an APIView GET method: successful responses are rendered once
+    and stored as bytes, and later hits are returned as a plain HttpResponse
+    without running the view, serializers or renderer. Authentication and
+    permissions still run first, as part of DRF's dispatch. Only JSON is
+    shared: the browsable API's HTML embeds the user and a CSRF token.
+    """
+    @wraps(method)
+    def wrapper(self, request, *args, **kwargs):
+        if not isinstance(request.accepted_renderer, JSONRenderer):
+            return method(self, request, *args, **kwargs)
+
+        key = _response_key(request)
+        hit = cache.get(key)
+        if hit is not None:
+            content, content_type = hit
+            return HttpResponse(content, content_type=content_type)
+
+        response = method(self, request, *args, **kwargs)
+        if isinstance(response, Response) and response.status_code == 200:
+            response.accepted_renderer = request.accepted_renderer
+            response.accepted_media_type = request.accepted_media_type
+            response.renderer_context = self.get_renderer_context()
+            response.render()
+            cache.set(key, (response.content, response["Content-Type"]), timeout=settings.WEATHER_INGEST_INTERVAL * 2)
+        return response
+
+    return wrapper
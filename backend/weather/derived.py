@@ -0,0 +1,128 @@
+# backend/weather/derived.py
+"""
+Derived metrics, computed once per ingestion with NumPy over a station's
+hourly columns and stored on WeatherData, so history/export reads never
+recompute them row by row: dew point, heat index and apparent temperature
+per reading, plus trailing 3h/6h/24h aggregates ending at each reading.
+"""
+from datetime import timedelta
+
+import numpy as np
+
+from .models import WeatherData
+
+BASE_METRICS = ("temperature", "humidity", "precipitation_probability", "wind_speed")
+ROLLING_HOURS = (3, 6, 24)
+# Rolled over each window and stored as f"{metric}_{stat}_{hours}h"
+ROLLING = (("temperature", "avg"), ("precipitation_probability", "max"), ("wind_speed", "max"))
+DERIVED_FIELDS = ["dew_point", "heat_index", "apparent_temperature"] + [
+    f"{metric}_{stat}_{hours}h" for metric, stat in ROLLING for hours in ROLLING_HOURS
+]
+
+
+def dew_point(temperature, humidity):
+    """Magnus formula (Alduchov & Eskridge constants), °C."""
+    a, b = 17.625, 243.04
+    with np.errstate(divide="ignore", invalid="ignore"):  # 0% humidity has no dew point
+        gamma = np.log(humidity / 100.0) + a * temperature / (b + temperature)
+        return b * gamma / (a - gamma)
+
+
+def heat_index(temperature, humidity):
+    """NWS heat index: Rothfusz regression and its low/high humidity adjustments, °C."""
+    t, rh = temperature * 9 / 5 + 32, humidity
+    simple = 0.5 * (t + 61.0 + (t - 68.0) * 1.2 + rh * 0.094)
+    full = (
+        -42.379 + 2.04901523 * t + 10.14333127 * rh - 0.22475541 * t * rh
+        - 6.83783e-3 * t ** 2 - 5.481717e-2 * rh ** 2 + 1.22874e-3 * t ** 2 * rh
+        + 8.5282e-4 * t * rh ** 2 - 1.99e-6 * t ** 2 * rh ** 2
+    )
+    with np.errstate(invalid="ignore"):
+        dry = (rh < 13) & (t >= 80) & (t <= 112)
+        humid = (rh > 85) & (t >= 80) & (t <= 87)
+        full -= np.where(dry, (13 - rh) / 4 * np.sqrt(np.clip((17 - np.abs(t - 95)) / 17, 0, None)), 0)
+        full += np.where(humid, (rh - 85) / 10 * (87 - t) / 5, 0)
+        fahrenheit = np.where((simple + t) / 2 >= 80, full, simple)
+    return (fahrenheit - 32) * 5 / 9
+
+
+def apparent_temperature(temperature, humidity, wind_speed):
+    """Steadman's apparent temperature in the shade (BoM formula), °C; wind in km/h."""
+    vapour_pressure = humidity / 100 * 6.105 * np.exp(17.27 * temperature / (237.7 + temperature))
+    return temperature + 0.33 * vapour_pressure - 0.70 * (wind_speed / 3.6) - 4.00
+
+
+def trailing(times, values, hours, stat):
+    """
+    `stat` ("avg" or "max") of the non-missing `values` timed within
+    (t - hours, t], for every t in `times` (epoch seconds, ascending).
+    NaN where the window has no values.
+    """
+    idx = np.arange(times.size)
+    start = np.searchsorted(times, times - hours * 3600, side="right")
+    if stat == "avg":
+        present = ~np.isnan(values)
+        sums = np.concatenate(([0.0], np.cumsum(np.where(present, values, 0.0))))
+        counts = np.concatenate(([0], np.cumsum(present)))
+        with np.errstate(invalid="ignore"):
+            return (sums[idx + 1] - sums[start]) / (counts[idx + 1] - counts[start])
+
+    if not times.size:
+        return values.copy()
+    # One column per lag back into the window; fmax skips NaN
+    lags = idx[:, None] - np.arange(int((idx - start).max()) + 1)
+    lagged = np.where(lags >= start[:, None], values[np.maximum(lags, 0)], np.nan)
+    return np.fmax.reduce(lagged, axis=1)
+
+
+def derive_metrics(times, columns):
+    """
+    DERIVED_FIELDS for one station's readings: `times` are epoch seconds in
+    ascending order, `columns` maps each of BASE_METRICS to float arrays
+    aligned with them (NaN = missing). Returns {field: array}.
+    """
+    temperature, humidity = columns["temperature"], columns["humidity"]
+    derived = {
+        "dew_point": dew_point(temperature, humidity),
+        "heat_index": heat_index(temperature, humidity),
+        "apparent_temperature": apparent_temperature(temperature, humidity, columns["wind_speed"]),
+    }
+    for metric, stat in ROLLING:
+        for hours in ROLLING_HOURS:
+            derived[f"{metric}_{stat}_{hours}h"] = trailing(times, columns[metric], hours, stat)
+    return derived
+
+
+def as_db_values(values):
+    """Rounded floats with None for NaN, ready for the ORM."""
+    return [None if value != value else value for value in np.round(values, 2).tolist()]
+
+
+def add_derived_metrics(station, readings):
+    """
+    Fill DERIVED_FIELDS into every metrics dict of `readings` ({timestamp:
+    metrics}) before they are stored. The station's readings from the 24h
+    before the batch are loaded in one query so windows at its start are
+    complete.
+    """
+    if not readings:
+        return
+    new = sorted(readings)
+    history = list(
+        WeatherData.objects.filter(
+            station=station,
+            timestamp__gte=new[0] - timedelta(hours=max(ROLLING_HOURS)),
+            timestamp__lt=new[0],
+        )
+        .order_by("timestamp")
+        .values_list("timestamp", *BASE_METRICS)
+    )
+    rows = history + [(ts, *(readings[ts].get(metric) for metric in BASE_METRICS)) for ts in new]
+
+    times = np.array([row[0].timestamp() for row in rows])
+    values = np.array([row[1:] for row in rows], dtype=float)  # None -> NaN
+    derived = derive_metrics(times, {metric: values[:, i] for i, metric in enumerate(BASE_METRICS)})
+
+    for field, column in derived.items():
+        for ts, value in zip(new, as_db_values(column[len(history):])):
+            readings[ts][field] = value
@@ -0,0 +1,157 @@
+"""
+Local stand-in for Open-Meteo's /v1/forecast (and OpenWeather's
+/data/2.5/weather), for load-testing the weather views without hitting the
+real APIs. Point OPEN_METEO_URL at FakeOpenMeteo.url and OPEN_WEATHER_URL
+at FakeOpenMeteo.openweather_url.
+"""
+import asyncio
+import json
+import threading
+from datetime import datetime, timedelta, timezone
+from urllib.parse import parse_qs, urlsplit
+
+
+class FakeOpenMeteo:
+    """
+    Answers GET /v1/forecast with hourly (past 24h, or the forecast_days
+    ahead), current and daily blocks shaped like Open-Meteo's. `latency` (seconds) is added per request.
+
+    Runs as an asyncio server on its own thread, so hundreds of slow,
+    keep-alive requests in flight don't each need a server thread.
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0):
+        self.host, self.port = host, port
+        self.latency = latency
+        self.requests = 0
+        self._loop = asyncio.new_event_loop()
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}/v1/forecast"
+
+    @property
+    def openweather_url(self):
+        return f"http://{self.host}:{self.port}/data/2.5/weather"
+
+    def start(self):
+        ready = threading.Event()
+
+        def run():
+            asyncio.set_event_loop(self._loop)
+            self._server = self._loop.run_until_complete(
+                asyncio.start_server(self._handle, self.host, self.port, backlog=1024)
+            )
+            self.port = self._server.sockets[0].getsockname()[1]
+            ready.set()
+            self._loop.run_forever()
+
+        self._thread = threading.Thread(target=run, daemon=True)
+        self._thread.start()
+        ready.wait()
+        return self
+
+    def stop(self):
+        def shutdown():
+            self._server.close()
+            self._loop.stop()
+
+        self._loop.call_soon_threadsafe(shutdown)
+        self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    @staticmethod
+    def payload(query):
+        """
+        One location's response, or a list of them when latitude/longitude
+        are comma-separated (Open-Meteo's multi-location form).
+        """
+        latitudes = query.get("latitude", ["7.85"])[0].split(",")
+        longitudes = query.get("longitude", ["125.05"])[0].split(",")
+        locations = [FakeOpenMeteo._location(float(lat), float(lon), query) for lat, lon in zip(latitudes, longitudes)]
+        return locations if len(locations) > 1 else locations[0]
+
+    @staticmethod
+    def _location(latitude, longitude, query):
+        hour = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0, tzinfo=None)
+        if "forecast_days" in query:
+            # Forecast request: hourly from today's midnight through the last day
+            days_ahead = int(query["forecast_days"][0])
+            hours = [hour.replace(hour=0) + timedelta(hours=h) for h in range(24 * days_ahead)]
+        else:
+            days_ahead = 3
+            hours = [hour - timedelta(hours=h) for h in range(23, -1, -1)]
+        days = [hour.date() + timedelta(days=d) for d in range(days_ahead)]
+        return {
+            "latitude": latitude,
+            "longitude": longitude,
+            "timezone": "Asia/Manila",
+            "hourly": {
+                "time": [h.strftime("%Y-%m-%dT%H:%M") for h in hours],
+                "temperature_2m": [24 + (i % 8) for i in range(len(hours))],
+                "relative_humidity_2m": [80 + (i % 10) for i in range(len(hours))],
+                "precipitation_probability": [(i * 7) % 100 for i in range(len(hours))],
+                "windspeed_10m": [3.5 + (i % 5) for i in range(len(hours))],
+            },
+            "current": {
+                "time": hour.strftime("%Y-%m-%dT%H:%M"),
+                "temperature_2m": 27.5,
+                "relative_humidity_2m": 84,
+                "precipitation_probability": 40,
+                "windspeed_10m": 6.1,
+            },
+            "daily": {
+                "time": [d.isoformat() for d in days],
+                "temperature_2m_max": [(31.0, 30.2, 29.8)[i % 3] for i in range(days_ahead)],
+                "temperature_2m_min": [(22.1, 21.9, 22.4)[i % 3] for i in range(days_ahead)],
+                "precipitation_probability_mean": [(45, 70, 20)[i % 3] for i in range(days_ahead)],
+                "windspeed_10m_max": [(12.0, 15.5, 9.8)[i % 3] for i in range(days_ahead)],
+            },
+        }
+
+    @staticmethod
+    def openweather_payload(query):
+        return {
+            "coord": {"lat": float(query.get("lat", ["7.85"])[0]), "lon": float(query.get("lon", ["125.05"])[0])},
+            "weather": [{"id": 500, "main": "Rain", "description": "light rain"}],
+            "main": {"temp": 27.5, "feels_like": 30.1, "humidity": 84, "pressure": 1009},
+            "wind": {"speed": 1.7, "deg": 220},
+            "name": "Musuan",
+        }
+
+    async def _handle(self, reader, writer):
+        """Minimal HTTP/1.1 keep-alive loop; GET requests without bodies only."""
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                self.requests += 1
+                target = head.split(b" ", 2)[1].decode()
+                if self.latency:
+                    await asyncio.sleep(self.latency)
+
+                url = urlsplit(target)
+                path = url.path.rstrip("/")
+                if path == "/v1/forecast":
+                    code, reason, body = 200, "OK", self.payload(parse_qs(url.query))
+                elif path == "/data/2.5/weather":
+                    code, reason, body = 200, "OK", self.openweather_payload(parse_qs(url.query))
+                else:
+                    code, reason, body = 404, "Not Found", {"error": True, "reason": "Not Found"}
+
+                data = json.dumps(body).encode()
+                writer.write(
+                    f"HTTP/1.1 {code} {reason}\r\nContent-Type: application/json\r\n"
+                    f"Content-Length: {len(data)}\r\n\r\n".encode() + data
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
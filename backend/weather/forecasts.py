@@ -0,0 +1,113 @@
+# backend/weather/forecasts.py
+"""
+Stored forecasts: the scheduler refreshes every station's forecast with a
+few multi-location Open-Meteo requests (comma-separated latitude/longitude,
+FORECAST_BATCH_SIZE stations each) and upserts one Forecast row per
+station. The forecast endpoint reads those rows, so upstream calls depend
+on the number of stations, not on traffic.
+"""
+import requests
+from django.conf import settings
+from django.utils.timezone import now
+
+from .caching import bump_data_version
+from .models import Forecast, Station
+
+DAILY_VARIABLES = "temperature_2m_max,temperature_2m_min,precipitation_probability_mean,windspeed_10m_max"
+HOURLY_VARIABLES = "temperature_2m,relative_humidity_2m,precipitation_probability,windspeed_10m"
+
+
+def forecast_batch_url(stations):
+    latitudes = ",".join(str(station.latitude) for station in stations)
+    longitudes = ",".join(str(station.longitude) for station in stations)
+    return (
+        f"{settings.OPEN_METEO_URL}?latitude={latitudes}&longitude={longitudes}"
+        f"&daily={DAILY_VARIABLES}&hourly={HOURLY_VARIABLES}"
+        f"&timezone=auto&forecast_days={settings.FORECAST_DAYS}"
+    )
+
+
+def _rows(block, columns):
+    """Open-Meteo's column arrays as a list of row dicts: {field: block[variable][i]}."""
+    times = block.get("time", [])
+    values = [(field, block.get(variable) or [None] * len(times)) for field, variable in columns]
+    return [{field: column[i] for field, column in values} for i in range(len(times))]
+
+
+def daily_rows(data):
+    return _rows(data.get("daily", {}), [
+        ("date", "time"),
+        ("min_temp", "temperature_2m_min"),
+        ("max_temp", "temperature_2m_max"),
+        ("rain_chance", "precipitation_probability_mean"),
+        ("wind_max", "windspeed_10m_max"),
+    ])
+
+
+def hourly_rows(data):
+    return _rows(data.get("hourly", {}), [
+        ("time", "time"),
+        ("temperature", "temperature_2m"),
+        ("humidity", "relative_humidity_2m"),
+        ("rain_chance", "precipitation_probability"),
+        ("wind_speed", "windspeed_10m"),
+    ])
+
+
+def refresh_forecasts(batch_size=None):
+    """
+    Fetch and store the forecast of every station, batch_size stations per
+    upstream request. A failed batch keeps its stations' previous forecast.
+    """
+    batch_size = batch_size or settings.FORECAST_BATCH_SIZE
+    stations = list(Station.objects.only("id", "name", "latitude", "longitude").order_by("pk"))
+    forecasts, errors, issued_at = [], [], now()
+    batches = [stations[start:start + batch_size] for start in range(0, len(stations), batch_size)]
+
+    for batch in batches:
+        try:
+            response = requests.get(forecast_batch_url(batch), timeout=30)
+            response.raise_for_status()
+            data = response.json()
+        except requests.RequestException as e:
+            errors.append({"stations": [station.name for station in batch], "error": f"Fetch failed: {str(e)}"})
+            continue
+
+        # One location comes back as an object, several as a list in request order
+        for station, location in zip(batch, data if isinstance(data, list) else [data]):
+            forecasts.append(Forecast(
+                station=station, issued_at=issued_at, timezone=location.get("timezone", ""),
+                daily=daily_rows(location), hourly=hourly_rows(location),
+            ))
+
+    Forecast.objects.bulk_create(
+        forecasts,
+        update_conflicts=True,
+        unique_fields=["station"],
+        update_fields=["issued_at", "timezone", "daily", "hourly"],
+    )
+    if forecasts:
+        bump_data_version()  # new ETags for forecast responses
+    return {
+        "message": "Forecasts updated",
+        "stations": len(forecasts),
+        "requests": len(batches),
+        "errors": errors,
+    }
+
+
+def forecast_payload(forecast, days, hourly=False):
+    """Body for WeatherForecastView from a stored Forecast, cut to `days` days."""
+    daily = forecast.daily[:days]
+    payload = {
+        "message": f"{len(daily)}-day forecast",
+        "location": forecast.station.name,
+        "station": forecast.station_id,
+        "issued_at": forecast.issued_at,
+        "timezone": forecast.timezone,
+        "data": daily,
+    }
+    if hourly:
+        last_date = daily[-1]["date"] if daily else ""
+        payload["hourly"] = [row for row in forecast.hourly if row["time"][:10] <= last_date]
+    return payload
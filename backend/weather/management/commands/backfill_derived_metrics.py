@@ -0,0 +1,37 @@
+import numpy as np
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from weather.derived import BASE_METRICS, DERIVED_FIELDS, as_db_values, derive_metrics
+from weather.models import Station, WeatherData
+
+
+class Command(BaseCommand):
+    help = "Compute derived metrics (dew point, heat index, trailing windows) for stored weather readings"
+
+    def handle(self, *args, **options):
+        # Plain executemany UPDATE by id: bulk_update's CASE per field and row
+        # crawls at millions of readings
+        quote = connection.ops.quote_name
+        assignments = ", ".join(f"{quote(WeatherData._meta.get_field(f).column)} = %s" for f in DERIVED_FIELDS)
+        sql = f"UPDATE {quote(WeatherData._meta.db_table)} SET {assignments} WHERE id = %s"
+
+        total = 0
+        for station_id in Station.objects.order_by("pk").values_list("pk", flat=True):
+            rows = list(
+                WeatherData.objects.filter(station_id=station_id)
+                .order_by("timestamp")
+                .values_list("id", "timestamp", *BASE_METRICS)
+            )
+            if not rows:
+                continue
+            # The whole series at once, so every window sees its full history
+            times = np.array([row[1].timestamp() for row in rows])
+            values = np.array([row[2:] for row in rows], dtype=float)
+            derived = derive_metrics(times, {metric: values[:, i] for i, metric in enumerate(BASE_METRICS)})
+            columns = [as_db_values(derived[field]) for field in DERIVED_FIELDS]
+
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.executemany(sql, [(*values, row[0]) for row, *values in zip(rows, *columns)])
+            total += len(rows)
+        self.stdout.write(self.style.SUCCESS(f"Derived metrics stored for {total} readings"))
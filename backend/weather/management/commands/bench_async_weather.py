@@ -0,0 +1,71 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.test import AsyncRequestFactory, RequestFactory, override_settings
+
+from weather import async_views, views
+from weather.fake_open_meteo import FakeOpenMeteo
+from weather.upstream import close_async_client
+
+
+class Command(BaseCommand):
+    help = (
+        "Load-test the live weather endpoint against a local fake Open-Meteo: "
+        "sync view on a thread pool vs the async view on one event loop"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=500)
+        parser.add_argument("--concurrency", type=int, default=100, help="In-flight requests for the async view")
+        parser.add_argument("--threads", type=int, default=8, help="Worker threads for the sync view")
+        parser.add_argument("--latency", type=float, default=0.2, help="Upstream latency in seconds")
+
+    def handle(self, *args, **options):
+        n = options["requests"]
+        with FakeOpenMeteo(latency=options["latency"]) as fake, override_settings(OPEN_METEO_URL=fake.url):
+            self.stdout.write(f"upstream {fake.url} latency={options['latency']}s requests={n}")
+            self.stdout.write(f"{'view':<32} {'seconds':>8} {'req/s':>8} {'ok':>6}")
+
+            sync_s, sync_ok, sync_body = self._sync(n, options["threads"])
+            self._row(f"sync ({options['threads']} threads)", sync_s, n, sync_ok)
+
+            async_s, async_ok, async_body = asyncio.run(self._async(n, options["concurrency"]))
+            self._row(f"async (concurrency {options['concurrency']})", async_s, n, async_ok)
+
+            self.stdout.write(f"speedup {sync_s / async_s:.1f}x, identical bodies: {sync_body == async_body}, "
+                              f"upstream requests: {fake.requests}")
+
+    def _row(self, name, seconds, n, ok):
+        self.stdout.write(f"{name:<32} {seconds:>8.2f} {n / seconds:>8.1f} {ok:>6}")
+
+    def _sync(self, n, threads):
+        factory = RequestFactory()
+
+        def call(i):
+            response = views.live_weather_view(factory.get("/api/weather/live/", {"lat": 7.85, "lon": 125.05}))
+            response.render()
+            return response
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            responses = list(pool.map(call, range(n)))
+        elapsed = time.perf_counter() - start
+        return elapsed, sum(r.status_code == 200 for r in responses), responses[-1].content
+
+    async def _async(self, n, concurrency):
+        factory = AsyncRequestFactory()
+        slots = asyncio.Semaphore(concurrency)
+
+        async def call():
+            async with slots:
+                return await async_views.live_weather_view(
+                    factory.get("/api/weather/live/", {"lat": 7.85, "lon": 125.05})
+                )
+
+        start = time.perf_counter()
+        responses = await asyncio.gather(*(call() for _ in range(n)))
+        elapsed = time.perf_counter() - start
+        await close_async_client()
+        return elapsed, sum(r.status_code == 200 for r in responses), responses[-1].content
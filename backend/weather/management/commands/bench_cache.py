@@ -0,0 +1,93 @@
+import multiprocessing
+import os
+import random
+import shutil
+import statistics
+import tempfile
+import time
+
+from django.core.cache import caches
+from django.core.management.base import BaseCommand
+from django.utils.module_loading import import_string
+
+PAYLOAD = {"main": {"temp": 27.5, "humidity": 84}, "wind": {"speed": 6.1}, "name": "CMU Campus" * 4}
+
+
+def build(backend, location):
+    return import_string(backend)(location, {"OPTIONS": {"MAX_ENTRIES": 100000}})
+
+
+def latencies(cache, op, keys):
+    samples = []
+    for key in keys:
+        start = time.perf_counter()
+        if op == "set":
+            cache.set(key, PAYLOAD, timeout=600)
+        else:
+            cache.get(key)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def worker(backend, location, ops, queue):
+    cache = build(backend, location)
+    keys = [f"station_weather_{i}" for i in range(200)]
+    start = time.perf_counter()
+    for i in range(ops):
+        key = random.choice(keys)
+        if i % 10 == 0:
+            cache.set(key, PAYLOAD, timeout=600)
+        else:
+            cache.get(key)
+    queue.put(ops / (time.perf_counter() - start))
+
+
+class Command(BaseCommand):
+    help = "Benchmark cache get/set latency per backend, and mixed throughput from several processes"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--ops", type=int, default=5000)
+        parser.add_argument("--processes", type=int, default=4)
+
+    def handle(self, *args, **options):
+        tmp = tempfile.mkdtemp()
+        try:
+            self._run(options, tmp)
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+
+    def _run(self, options, tmp):
+        ops = options["ops"]
+        backends = [
+            ("locmem (per process)", "django.core.cache.backends.locmem.LocMemCache", "bench"),
+            ("filebased", "django.core.cache.backends.filebased.FileBasedCache", os.path.join(tmp, "files")),
+            ("sqlite (core.cache)", "core.cache.SQLiteCache", os.path.join(tmp, "cache.sqlite3")),
+        ]
+
+        self.stdout.write(f"{'backend':<24} {'set p50 µs':>10} {'set p99':>9} {'get p50 µs':>10} {'get p99':>9}")
+        keys = [f"station_weather_{i}" for i in range(ops)]
+        rows = [(name, build(backend, location)) for name, backend, location in backends]
+        rows.append((f"default ({caches['default'].__class__.__name__})", caches["default"]))
+        for name, cache in rows:
+            sets = latencies(cache, "set", keys)
+            gets = latencies(cache, "get", keys)
+            self.stdout.write(f"{name:<24} {self._pct(sets, 50):>10.1f} {self._pct(sets, 99):>9.1f} "
+                              f"{self._pct(gets, 50):>10.1f} {self._pct(gets, 99):>9.1f}")
+            cache.delete_many(keys)
+
+        # Shared backends under concurrent access (90% gets / 10% sets)
+        ctx = multiprocessing.get_context("fork")
+        for name, backend, location in backends[1:]:
+            queue = ctx.Queue()
+            procs = [ctx.Process(target=worker, args=(backend, location, ops, queue))
+                     for _ in range(options["processes"])]
+            for proc in procs:
+                proc.start()
+            total = sum(queue.get() for _ in procs)
+            for proc in procs:
+                proc.join()
+            self.stdout.write(f"{name:<24} {options['processes']} processes: {total:,.0f} ops/s combined")
+
+    @staticmethod
+    def _pct(samples, pct):
+        return statistics.quantiles(samples, n=100)[pct - 1] * 1e6
@@ -0,0 +1,113 @@
+import random
+import threading
+import time
+from collections import Counter
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connection, connections
+
+from notifications.models import Notification
+from reports.models import Report
+from weather.alerts import load_active_rules
+from weather.fake_open_meteo import FakeOpenMeteo
+from weather.models import Station
+from weather.serializers import fast_station_rows
+from weather.views import store_station_weather
+
+User = get_user_model()
+PREFIX = "Bench DB Station"
+
+
+class Command(BaseCommand):
+    help = (
+        "Run API reads, hourly-ingestion upserts and report submissions concurrently against "
+        "the configured database and count 'database is locked' errors. Cleans up its rows."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--seconds", type=float, default=10)
+        parser.add_argument("--readers", type=int, default=4)
+        parser.add_argument("--reporters", type=int, default=2)
+        parser.add_argument("--stations", type=int, default=10)
+
+    def handle(self, *args, **options):
+        db = connection.settings_dict
+        self.stdout.write(f"engine={db['ENGINE']} name={db['NAME']} options={db.get('OPTIONS', {})}")
+
+        user, _ = User.objects.get_or_create(email="bench-db@example.com")
+        stations = Station.objects.bulk_create(
+            Station(name=f"{PREFIX} {i}", latitude=7.8 + i * 1e-3, longitude=125.0)
+            for i in range(options["stations"])
+        )
+        connection.close()
+
+        self.rules = load_active_rules()
+        self.ops, self.errors, self.lock = Counter(), Counter(), threading.Lock()
+        self.deadline = time.monotonic() + options["seconds"]
+        threads = [threading.Thread(target=self._worker, args=("ingest", self._ingest, stations))]
+        threads += [threading.Thread(target=self._worker, args=("read", self._read, None))
+                    for _ in range(options["readers"])]
+        threads += [threading.Thread(target=self._worker, args=("report", self._report, user))
+                    for _ in range(options["reporters"])]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        try:
+            self.stdout.write(f"{'workload':<10} {'ops':>8} {'ops/s':>9} {'errors':>7}")
+            for name in ("read", "ingest", "report"):
+                self.stdout.write(
+                    f"{name:<10} {self.ops[name]:>8} {self.ops[name] / options['seconds']:>9.1f} "
+                    f"{self.errors[name]:>7}"
+                )
+            locked = sum(self.errors.values())
+            style = self.style.SUCCESS if not locked else self.style.ERROR
+            self.stdout.write(style(f"database is locked errors: {locked}"))
+        finally:
+            Report.objects.filter(user=user).delete()
+            Notification.objects.filter(user=user).delete()
+            Station.objects.filter(name__startswith=PREFIX).delete()
+            user.delete()
+
+    def _worker(self, name, step, arg):
+        try:
+            while time.monotonic() < self.deadline:
+                try:
+                    step(arg)
+                except OperationalError as e:
+                    if "locked" not in str(e):
+                        raise
+                    with self.lock:
+                        self.errors[name] += 1
+                else:
+                    with self.lock:
+                        self.ops[name] += 1
+        finally:
+            connections.close_all()
+
+    def _ingest(self, stations):
+        # One station's Open-Meteo payload through the production ingest path
+        # (derived metrics, bulk upsert, alert rules). Fresh values each time,
+        # so the upsert really rewrites rows instead of skipping unchanged ones.
+        station = random.choice(stations)
+        data = FakeOpenMeteo.payload({})
+        hourly, size = data["hourly"], len(data["hourly"]["time"])
+        hourly["temperature_2m"] = [round(random.uniform(22, 32), 1) for _ in range(size)]
+        hourly["relative_humidity_2m"] = [random.randint(60, 95) for _ in range(size)]
+        hourly["precipitation_probability"] = [random.randint(0, 100) for _ in range(size)]
+        hourly["windspeed_10m"] = [round(random.uniform(0, 20), 1) for _ in range(size)]
+        store_station_weather(station, data, self.rules)
+
+    def _read(self, _):
+        fast_station_rows(Station.objects.order_by("name"))
+        list(Report.objects.order_by("-date_created").values("id", "status")[:50])
+
+    def _report(self, user):
+        # ReportCreateView: the report plus an admin notification
+        report = Report.objects.create(
+            user=user, name="Bench Resident", contact="09171234567",
+            description="Flooding near the barangay hall.", latitude=7.85, longitude=125.05,
+        )
+        Notification.objects.create(user=user, title="🚨 New User Report", message=f"Report {report.pk}")
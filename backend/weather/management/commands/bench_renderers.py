@@ -0,0 +1,118 @@
+import json
+import random
+import time
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+
+import numpy as np
+from django.core.management.base import BaseCommand
+from rest_framework.renderers import JSONRenderer
+
+from core.renderers import ORJSONRenderer
+from notifications.serializers import NotificationSerializer
+from notifications.models import Notification
+from reports.models import Report
+from reports.serializers import ReportSerializer
+from weather.models import WeatherData
+from weather.serializers import WeatherDataSerializer
+
+
+def weather_records(n):
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    records = [
+        WeatherData(
+            id=i + 1, station_id=1 + i % 10, timestamp=start + timedelta(hours=i),
+            temperature=round(random.uniform(22, 32), 1), humidity=random.uniform(60, 95),
+            precipitation_probability=random.randint(0, 100), wind_speed=random.uniform(0, 20),
+            location_name=f"Station {i % 10}", latitude=7.85, longitude=125.05, created_at=start,
+        )
+        for i in range(n)
+    ]
+    return WeatherDataSerializer(records, many=True).data
+
+
+def history_rows(n):
+    # Shape of WeatherHistoryView's .values().annotate() rows (raw dates/floats)
+    today = date(2025, 1, 1)
+    return [
+        {
+            "timestamp__date": today + timedelta(days=i),
+            "avg_temp": random.uniform(22, 32), "min_temp": 22.0, "max_temp": 32.5,
+            "avg_humidity": random.uniform(60, 95), "min_humidity": 60.0, "max_humidity": 95.0,
+            "avg_wind": random.uniform(0, 10), "min_wind": 0.0, "max_wind": 12.5,
+        }
+        for i in range(n)
+    ]
+
+
+def reports(n):
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    items = [
+        Report(
+            id=i + 1, name=f"Resident {i}", contact="09171234567",
+            description="Flooding near the barangay hall, water is knee deep. " * 3,
+            latitude=7.85 + i * 1e-5, longitude=125.05, status="Pending", date_created=start,
+        )
+        for i in range(n)
+    ]
+    for item in items:
+        item._state.fields_cache["user"] = None  # user_email renders as null without a query
+    return ReportSerializer(items, many=True).data
+
+
+def notifications(n):
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    items = [
+        Notification(id=i + 1, title="📢 Report Status Updated", message="Your report was resolved.",
+                     is_read=bool(i % 2), created_at=start)
+        for i in range(n)
+    ]
+    return NotificationSerializer(items, many=True).data
+
+
+def raw_values(n):
+    # Native types the renderer must handle without a serializer pass
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    return [
+        {"time": start + timedelta(hours=i), "day": date(2025, 1, 1), "rain": Decimal("12.50"),
+         "temp": np.float64(27.5), "count": np.int64(i), "values": np.arange(3, dtype=np.float32)}
+        for i in range(n)
+    ]
+
+
+PAYLOADS = {
+    "weather records": weather_records,
+    "history rows": history_rows,
+    "reports": reports,
+    "notifications": notifications,
+    "raw datetimes/decimals/numpy": raw_values,
+}
+
+
+class Command(BaseCommand):
+    help = "Compare DRF JSONRenderer and ORJSONRenderer render time per 10k records"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--records", type=int, default=10000)
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def _time(self, renderer, data, repeat):
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            content = renderer.render(data, "application/json", {})
+            best = min(best, time.perf_counter() - start)
+        return best, content
+
+    def handle(self, *args, **options):
+        random.seed(42)
+        n, repeat = options["records"], options["repeat"]
+        self.stdout.write(f"{'payload':<30} {'json ms':>9} {'orjson ms':>10} {'speedup':>8}  same")
+        for name, build in PAYLOADS.items():
+            data = build(n)
+            stdlib_s, stdlib_bytes = self._time(JSONRenderer(), data, repeat)
+            fast_s, fast_bytes = self._time(ORJSONRenderer(), data, repeat)
+            same = json.loads(stdlib_bytes) == json.loads(fast_bytes)
+            self.stdout.write(
+                f"{name:<30} {stdlib_s * 1000:>9.2f} {fast_s * 1000:>10.2f} {stdlib_s / fast_s:>7.1f}x  {same}"
+            )
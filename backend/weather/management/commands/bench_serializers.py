@@ -0,0 +1,108 @@
+import random
+import time
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils.timezone import now
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from notifications.models import Notification
+from notifications.serializers import NotificationSerializer, fast_notification_rows
+from reports.models import Report
+from reports.serializers import ReportListSerializer, fast_report_rows, report_list_queryset
+from weather.models import Station, WeatherData
+from weather.serializers import StationSerializer, fast_station_rows
+
+User = get_user_model()
+
+
+class Rollback(Exception):
+    pass
+
+
+def seed(n):
+    """Stations with a day of readings, reports and notifications; rolled back afterwards."""
+    user, _ = User.objects.get_or_create(email="bench-serializers@example.com")
+    stations = Station.objects.bulk_create(
+        Station(name=f"Bench Station {i}", latitude=7.8 + i * 1e-3, longitude=125.0, elevation=400.0)
+        for i in range(max(n // 10, 1))
+    )
+    start = now().replace(minute=0, second=0, microsecond=0)
+    WeatherData.objects.bulk_create(
+        WeatherData(
+            station=station, timestamp=start - timedelta(hours=h), location_name=station.name,
+            latitude=station.latitude, longitude=station.longitude,
+            temperature=random.uniform(22, 32), humidity=random.uniform(60, 95),
+            precipitation_probability=random.randint(0, 100), wind_speed=random.uniform(0, 20),
+        )
+        for station in stations for h in range(24)
+    )
+    Report.objects.bulk_create(
+        Report(user=user, name=f"Resident {i}", contact="09171234567",
+               description="Flooding near the barangay hall.", latitude=7.85, longitude=125.05,
+               image=f"reports/photo_{i}.jpg" if i % 2 else None)
+        for i in range(n)
+    )
+    Notification.objects.bulk_create(
+        Notification(user=user, title="📢 Report Status Updated", message="Your report was resolved.",
+                     is_read=bool(i % 2))
+        for i in range(n)
+    )
+
+
+class Command(BaseCommand):
+    help = "Compare ModelSerializer and fast-path list serialization per object (checks byte-identical JSON)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--seed", type=int, default=0,
+                            help="Insert this many reports/notifications (and n/10 stations) first; rolled back")
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def _time(self, build, repeat):
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            content = JSONRenderer().render(build())
+            best = min(best, time.perf_counter() - start)
+        return best, content
+
+    def handle(self, *args, **options):
+        random.seed(42)
+        try:
+            with transaction.atomic():
+                if options["seed"]:
+                    seed(options["seed"])
+                self._run(options["repeat"])
+                raise Rollback
+        except Rollback:
+            pass
+
+    def _run(self, repeat):
+        request = Request(APIRequestFactory().get("/api/"))
+        context = {"request": request}
+        cases = [
+            ("stations", Station.objects.order_by("name"), StationSerializer, fast_station_rows),
+            ("reports", report_list_queryset(Report.objects.order_by("-date_created")), ReportListSerializer,
+             fast_report_rows),
+            ("notifications", Notification.objects.order_by("-created_at"), NotificationSerializer,
+             fast_notification_rows),
+        ]
+
+        self.stdout.write(f"{'list':<15} {'rows':>7} {'serializer µs/obj':>18} {'fast µs/obj':>12} {'speedup':>8}  identical")
+        for name, queryset, serializer_class, fast in cases:
+            count = queryset.count()
+            if not count:
+                self.stdout.write(f"{name:<15} {0:>7}  (no rows; use --seed)")
+                continue
+            slow_s, slow_bytes = self._time(
+                lambda: serializer_class(queryset.all(), many=True, context=context).data, repeat
+            )
+            fast_s, fast_bytes = self._time(lambda: fast(queryset.all(), context), repeat)
+            self.stdout.write(
+                f"{name:<15} {count:>7} {slow_s / count * 1e6:>18.1f} {fast_s / count * 1e6:>12.1f} "
+                f"{slow_s / fast_s:>7.1f}x  {slow_bytes == fast_bytes}"
+            )
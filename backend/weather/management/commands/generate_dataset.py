@@ -0,0 +1,280 @@
+import time
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils.timezone import now
+
+from notifications.models import Notification
+from reports.models import Report
+from weather.derived import BASE_METRICS, DERIVED_FIELDS, as_db_values, derive_metrics
+from weather.models import Station, WeatherData
+
+User = get_user_model()
+
+STATION_PREFIX = "Synthetic Station"
+EMAIL_DOMAIN = "synthetic.rainsafe.test"
+UTC_OFFSET = 8  # Bukidnon local time, for the diurnal cycle
+
+# (municipal, barangays) in Bukidnon
+AREAS = [
+    ("Maramag", ["Musuan", "Dologon", "Base Camp", "North Poblacion", "Panalsalan"]),
+    ("Valencia City", ["Poblacion", "Lumbo", "Bagontaas", "Batangan", "Mailag"]),
+    ("Malaybalay City", ["Casisang", "Sumpong", "Aglayan", "Kalasungay", "San Jose"]),
+    ("Quezon", ["Poblacion", "Kiburiao", "Salawagan", "Butong"]),
+    ("Don Carlos", ["Poblacion Norte", "Kalubihon", "Maraymaray", "Sinangguyan"]),
+]
+FIRST_NAMES = ["Juan", "Maria", "Jose", "Ana", "Mark", "Grace", "John", "Joy", "Carlo", "Liza", "Ramon", "Rose"]
+LAST_NAMES = ["Dela Cruz", "Santos", "Reyes", "Garcia", "Bautista", "Mendoza", "Torres", "Flores", "Villanueva"]
+REPORT_TEXTS = [
+    "Flooding near the barangay hall, water is knee deep.",
+    "Landslide blocking the road to the upper purok.",
+    "Creek overflowing after heavy rain, houses at risk.",
+    "Fallen tree across the highway after strong winds.",
+    "Drainage clogged, street flooding during downpour.",
+]
+REPORT_STATUSES = (["Pending", "In Progress", "Resolved"], [0.5, 0.2, 0.3])
+NOTIFICATION_TEXTS = [
+    ("🌧️ Heavy rain expected", "Rain chance is above 80% in your area this afternoon."),
+    ("📢 Report Status Updated", "Your report is now In Progress."),
+    ("✅ Report Resolved", "Your report has been marked as resolved."),
+]
+
+
+def station_series(rng, hours, elevation):
+    """
+    One station's hourly series: diurnal temperature cycle with day-to-day
+    anomalies, a persistent "wetness" process driving afternoon rain chance,
+    humidity tracking temperature and rain, and gamma-distributed wind.
+    """
+    n = len(hours)
+    local_hour = (hours + UTC_OFFSET) % 24
+    day = np.arange(n) // 24
+    days = day[-1] + 1 if n else 0
+
+    # Day-level temperature anomaly, AR(1) over days
+    anomaly = np.empty(days)
+    shocks = rng.normal(0, 1.0, days)
+    level = 0.0
+    for i in range(days):
+        level = 0.7 * level + shocks[i]
+        anomaly[i] = level
+
+    # Hourly wetness, AR(1) with slow persistence; convection peaks mid-afternoon
+    wet_shocks = rng.normal(0, 0.35, n)
+    wetness = np.empty(n)
+    level = rng.normal(-1.0, 0.5)
+    for i in range(n):
+        level = 0.97 * level + wet_shocks[i] - 0.03  # drifts dry between spells
+        wetness[i] = level
+    convection = 1.5 * np.exp(-((local_hour - 15) ** 2) / 8)
+    rain = 100 / (1 + np.exp(-(1.2 * wetness + convection)))
+
+    base = 32.5 - 0.0065 * elevation  # afternoon high, lapse rate from sea level
+    amplitude = rng.uniform(3.5, 5.0)
+    temperature = (
+        base - amplitude
+        + amplitude * np.cos(2 * np.pi * (local_hour - 14) / 24)
+        + anomaly[day]
+        - 4.0 * rain / 100
+        + rng.normal(0, 0.3, n)
+    )
+    humidity = np.clip(97 - 3.0 * (temperature - (base - 2 * amplitude)) + 15 * rain / 100
+                       + rng.normal(0, 2.0, n), 45, 100)
+    wind = rng.gamma(2.0, 3.0, n) + 4.0 * (np.abs(local_hour - 14) < 4)
+
+    return (
+        np.round(temperature, 1).tolist(),
+        np.round(humidity, 0).tolist(),
+        np.round(rain, 0).tolist(),
+        np.round(wind, 1).tolist(),
+    )
+
+
+def insert_rows(model, fields, rows, chunk_size):
+    """
+    Plain executemany INSERTs in chunk_size transactions. Values must already
+    be in DB form (datetimes via adapt_datetimefield_value). Skips the
+    per-field Python work bulk_create does, which caps it around 10k rows/s.
+    """
+    table = connection.ops.quote_name(model._meta.db_table)
+    columns = ", ".join(connection.ops.quote_name(model._meta.get_field(f).column) for f in fields)
+    sql = f"INSERT INTO {table} ({columns}) VALUES ({', '.join(['%s'] * len(fields))})"
+    total, chunk = 0, []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            total += _flush(sql, chunk)
+    if chunk:
+        total += _flush(sql, chunk)
+    return total
+
+
+def _flush(sql, chunk):
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.executemany(sql, chunk)
+    count = len(chunk)
+    chunk.clear()
+    return count
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate a seeded synthetic dataset: N stations x M days of hourly weather, "
+        "plus users, reports and notifications"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--stations", type=int, default=10)
+        parser.add_argument("--days", type=int, default=30)
+        parser.add_argument("--users", type=int, default=1000)
+        parser.add_argument("--reports", type=int, default=5000)
+        parser.add_argument("--notifications", type=int, default=20000)
+        parser.add_argument("--chunk-size", type=int, default=20000, help="Rows per INSERT transaction")
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--clear", action="store_true", help="Delete previously generated data first")
+
+    def handle(self, *args, **options):
+        rng = np.random.default_rng(options["seed"])
+        chunk = options["chunk_size"]
+
+        if options["clear"]:
+            self._clear()
+        elif Station.objects.filter(name__startswith=STATION_PREFIX).exists() or \
+                User.objects.filter(email__endswith=f"@{EMAIL_DOMAIN}").exists():
+            raise CommandError("Synthetic data already exists; rerun with --clear to replace it.")
+
+        started = time.perf_counter()
+        stations = self._stations(rng, options["stations"], chunk)
+        weather = self._weather(rng, stations, options["days"], chunk)
+        self.stdout.write(f"weather rows: {weather:,} in {time.perf_counter() - started:.1f}s")
+
+        users = self._users(rng, options["users"], chunk)
+        reports = self._reports(rng, users, stations, options["reports"], options["days"], chunk)
+        notifications = self._notifications(rng, users, options["notifications"], options["days"], chunk)
+        self.stdout.write(self.style.SUCCESS(
+            f"Generated {len(stations)} stations, {weather:,} weather rows, {len(users):,} users, "
+            f"{reports:,} reports, {notifications:,} notifications in {time.perf_counter() - started:.1f}s"
+        ))
+
+    def _clear(self):
+        WeatherData.objects.filter(station__name__startswith=STATION_PREFIX).delete()
+        Station.objects.filter(name__startswith=STATION_PREFIX).delete()
+        User.objects.filter(email__endswith=f"@{EMAIL_DOMAIN}").delete()  # cascades reports/notifications
+
+    def _stations(self, rng, count, chunk):
+        return Station.objects.bulk_create(
+            [
+                Station(
+                    name=f"{STATION_PREFIX} {i + 1}",
+                    latitude=round(float(rng.uniform(7.5, 8.6)), 4),
+                    longitude=round(float(rng.uniform(124.6, 125.5)), 4),
+                    elevation=round(float(rng.uniform(300, 1400))),
+                    description="Generated by generate_dataset",
+                )
+                for i in range(count)
+            ],
+            batch_size=chunk,
+        )
+
+    def _weather(self, rng, stations, days, chunk):
+        end = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+        start = end - timedelta(days=days)
+        hours = np.arange(days * 24)
+        start_hour = start.hour
+        adapt = connection.ops.adapt_datetimefield_value
+        timestamps = [adapt(start + timedelta(hours=int(h))) for h in hours]
+        times = start.timestamp() + hours * 3600.0
+        created_at = adapt(now())
+
+        def rows():
+            for station in stations:
+                series = station_series(rng, hours + start_hour, station.elevation)
+                derived = derive_metrics(times, {m: np.array(c, dtype=float) for m, c in zip(BASE_METRICS, series)})
+                extra = zip(*(as_db_values(derived[field]) for field in DERIVED_FIELDS))
+                name, lat, lon = station.name, station.latitude, station.longitude
+                for ts, t, h, r, w, d in zip(timestamps, *series, extra):
+                    yield (station.pk, ts, t, h, r, w, *d, name, lat, lon, created_at)
+
+        return insert_rows(
+            WeatherData,
+            ["station", "timestamp", "temperature", "humidity", "precipitation_probability",
+             "wind_speed", *DERIVED_FIELDS, "location_name", "latitude", "longitude", "created_at"],
+            rows(),
+            chunk,
+        )
+
+    def _users(self, rng, count, chunk):
+        password = make_password("synthetic-pass")  # hashed once; login works for every user
+        users = []
+        for i in range(count):
+            municipal, barangays = AREAS[rng.integers(len(AREAS))]
+            users.append(User(
+                email=f"resident{i + 1}@{EMAIL_DOMAIN}",
+                password=password,
+                first_name=FIRST_NAMES[rng.integers(len(FIRST_NAMES))],
+                last_name=LAST_NAMES[rng.integers(len(LAST_NAMES))],
+                role="admin" if i < max(1, count // 500) else "user",
+                age=int(rng.integers(18, 80)),
+                contact_number=f"09{int(rng.integers(10**8, 10**9))}",
+                purok=f"Purok {int(rng.integers(1, 12))}",
+                barangay=barangays[rng.integers(len(barangays))],
+                municipal=municipal,
+                province="Bukidnon",
+                sex=("male", "female")[rng.integers(2)],
+            ))
+        return User.objects.bulk_create(users, batch_size=chunk)
+
+    def _spread(self, rng, count, days):
+        """count DB-ready datetimes spread over the last `days` days."""
+        end = now()
+        offsets = rng.uniform(0, days * 86400, count).tolist()
+        adapt = connection.ops.adapt_datetimefield_value
+        return [adapt(end - timedelta(seconds=s)) for s in offsets]
+
+    def _reports(self, rng, users, stations, count, days, chunk):
+        if not users or not stations:
+            return 0
+        owners = rng.integers(len(users), size=count).tolist()
+        near = rng.integers(len(stations), size=count).tolist()
+        jitter = rng.normal(0, 0.02, (count, 2)).tolist()
+        statuses = rng.choice(REPORT_STATUSES[0], size=count, p=REPORT_STATUSES[1]).tolist()
+        texts = rng.integers(len(REPORT_TEXTS), size=count).tolist()
+        created = self._spread(rng, count, days)
+
+        def rows():
+            for i in range(count):
+                user, station = users[owners[i]], stations[near[i]]
+                yield (
+                    user.pk, f"{user.first_name} {user.last_name}", user.contact_number,
+                    REPORT_TEXTS[texts[i]],
+                    round(station.latitude + jitter[i][0], 5), round(station.longitude + jitter[i][1], 5),
+                    "", statuses[i], created[i],
+                )
+
+        return insert_rows(
+            Report,
+            ["user", "name", "contact", "description", "latitude", "longitude", "image", "status", "date_created"],
+            rows(),
+            chunk,
+        )
+
+    def _notifications(self, rng, users, count, days, chunk):
+        if not users:
+            return 0
+        owners = rng.integers(len(users), size=count).tolist()
+        texts = rng.integers(len(NOTIFICATION_TEXTS), size=count).tolist()
+        read = (rng.random(count) < 0.6).tolist()
+        created = self._spread(rng, count, days)
+
+        def rows():
+            for i in range(count):
+                title, message = NOTIFICATION_TEXTS[texts[i]]
+                yield (users[owners[i]].pk, title, message, read[i], created[i])
+
+        return insert_rows(
+            Notification, ["user", "title", "message", "is_read", "created_at"], rows(), chunk,
+        )
@@ -0,0 +1,390 @@
+import hashlib
+import hmac
+import io
+import json
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+
+import numpy as np
+import requests
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from PIL import Image
+
+from messenger.fake_graph import FakeGraphAPI
+from weather.fake_open_meteo import FakeOpenMeteo
+
+from .generate_dataset import EMAIL_DOMAIN
+
+PASSWORD = "synthetic-pass"  # every generate_dataset user
+APP_SECRET = "loadtest-secret"
+
+# Scenario weights; override with --mix stations=40,webhook=0,...
+DEFAULT_MIX = {
+    "stations": 30,       # station list polling
+    "station_detail": 5,
+    "history": 15,
+    "forecast": 5,
+    "live": 5,
+    "notifications": 20,  # notification polling
+    "report_create": 5,   # multipart with an image
+    "reports_admin": 3,
+    "webhook": 10,        # Messenger bursts
+    "ingest": 0,          # admin manual fetch (all stations); heavy
+}
+BOT_TEXTS = ["weather", "rain Maramag", "forecast", "temp Valencia", "hi", "subscribe Musuan"]
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def percentiles(samples):
+    values = np.array(samples) * 1000
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return {"mean_ms": float(values.mean()), "p50_ms": float(p50), "p95_ms": float(p95), "p99_ms": float(p99)}
+
+
+def tiny_jpeg():
+    buffer = io.BytesIO()
+    Image.new("RGB", (320, 240), (90, 120, 160)).save(buffer, "JPEG", quality=70)
+    return buffer.getvalue()
+
+
+class Scenarios:
+    """One request per scenario, returning (endpoint label, response)."""
+
+    def __init__(self, base, tokens, admin_token, station_ids):
+        self.base = base
+        self.tokens = tokens
+        self.admin_token = admin_token
+        self.station_ids = station_ids
+        self.image = tiny_jpeg()
+        self.mids = iter(range(10**9))
+        self.mid_lock = threading.Lock()
+
+    def _auth(self, token):
+        return {"Authorization": f"Bearer {token}"}
+
+    def stations(self, s, rng):
+        return "GET /api/weather/stations/", s.get(
+            f"{self.base}/api/weather/stations/", headers=self._auth(rng.choice(self.tokens)))
+
+    def station_detail(self, s, rng):
+        return "GET /api/weather/stations/<pk>/", s.get(
+            f"{self.base}/api/weather/stations/{rng.choice(self.station_ids)}/", headers=self._auth(rng.choice(self.tokens)))
+
+    def history(self, s, rng):
+        return "GET /api/weather/history/", s.get(
+            f"{self.base}/api/weather/history/", headers=self._auth(rng.choice(self.tokens)))
+
+    def forecast(self, s, rng):
+        return "GET /api/weather/forecast/", s.get(
+            f"{self.base}/api/weather/forecast/", params={"station": rng.choice(self.station_ids)},
+            headers=self._auth(rng.choice(self.tokens)))
+
+    def live(self, s, rng):
+        return "GET /api/weather/live/", s.get(
+            f"{self.base}/api/weather/live/",
+            params={"lat": round(rng.uniform(7.5, 8.6), 3), "lon": round(rng.uniform(124.6, 125.5), 3)})
+
+    def notifications(self, s, rng):
+        return "GET /api/notifications/", s.get(
+            f"{self.base}/api/notifications/", headers=self._auth(rng.choice(self.tokens)))
+
+    def report_create(self, s, rng):
+        return "POST /api/reports/create/", s.post(
+            f"{self.base}/api/reports/create/",
+            headers=self._auth(rng.choice(self.tokens)),
+            data={
+                "name": "Load Test", "contact": "09171234567",
+                "description": "Flooding near the barangay hall, water is knee deep.",
+                "latitude": round(rng.uniform(7.5, 8.6), 5), "longitude": round(rng.uniform(124.6, 125.5), 5),
+            },
+            files={"image": ("flood.jpg", self.image, "image/jpeg")},
+        )
+
+    def reports_admin(self, s, rng):
+        return "GET /api/reports/all/", s.get(f"{self.base}/api/reports/all/", headers=self._auth(self.admin_token))
+
+    def webhook(self, s, rng):
+        with self.mid_lock:
+            start = next(self.mids) * 20
+        body = json.dumps({
+            "object": "page",
+            "entry": [{
+                "id": "page", "time": int(time.time() * 1000),
+                "messaging": [
+                    {
+                        "sender": {"id": str(10**15 + rng.randrange(5000))},
+                        "recipient": {"id": "page"},
+                        "timestamp": int(time.time() * 1000),
+                        "message": {"mid": f"m_load_{start + i}", "text": rng.choice(BOT_TEXTS)},
+                    }
+                    for i in range(rng.randint(1, 20))
+                ],
+            }],
+        }).encode()
+        signature = "sha256=" + hmac.new(APP_SECRET.encode(), body, hashlib.sha256).hexdigest()
+        return "POST /api/messenger/webhook/", s.post(
+            f"{self.base}/api/messenger/webhook/", data=body,
+            headers={"Content-Type": "application/json", "X-Hub-Signature-256": signature})
+
+    def ingest(self, s, rng):
+        return "GET /api/weather/fetch/", s.get(f"{self.base}/api/weather/fetch/", headers=self._auth(self.admin_token))
+
+
+class Command(BaseCommand):
+    help = (
+        "End-to-end load test: boots the app on a seeded database with fake Open-Meteo/OpenWeather/"
+        "Graph API upstreams, drives a weighted request mix and reports throughput and p50/p95/p99 "
+        "per endpoint (optionally as JSON, and compared against a previous run)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--duration", type=float, default=30, help="Measured seconds")
+        parser.add_argument("--warmup", type=float, default=3, help="Unmeasured seconds before that")
+        parser.add_argument("--concurrency", type=int, default=16, help="Virtual users (closed loop)")
+        parser.add_argument("--mix", default="", help="Scenario weights, e.g. stations=40,webhook=0")
+        parser.add_argument("--seed", type=int, default=42)
+        # Dataset (generate_dataset scale)
+        parser.add_argument("--stations", type=int, default=20)
+        parser.add_argument("--days", type=int, default=30)
+        parser.add_argument("--users", type=int, default=2000)
+        parser.add_argument("--reports", type=int, default=5000)
+        parser.add_argument("--notifications", type=int, default=20000)
+        parser.add_argument("--database-url", default="",
+                            help="Use this already-seeded database instead of a fresh temporary SQLite one")
+        # Server
+        parser.add_argument("--server-cmd", default="{python} {manage} runserver --noreload {host}:{port}",
+                            help="Command template; placeholders {python} {manage} {host} {port}")
+        parser.add_argument("--server-env", action="append", default=[],
+                            help="KEY=VALUE for the server process (repeatable), e.g. FAST_JSON=true")
+        parser.add_argument("--url", default="", help="Target an already running server instead of booting one")
+        parser.add_argument("--upstream-latency", type=float, default=0.05)
+        # Output
+        parser.add_argument("--output", default="", help="Write results as JSON to this file")
+        parser.add_argument("--compare", default="", help="Previous --output file to compare against")
+        parser.add_argument("--threshold", type=float, default=10.0, help="Regression threshold in percent")
+        parser.add_argument("--fail-on-regression", action="store_true")
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options["seed"])
+        mix = dict(DEFAULT_MIX)
+        for item in filter(None, options["mix"].split(",")):
+            name, _, weight = item.partition("=")
+            if name not in mix:
+                raise CommandError(f"Unknown scenario {name!r}; choose from {', '.join(mix)}")
+            mix[name] = float(weight)
+
+        workdir = tempfile.mkdtemp(prefix="rainsafe-load-")
+        server = None
+        try:
+            with FakeOpenMeteo(latency=options["upstream_latency"]) as weather, FakeGraphAPI() as graph:
+                env = self._server_env(options, workdir, weather, graph)
+                if options["url"]:
+                    base = options["url"].rstrip("/")
+                else:
+                    self._seed(options, env, workdir)
+                    server, base = self._boot(options, env, workdir)
+                results = self._run(options, base, mix)
+                results["upstreams"] = {"open_meteo_requests": weather.requests,
+                                        "graph_requests": graph.requests}
+        finally:
+            if server is not None:
+                server.terminate()
+                server.wait(timeout=10)
+            shutil.rmtree(workdir, ignore_errors=True)
+
+        self._report(results)
+        if options["output"]:
+            with open(options["output"], "w") as fh:
+                json.dump(results, fh, indent=2)
+            self.stdout.write(f"Wrote {options['output']}")
+        if options["compare"]:
+            regressions = self._compare(results, options["compare"], options["threshold"])
+            if regressions and options["fail_on_regression"]:
+                raise CommandError(f"{regressions} endpoint(s) regressed by more than {options['threshold']}%")
+
+    # --- setup -------------------------------------------------------------
+
+    def _server_env(self, options, workdir, weather, graph):
+        env = dict(os.environ)
+        env.update({
+            "PYTHONPATH": str(settings.BASE_DIR),
+            "DATABASE_URL": options["database_url"] or f"sqlite:///{os.path.join(workdir, 'load.sqlite3')}",
+            "OPEN_METEO_URL": weather.url,
+            "OPEN_WEATHER_URL": weather.openweather_url,
+            "MESSENGER_GRAPH_URL": graph.url,
+            "MESSENGER_PAGE_ACCESS_TOKEN": "fake-page-token",
+            "MESSENGER_APP_SECRET": APP_SECRET,
+            "LOGIN_IP_RATE": "100000/min",
+            "LOGIN_EMAIL_RATE": "100000/min",
+        })
+        for item in options["server_env"]:
+            key, _, value = item.partition("=")
+            env[key] = value
+        return env
+
+    def _seed(self, options, env, workdir):
+        if options["database_url"]:
+            return
+        manage = str(settings.BASE_DIR / "manage.py")
+        self.stdout.write("Seeding database…")
+        subprocess.run([sys.executable, manage, "migrate", "-v0"], env=env, cwd=workdir, check=True)
+        subprocess.run(
+            [sys.executable, manage, "generate_dataset",
+             "--stations", str(options["stations"]), "--days", str(options["days"]),
+             "--users", str(options["users"]), "--reports", str(options["reports"]),
+             "--notifications", str(options["notifications"]), "--seed", str(options["seed"])],
+            env=env, cwd=workdir, check=True, stdout=subprocess.DEVNULL,
+        )
+        # Stored forecasts come from the (fake) upstream, as the scheduler would fetch them
+        subprocess.run([sys.executable, manage, "refresh_forecasts"], env=env, cwd=workdir, check=True,
+                       stdout=subprocess.DEVNULL)
+
+    def _boot(self, options, env, workdir):
+        host, port = "127.0.0.1", free_port()
+        cmd = options["server_cmd"].format(
+            python=sys.executable, manage=settings.BASE_DIR / "manage.py", host=host, port=port,
+        ).split()
+        # cwd=workdir keeps uploaded report images out of the source tree
+        server = subprocess.Popen(cmd, env=env, cwd=workdir, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        base = f"http://{host}:{port}"
+        deadline = time.monotonic() + 60
+        while time.monotonic() < deadline:
+            if server.poll() is not None:
+                raise CommandError(f"Server exited with code {server.returncode}: {' '.join(cmd)}")
+            try:
+                requests.get(f"{base}/api/weather/live/", timeout=1)
+                return server, base
+            except requests.ConnectionError:
+                time.sleep(0.2)
+        server.terminate()
+        raise CommandError("Server did not start within 60s")
+
+    def _login(self, base, count):
+        tokens = []
+        session = requests.Session()
+        for i in range(1, count + 1):
+            response = session.post(f"{base}/api/token/",
+                                    json={"email": f"resident{i}@{EMAIL_DOMAIN}", "password": PASSWORD})
+            if response.status_code != 200:
+                raise CommandError(f"Login failed for resident{i}: {response.status_code} {response.text[:200]}")
+            tokens.append(response.json()["access"])
+        return tokens
+
+    # --- run ---------------------------------------------------------------
+
+    def _run(self, options, base, mix):
+        tokens = self._login(base, min(options["concurrency"], options["users"], 50))
+        admin_token = tokens[0]  # resident1 is an admin in generate_dataset
+        stations = [s["id"] for s in requests.get(
+            f"{base}/api/weather/stations/", headers={"Authorization": f"Bearer {admin_token}"}).json()]
+        scenarios = Scenarios(base, tokens, admin_token, stations or [1])
+        names = [name for name, weight in mix.items() if weight > 0]
+        weights = [mix[name] for name in names]
+
+        samples, errors, lock = defaultdict(list), defaultdict(int), threading.Lock()
+        start = time.monotonic()
+        measure_from = start + options["warmup"]
+        stop_at = measure_from + options["duration"]
+
+        def virtual_user(seed):
+            rng = random.Random(seed)
+            session = requests.Session()
+            while time.monotonic() < stop_at:
+                name = rng.choices(names, weights)[0]
+                began = time.monotonic()
+                try:
+                    label, response = getattr(scenarios, name)(session, rng)
+                    failed = response.status_code >= 400
+                except requests.RequestException:
+                    label, failed = name, True
+                elapsed = time.monotonic() - began
+                if began >= measure_from:
+                    with lock:
+                        samples[label].append(elapsed)
+                        errors[label] += failed
+
+        threads = [threading.Thread(target=virtual_user, args=(self.rng.random(),))
+                   for _ in range(options["concurrency"])]
+        self.stdout.write(f"Running {options['concurrency']} virtual users for "
+                          f"{options['warmup']}s warm-up + {options['duration']}s against {base}")
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        measured = time.monotonic() - measure_from
+
+        endpoints = {
+            label: {"requests": len(times), "errors": errors[label], "rps": len(times) / measured,
+                    **percentiles(times)}
+            for label, times in sorted(samples.items())
+        }
+        all_times = [t for times in samples.values() for t in times]
+        return {
+            "meta": {
+                "commit": self._commit(),
+                "started_at": datetime.now(timezone.utc).isoformat(),
+                "duration_s": measured,
+                "concurrency": options["concurrency"],
+                "mix": mix,
+                "dataset": {k: options[k] for k in ("stations", "days", "users", "reports", "notifications")},
+                "server_cmd": options["server_cmd"] if not options["url"] else options["url"],
+                "server_env": options["server_env"],
+            },
+            "total": {"requests": len(all_times), "errors": sum(errors.values()),
+                      "rps": len(all_times) / measured, **(percentiles(all_times) if all_times else {})},
+            "endpoints": endpoints,
+        }
+
+    @staticmethod
+    def _commit():
+        try:
+            return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                  cwd=settings.BASE_DIR, timeout=10).stdout.strip() or None
+        except (OSError, subprocess.SubprocessError):
+            return None
+
+    # --- output ------------------------------------------------------------
+
+    def _report(self, results):
+        self.stdout.write(f"{'endpoint':<34} {'reqs':>7} {'err':>5} {'rps':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+        rows = list(results["endpoints"].items()) + [("TOTAL", results["total"])]
+        for label, row in rows:
+            if not row["requests"]:
+                continue
+            self.stdout.write(
+                f"{label:<34} {row['requests']:>7} {row['errors']:>5} {row['rps']:>8.1f} "
+                f"{row['p50_ms']:>8.1f} {row['p95_ms']:>8.1f} {row['p99_ms']:>8.1f}"
+            )
+
+    def _compare(self, results, path, threshold):
+        with open(path) as fh:
+            baseline = json.load(fh)
+        self.stdout.write(f"\nvs {path} (commit {baseline['meta'].get('commit')}):")
+        self.stdout.write(f"{'endpoint':<34} {'rps':>9} {'p95':>9}")
+        regressions = 0
+        for label, row in results["endpoints"].items():
+            before = baseline["endpoints"].get(label)
+            if not before:
+                continue
+            rps = (row["rps"] / before["rps"] - 1) * 100
+            p95 = (row["p95_ms"] / before["p95_ms"] - 1) * 100
+            regressed = rps < -threshold or p95 > threshold
+            regressions += regressed
+            line = f"{label:<34} {rps:>+8.1f}% {p95:>+8.1f}%"
+            self.stdout.write(self.style.ERROR(line + "  regression") if regressed else line)
+        return regressions
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from weather.forecasts import refresh_forecasts
+
+
+class Command(BaseCommand):
+    help = "Fetch and store the forecast of every station (what the scheduler's forecast job runs)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=None, help="Stations per upstream request")
+
+    def handle(self, *args, **options):
+        result = refresh_forecasts(options["batch_size"])
+        for error in result["errors"]:
+            self.stderr.write(f"{', '.join(error['stations'])}: {error['error']}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Stored forecasts for {result['stations']} stations in {result['requests']} requests"
+        ))
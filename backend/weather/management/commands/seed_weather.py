@@ -2,7 +2,7 @@ import random
 from datetime import datetime, timedelta
 from django.core.management.base import BaseCommand
 from django.utils.timezone import make_aware
-from weather.models import WeatherData
+from weather.models import Station, WeatherData
 
 
 class Command(BaseCommand):
@@ -10,6 +10,9 @@ class Command(BaseCommand):
 
     def handle(self, *args, **kwargs):
         today = datetime.now().date()
+        station, _ = Station.objects.get_or_create(
+            name="CMU Campus", defaults={"latitude": 7.85, "longitude": 125.05}
+        )
 
         for i in range(7):
             day = today - timedelta(days=i)
@@ -26,6 +29,7 @@ class Command(BaseCommand):
             precip = random.randint(0, 100)               # %
 
             WeatherData.objects.create(
+                station=station,
                 timestamp=make_aware(datetime.combine(day, datetime.min.time())),
                 location_name="CMU Campus",  # ✅ fixed field name
                 latitude=7.85,
@@ -0,0 +1,50 @@
+# Generated by Django 5.0.3 on 2026-10-19 18:32
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('weather', '0002_remove_station_humidity_remove_station_rain_chance_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AlertRule',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=128)),
+                ('barangay', models.CharField(blank=True, max_length=100)),
+                ('municipal', models.CharField(blank=True, max_length=100)),
+                ('province', models.CharField(blank=True, max_length=100)),
+                ('metric', models.CharField(choices=[('precipitation_probability', 'Rain chance (%)'), ('humidity', 'Humidity (%)'), ('wind_speed', 'Wind speed (km/h)'), ('temperature', 'Temperature (°C)')], max_length=32)),
+                ('operator', models.CharField(choices=[('gte', 'At or above'), ('lte', 'At or below')], default='gte', max_length=3)),
+                ('threshold', models.FloatField()),
+                ('duration_hours', models.PositiveSmallIntegerField(default=1)),
+                ('cooldown_minutes', models.PositiveIntegerField(default=180)),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('station', models.ForeignKey(blank=True, help_text='Leave empty to apply the rule to every station.', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='alert_rules', to='weather.station')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='AlertEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('reading_time', models.DateTimeField()),
+                ('value', models.FloatField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('station', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='alert_events', to='weather.station')),
+                ('rule', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='events', to='weather.alertrule')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['station', 'rule', 'created_at'], name='alert_event_cooldown_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='alertevent',
+            constraint=models.UniqueConstraint(fields=('rule', 'station', 'reading_time'), name='unique_alert_event'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.0.3 on 2026-10-19 19:21
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('weather', '0003_alert_rules'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Forecast',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('issued_at', models.DateTimeField()),
+                ('timezone', models.CharField(blank=True, max_length=64)),
+                ('daily', models.JSONField(default=list)),
+                ('hourly', models.JSONField(default=list)),
+                ('station', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='forecast', to='weather.station')),
+            ],
+        ),
+    ]
@@ -0,0 +1,73 @@
+# Generated by Django 5.0.3 on 2026-10-19 19:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('weather', '0004_forecast'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='weatherdata',
+            name='apparent_temperature',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='weatherdata',
+            name='dew_point',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='weatherdata',
+            name='heat_index',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='weatherdata',
+            name='precipitation_probability_max_24h',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='weatherdata',
+            name='precipitation_probability_max_3h',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='weatherdata',
+            name='precipitation_probability_max_6h',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='weatherdata',
+            name='temperature_avg_24h',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='weatherdata',
+            name='temperature_avg_3h',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='weatherdata',
+            name='temperature_avg_6h',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='weatherdata',
+            name='wind_speed_max_24h',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='weatherdata',
+            name='wind_speed_max_3h',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='weatherdata',
+            name='wind_speed_max_6h',
+            field=models.FloatField(blank=True, null=True),
+        ),
+    ]
@@ -23,6 +23,21 @@ class WeatherData(models.Model):
     precipitation_probability = models.FloatField(null=True, blank=True)
     wind_speed = models.FloatField(null=True, blank=True)
 
+    # Derived at ingest (weather/derived.py)
+    dew_point = models.FloatField(null=True, blank=True)             # °C
+    heat_index = models.FloatField(null=True, blank=True)            # °C
+    apparent_temperature = models.FloatField(null=True, blank=True)  # °C
+    # Trailing windows ending at this reading
+    temperature_avg_3h = models.FloatField(null=True, blank=True)
+    temperature_avg_6h = models.FloatField(null=True, blank=True)
+    temperature_avg_24h = models.FloatField(null=True, blank=True)
+    precipitation_probability_max_3h = models.FloatField(null=True, blank=True)
+    precipitation_probability_max_6h = models.FloatField(null=True, blank=True)
+    precipitation_probability_max_24h = models.FloatField(null=True, blank=True)
+    wind_speed_max_3h = models.FloatField(null=True, blank=True)
+    wind_speed_max_6h = models.FloatField(null=True, blank=True)
+    wind_speed_max_24h = models.FloatField(null=True, blank=True)
+
     # Optional redundancy (useful for queries without join)
     location_name = models.CharField(max_length=100)
     latitude = models.FloatField()
@@ -35,3 +50,79 @@ class WeatherData(models.Model):
 
     def __str__(self):
         return f"{self.station.name} @ {self.timestamp:%Y-%m-%d %H:%M} - {self.temperature}°C"
+
+
+class Forecast(models.Model):
+    """
+    Latest Open-Meteo forecast for one station, refreshed in bulk by the
+    scheduler (weather/forecasts.py). Rows are stored already shaped for
+    the forecast endpoint, so serving one is a single indexed read.
+    """
+    station = models.OneToOneField("Station", on_delete=models.CASCADE, related_name="forecast")
+    issued_at = models.DateTimeField()
+    timezone = models.CharField(max_length=64, blank=True)
+    daily = models.JSONField(default=list)   # [{date, min_temp, max_temp, rain_chance, wind_max}]
+    hourly = models.JSONField(default=list)  # [{time, temperature, humidity, rain_chance, wind_speed}]
+
+    def __str__(self):
+        return f"Forecast for {self.station_id} @ {self.issued_at:%Y-%m-%d %H:%M}"
+
+
+class AlertRule(models.Model):
+    """
+    Threshold rule checked against each newly ingested batch of WeatherData.
+    Fires when `metric` stays past `threshold` for `duration_hours`
+    consecutive hourly readings, at most once per `cooldown_minutes`.
+    """
+    METRIC_CHOICES = [
+        ("precipitation_probability", "Rain chance (%)"),
+        ("humidity", "Humidity (%)"),
+        ("wind_speed", "Wind speed (km/h)"),
+        ("temperature", "Temperature (°C)"),
+    ]
+    OPERATOR_CHOICES = [
+        ("gte", "At or above"),
+        ("lte", "At or below"),
+    ]
+
+    name = models.CharField(max_length=128)
+    station = models.ForeignKey(
+        "Station", on_delete=models.CASCADE, null=True, blank=True, related_name="alert_rules",
+        help_text="Leave empty to apply the rule to every station.",
+    )
+
+    # Residents to alert; when all are empty the alert goes to admins only
+    barangay = models.CharField(max_length=100, blank=True)
+    municipal = models.CharField(max_length=100, blank=True)
+    province = models.CharField(max_length=100, blank=True)
+
+    metric = models.CharField(max_length=32, choices=METRIC_CHOICES)
+    operator = models.CharField(max_length=3, choices=OPERATOR_CHOICES, default="gte")
+    threshold = models.FloatField()
+    duration_hours = models.PositiveSmallIntegerField(default=1)
+    cooldown_minutes = models.PositiveIntegerField(default=180)
+    is_active = models.BooleanField(default=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.name
+
+
+class AlertEvent(models.Model):
+    """One fired alert; used for deduplication and cooldowns."""
+    rule = models.ForeignKey(AlertRule, on_delete=models.CASCADE, related_name="events")
+    station = models.ForeignKey("Station", on_delete=models.CASCADE, related_name="alert_events")
+    reading_time = models.DateTimeField()  # reading that completed the run
+    value = models.FloatField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["rule", "station", "reading_time"], name="unique_alert_event"),
+        ]
+        indexes = [
+            models.Index(fields=["station", "rule", "created_at"], name="alert_event_cooldown_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.rule.name} @ {self.station_id} ({self.reading_time:%Y-%m-%d %H:%M})"
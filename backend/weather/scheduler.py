@@ -1,10 +1,13 @@
 from apscheduler.schedulers.background import BackgroundScheduler
+from django.conf import settings
 from django_apscheduler.jobstores import register_events, DjangoJobStore
+from django.utils.timezone import now
+from .forecasts import refresh_forecasts
 from .views import fetch_and_store_weather_data
 
 
 def start():
-    """Start the background scheduler to fetch weather data every hour."""
+    """Start the background scheduler to fetch weather data every WEATHER_INGEST_INTERVAL (default 1h)."""
     scheduler = BackgroundScheduler(timezone="Asia/Manila")
     scheduler.add_jobstore(DjangoJobStore(), "default")
 
@@ -12,11 +15,24 @@ def start():
     scheduler.add_job(
         fetch_and_store_weather_data,
         trigger="interval",
-        hours=1,
+        seconds=settings.WEATHER_INGEST_INTERVAL,
         id="weather_fetch_job",
         replace_existing=True,
     )
 
+    # Job: refresh stored forecasts, first run right away so the endpoint has data
+    scheduler.add_job(
+        refresh_forecasts,
+        trigger="interval",
+        seconds=settings.FORECAST_REFRESH_INTERVAL,
+        next_run_time=now(),
+        id="forecast_refresh_job",
+        replace_existing=True,
+    )
+
     register_events(scheduler)
     scheduler.start()
-    print("✅ APScheduler started: Weather fetch every hour")
+    print(
+        f"✅ APScheduler started: Weather fetch every {settings.WEATHER_INGEST_INTERVAL}s, "
+        f"forecasts every {settings.FORECAST_REFRESH_INTERVAL}s"
+    )
@@ -1,6 +1,9 @@
 # backend/weather/serializers.py
+from django.db.models import OuterRef, Subquery
+from django.db.models.manager import BaseManager
 from rest_framework import serializers
-from .models import WeatherData, Station
+from core.fastpath import iso_datetime
+from .models import WeatherData, Station, AlertRule
 
 
 class WeatherDataSerializer(serializers.ModelSerializer):
@@ -9,6 +12,23 @@ class WeatherDataSerializer(serializers.ModelSerializer):
         fields = "__all__"
 
 
+def with_latest_weather_id(queryset):
+    """Annotate stations with `latest_id`, the id of their newest WeatherData."""
+    latest = WeatherData.objects.filter(station=OuterRef("pk")).order_by("-timestamp").values("id")[:1]
+    return queryset.annotate(latest_id=Subquery(latest))
+
+
+class StationListSerializer(serializers.ListSerializer):
+    """Loads the latest reading of every listed station in one query, not one per station."""
+
+    def to_representation(self, data):
+        stations = list(data.all() if isinstance(data, BaseManager) else data)
+        latest_ids = with_latest_weather_id(Station.objects.filter(pk__in=[s.pk for s in stations]))
+        readings = {r.station_id: r for r in WeatherData.objects.filter(id__in=latest_ids.values("latest_id"))}
+        self.child._weather_cache = {s.pk: readings.get(s.pk) for s in stations}
+        return super().to_representation(stations)
+
+
 class StationSerializer(serializers.ModelSerializer):
     temperature = serializers.SerializerMethodField()
     humidity = serializers.SerializerMethodField()
@@ -18,6 +38,7 @@ class StationSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Station
+        list_serializer_class = StationListSerializer
         fields = [
             "id",
             "name",
@@ -62,3 +83,60 @@ class StationSerializer(serializers.ModelSerializer):
     def get_last_updated(self, obj):
         record = self._get_latest_weather(obj)
         return record.timestamp.isoformat() if record and record.timestamp else None
+
+
+def fast_station_rows(queryset, context=None):
+    """
+    StationSerializer output for a whole list in two queries: stations with
+    the id of their latest reading, then those readings.
+    """
+    stations = list(
+        with_latest_weather_id(queryset).values_list(
+            "id", "name", "latitude", "longitude", "elevation", "description", "created_at", "latest_id",
+        )
+    )
+    readings = {
+        row[0]: row[1:]
+        for row in WeatherData.objects.filter(id__in=[s[7] for s in stations if s[7]]).values_list(
+            "id", "temperature", "humidity", "precipitation_probability", "wind_speed", "timestamp",
+        )
+    }
+
+    rows = []
+    for pk, name, lat, lon, elevation, description, created_at, latest_id in stations:
+        temperature, humidity, rain_chance, wind_speed, timestamp = readings.get(latest_id, (None,) * 5)
+        rows.append({
+            "id": pk,
+            "name": name,
+            "latitude": lat,
+            "longitude": lon,
+            "elevation": elevation,
+            "description": description,
+            "created_at": iso_datetime(created_at),
+            "temperature": temperature,
+            "humidity": humidity,
+            "rain_chance": rain_chance,
+            "wind_speed": wind_speed,
+            "last_updated": timestamp.isoformat() if timestamp else None,
+        })
+    return rows
+
+
+class AlertRuleSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = AlertRule
+        fields = [
+            "id",
+            "name",
+            "station",
+            "barangay",
+            "municipal",
+            "province",
+            "metric",
+            "operator",
+            "threshold",
+            "duration_hours",
+            "cooldown_minutes",
+            "is_active",
+            "created_at",
+        ]
@@ -0,0 +1,12 @@
+# backend/weather/signals.py
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .caching import bump_data_version
+from .models import Station
+
+
+@receiver(post_save, sender=Station)
+@receiver(post_delete, sender=Station)
+def station_changed(sender, **kwargs):
+    bump_data_version()
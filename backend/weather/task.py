@@ -13,7 +13,7 @@ def fetch_and_cache_station_weather():
 
     for station in Station.objects.all():
         url = (
-            f"https://api.openweathermap.org/data/2.5/weather"
+            f"{settings.OPEN_WEATHER_URL}"
             f"?lat={station.latitude}&lon={station.longitude}&appid={api_key}&units=metric"
         )
 
@@ -1,3 +1,396 @@
-from django.test import TestCase
+import multiprocessing
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+from unittest import mock
 
-# Create your tests here.
+import numpy as np
+
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.core.management import call_command
+from django.test import AsyncRequestFactory, SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from core.querycount import QueryLog
+from core.testing import QueryBudgetMixin
+from notifications.models import Notification
+from users.tokens import CustomTokenObtainPairSerializer
+from . import async_views
+from .alerts import evaluate_alert_rules, first_sustained_breach, load_active_rules
+from .caching import DATA_VERSION_KEY, bump_data_version, get_data_version
+from .fake_open_meteo import FakeOpenMeteo
+from .derived import DERIVED_FIELDS, apparent_temperature, dew_point, heat_index
+from .forecasts import daily_rows, refresh_forecasts
+from .models import AlertEvent, AlertRule, Forecast, Station, WeatherData
+from .views import store_station_weather
+
+def _in_child(target, *args):
+    """Run target(*args) in a forked worker process, the way gunicorn/scheduler processes run."""
+    ctx = multiprocessing.get_context("fork")
+    parent, child = ctx.Pipe()
+    process = ctx.Process(target=lambda: child.send(target(*args)))
+    process.start()
+    result = parent.recv()
+    process.join()
+    return result
+
+
+def _cache_task_weather(station_id):
+    # What weather.task does in the scheduler process
+    caches["default"].set(f"station_weather_{station_id}", {"main": {"temp": 27.5}}, timeout=600)
+
+
+def _read(key):
+    return caches["default"].get(key)
+
+
+def _incr(key, times):
+    for _ in range(times):
+        caches["default"].incr(key)
+
+
+class SharedCacheTests(SimpleTestCase):
+    """core.cache.SQLiteCache: entries written by one process are seen by the others."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cache_dir = cls.enterClassContext(tempfile.TemporaryDirectory())
+        cls.enterClassContext(override_settings(CACHES={
+            "default": {
+                "BACKEND": "core.cache.SQLiteCache",
+                "LOCATION": os.path.join(cache_dir, "cache.sqlite3"),
+            }
+        }))
+
+    def setUp(self):
+        caches["default"].clear()
+
+    def test_task_writes_are_visible_to_web_workers(self):
+        _in_child(_cache_task_weather, 7)
+        self.assertEqual(caches["default"].get("station_weather_7"), {"main": {"temp": 27.5}})
+
+    def test_data_version_bump_propagates(self):
+        before = get_data_version()
+        time.sleep(0.01)
+        _in_child(bump_data_version)
+        self.assertGreater(get_data_version(), before)
+        self.assertEqual(_in_child(_read, DATA_VERSION_KEY), get_data_version())
+
+    def test_delete_propagates(self):
+        caches["default"].set("station_weather_3", {"main": {}})
+        self.assertIsNotNone(_in_child(_read, "station_weather_3"))
+        caches["default"].delete("station_weather_3")
+        self.assertIsNone(_in_child(_read, "station_weather_3"))
+
+    def test_incr_is_atomic_across_processes(self):
+        caches["default"].set("hits", 0)
+        ctx = multiprocessing.get_context("fork")
+        workers = [ctx.Process(target=_incr, args=("hits", 50)) for _ in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        self.assertEqual(caches["default"].get("hits"), 200)
+
+    def test_expiry_and_add(self):
+        cache = caches["default"]
+        cache.set("short", 1, timeout=0.05)
+        self.assertFalse(cache.add("short", 2))
+        time.sleep(0.1)
+        self.assertIsNone(cache.get("short"))
+        self.assertTrue(cache.add("short", 2))
+        self.assertEqual(cache.get("short"), 2)
+        self.assertTrue(cache.touch("short", None))
+        self.assertEqual(cache.get_many(["short", "missing"]), {"short": 2})
+
+
+class WeatherQueryBudgetTests(QueryBudgetMixin, TestCase):
+    query_budgets = {
+        "station list": ("/api/weather/stations/", 3),
+        "station detail": ("/api/weather/stations/{self.station_pk}/", 3),
+        "history": ("/api/weather/history/", 2),
+        "alert rules": ("/api/weather/alert-rules/", 2),
+        "forecast": ("/api/weather/forecast/?station={self.station_pk}&hourly=1", 2),
+    }
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(email="budget@example.com", role="admin")
+
+    def populate(self, size):
+        start = timezone.now() - timedelta(hours=size)
+        for i in range(Station.objects.count(), size):
+            station = Station.objects.create(name=f"Station {i}", latitude=7.8, longitude=125.0)
+            WeatherData.objects.bulk_create(
+                WeatherData(station=station, timestamp=start + timedelta(hours=h), temperature=26 + h % 5,
+                            location_name=station.name, latitude=7.8, longitude=125.0)
+                for h in range(3)
+            )
+            AlertRule.objects.create(name=f"Rule {i}", station=station, metric="humidity", threshold=90)
+            Forecast.objects.create(station=station, issued_at=timezone.now(),
+                                    daily=daily_rows(FakeOpenMeteo.payload({})))
+        self.station_pk = Station.objects.earliest("pk").pk
+
+
+@override_settings(FAST_READ_SERIALIZERS=False)
+class WeatherSerializerQueryBudgetTests(WeatherQueryBudgetTests):
+    """Same budgets with the ModelSerializer paths instead of core.fastpath."""
+
+
+class ResponseCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.alice = User.objects.create_user(email="alice@example.com")
+        cls.bob = User.objects.create_user(email="bob@example.com")
+
+    def setUp(self):
+        caches["default"].clear()
+
+    def get(self, user, url):
+        client = APIClient()
+        client.force_authenticate(user)
+        return client.get(url, HTTP_HOST="127.0.0.1")
+
+    def test_json_is_shared(self):
+        self.assertEqual(self.get(self.alice, "/api/weather/history/").status_code, 200)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.get(self.bob, "/api/weather/history/").status_code, 200)
+
+    def test_browsable_api_is_not_shared(self):
+        self.assertIn(b"alice@example.com", self.get(self.alice, "/api/weather/history/?format=api").content)
+        content = self.get(self.bob, "/api/weather/history/?format=api").content
+        self.assertIn(b"bob@example.com", content)
+        self.assertNotIn(b"alice@example.com", content)
+
+
+class AsyncViewAccessTests(TestCase):
+    """The async views authenticate and answer like their sync counterparts."""
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.resident = User.objects.create_user(email="resident@example.com")
+
+    def bearer(self, user):
+        return f"Bearer {CustomTokenObtainPairSerializer.get_token(user).access_token}"
+
+    async def call(self, view, authorization=None):
+        headers = {"Authorization": authorization} if authorization else {}
+        return await view(AsyncRequestFactory().get("/api/weather/live/", headers=headers))
+
+    async def test_invalid_token_is_401(self):
+        response = await self.call(async_views.live_weather_view, "Bearer garbage.token.here")
+        self.assertEqual(response.status_code, 401)
+        self.assertIn("Bearer", response["WWW-Authenticate"])
+        sync_response = APIClient().get("/api/weather/live/", HTTP_AUTHORIZATION="Bearer garbage.token.here")
+        self.assertEqual(sync_response.status_code, 401)
+
+    async def test_allow_any(self):
+        # Authentication passes, then the view itself rejects the missing coordinates
+        for authorization in (None, self.bearer(self.resident)):
+            response = await self.call(async_views.live_weather_view, authorization)
+            self.assertEqual(response.status_code, 400)
+
+    async def test_admin_only(self):
+        view = async_views.fetch_weather_data_view
+        self.assertEqual((await self.call(view)).status_code, 401)
+        self.assertEqual((await self.call(view, self.bearer(self.resident))).status_code, 403)
+        self.assertEqual((await self.call(view, "Bearer garbage.token.here")).status_code, 401)
+
+
+class IngestQueryTests(TestCase):
+    def test_store_station_weather_has_no_per_row_queries(self):
+        station = Station.objects.create(name="CMU Campus", latitude=7.85, longitude=125.05)
+        payload = FakeOpenMeteo.payload({})
+        for run in ("insert", "update"):
+            with self.subTest(run=run):
+                with QueryLog() as log:
+                    store_station_weather(station, payload, rules={})
+                self.assertFalse(log.repeated(3), log.describe())
+        self.assertEqual(WeatherData.objects.filter(station=station).count(), 24)
+
+
+class ForecastTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(email="resident@example.com")
+        cls.stations = [
+            Station.objects.create(name=name, latitude=7.8 + i / 10, longitude=125.0)
+            for i, name in enumerate(["Maramag", "CMU Campus", "Valencia", "Musuan", "Dologon"])
+        ]
+
+    def setUp(self):
+        caches["default"].clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.upstream = FakeOpenMeteo().start()
+        self.addCleanup(self.upstream.stop)
+
+    def refresh(self, **kwargs):
+        with override_settings(OPEN_METEO_URL=self.upstream.url, FORECAST_DAYS=7):
+            return refresh_forecasts(**kwargs)
+
+    def forecast(self, **params):
+        return self.client.get("/api/weather/forecast/", params, HTTP_HOST="127.0.0.1")
+
+    def test_refresh_batches_stations_and_upserts(self):
+        result = self.refresh(batch_size=2)
+        self.assertEqual((result["stations"], result["requests"], result["errors"]), (5, 3, []))
+        self.assertEqual(self.upstream.requests, 3)
+        first = Forecast.objects.get(station=self.stations[0])
+        self.assertEqual(len(first.daily), 7)
+        self.assertEqual(len(first.hourly), 7 * 24)
+        self.assertEqual(first.timezone, "Asia/Manila")
+
+        with QueryLog() as log:
+            self.refresh()
+        self.assertEqual(self.upstream.requests, 4)
+        self.assertEqual(Forecast.objects.count(), 5)
+        self.assertLessEqual(log.count, 2, log.describe())
+
+    def test_failed_batch_keeps_previous_forecast(self):
+        self.refresh()
+        with override_settings(OPEN_METEO_URL=self.upstream.url + "/missing"):
+            result = refresh_forecasts()
+        self.assertEqual(result["stations"], 0)
+        self.assertEqual(len(result["errors"]), 1)
+        self.assertEqual(Forecast.objects.count(), 5)
+
+    def test_endpoint_serves_stored_forecast(self):
+        self.assertEqual(self.forecast().status_code, 503)
+        self.refresh()
+        requests_after_refresh = self.upstream.requests
+
+        body = self.forecast().json()
+        self.assertEqual(body["location"], "CMU Campus")
+        self.assertEqual(len(body["data"]), 3)
+        self.assertNotIn("hourly", body)
+
+        body = self.forecast(station=self.stations[2].pk, days=5, hourly=1).json()
+        self.assertEqual((body["location"], body["message"]), ("Valencia", "5-day forecast"))
+        self.assertEqual(len(body["hourly"]), 5 * 24)
+        self.assertEqual(body["hourly"][-1]["time"][:10], body["data"][-1]["date"])
+        self.assertEqual(len(self.forecast(days=99).json()["data"]), 7)
+        self.assertEqual(self.upstream.requests, requests_after_refresh)
+
+        self.assertEqual(self.forecast(station=999999).status_code, 404)
+        self.assertEqual(self.forecast(days="x").status_code, 400)
+
+
+class DerivedMetricsTests(TestCase):
+    def test_formulas_match_reference_values(self):
+        t, rh = np.array([30.0, 35.0, 20.0, np.nan]), np.array([70.0, 50.0, 90.0, 80.0])
+        # NWS heat index table: 86°F/70% -> 95°F, 95°F/50% -> 105°F; below 80°F it is ~ the air temperature
+        np.testing.assert_allclose(heat_index(t, rh)[:3], [35.0, 40.6, 20.4], atol=0.2)
+        np.testing.assert_allclose(dew_point(t, rh)[:3], [23.9, 23.0, 18.3], atol=0.1)
+        np.testing.assert_allclose(apparent_temperature(t, rh, np.array([0.0] * 4))[:2], [35.8, 40.2], atol=0.1)
+        self.assertTrue(np.isnan(heat_index(t, rh)[3]))
+
+    def test_ingest_windows_reach_into_stored_history(self):
+        station = Station.objects.create(name="CMU Campus", latitude=7.85, longitude=125.05)
+        payload = FakeOpenMeteo.payload({})
+        earlier = {**payload, "current": {}, "hourly": {**payload["hourly"], "time": [
+            (datetime.fromisoformat(ts) - timedelta(hours=12)).strftime("%Y-%m-%dT%H:%M")
+            for ts in payload["hourly"]["time"]
+        ]}}
+        store_station_weather(station, earlier, rules={})
+        store_station_weather(station, payload, rules={})
+
+        records = list(WeatherData.objects.filter(station=station).order_by("timestamp"))
+        self.assertEqual(len(records), 36)
+        for record in records:
+            self.assertIsNotNone(record.heat_index)
+            window = [r.temperature for r in records if record.timestamp - timedelta(hours=24) < r.timestamp <= record.timestamp]
+            self.assertAlmostEqual(record.temperature_avg_24h, sum(window) / len(window), places=2)
+            window = [r.wind_speed for r in records if record.timestamp - timedelta(hours=3) < r.timestamp <= record.timestamp]
+            self.assertEqual(record.wind_speed_max_3h, max(window))
+
+        # Backfilling from scratch gives what ingest stored
+        stored = list(WeatherData.objects.order_by("timestamp").values_list(*DERIVED_FIELDS))
+        WeatherData.objects.update(**{field: None for field in DERIVED_FIELDS})
+        call_command("backfill_derived_metrics", stdout=open(os.devnull, "w"))
+        self.assertEqual(list(WeatherData.objects.order_by("timestamp").values_list(*DERIVED_FIELDS)), stored)
+
+
+class SustainedBreachTests(SimpleTestCase):
+    def breach(self, values, eligible=None, **rule):
+        values = np.array(values, dtype=float)
+        rule = AlertRule(metric="humidity", **{"threshold": 80, "duration_hours": 2, **rule})
+        eligible = np.ones(values.size, bool) if eligible is None else np.array(eligible)
+        return first_sustained_breach(values, rule, eligible)
+
+    def test_run_must_be_sustained(self):
+        self.assertIsNone(self.breach([85, 70, 90, 60]))
+        self.assertEqual(self.breach([85, 70, 90, 80, 95]), 3)  # threshold itself breaches
+        self.assertEqual(self.breach([90, 95], duration_hours=0), 0)  # 0 means a single reading
+
+    def test_missing_values_break_the_run(self):
+        self.assertIsNone(self.breach([90, np.nan, 90]))
+
+    def test_lte_operator(self):
+        self.assertEqual(self.breach([30, 20, 20], operator="lte", threshold=25), 2)
+
+    def test_run_may_start_before_the_eligible_window(self):
+        # Completed at index 1 (not eligible); still breaching when the window opens
+        self.assertEqual(self.breach([90, 90, 90, 50], eligible=[False, False, True, True]), 2)
+        self.assertIsNone(self.breach([90, 90, 50, 50], eligible=[False, False, True, True]))
+
+
+class AlertEvaluationTests(TestCase):
+    current = timezone.make_aware(datetime(2026, 7, 1, 12))
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.station = Station.objects.create(name="Maramag", latitude=7.76, longitude=125.0)
+        get_user_model().objects.create_user(email="admin@example.com", role="admin")
+        cls.rule = AlertRule.objects.create(name="Humid", station=cls.station, metric="humidity",
+                                            threshold=90, cooldown_minutes=60)
+
+    def setUp(self):
+        patcher = mock.patch("weather.alerts.schedule_broadcast")
+        self.schedule_broadcast = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def evaluate(self, hours, values, at=None):
+        timestamps = [self.current + timedelta(hours=h) for h in hours]
+        with mock.patch("weather.alerts.now", return_value=at or self.current):
+            return evaluate_alert_rules(self.station, timestamps, {"humidity": values}, load_active_rules())
+
+    def test_lookback_boundary_is_inclusive(self):
+        self.assertEqual(self.evaluate([-1], [95], at=self.current + timedelta(seconds=1)), [])
+        (event,) = self.evaluate([-1], [95])
+        self.assertEqual(event.reading_time, self.current - timedelta(hours=1))
+        self.assertEqual(Notification.objects.get().title, "⚠️ Humid: Maramag")
+
+    def test_lookahead_boundary_is_inclusive(self):
+        self.assertEqual(self.evaluate([7], [95]), [])
+        self.assertEqual(len(self.evaluate([6], [95])), 1)
+
+    def test_cooldown_expires_exactly(self):
+        (first,) = self.evaluate([0], [95])
+        AlertEvent.objects.filter(pk=first.pk).update(created_at=self.current)
+
+        later = self.current + timedelta(minutes=59)
+        self.assertEqual(self.evaluate([1], [95], at=later), [])
+        expired = self.current + timedelta(minutes=60)
+        (second,) = self.evaluate([1], [95], at=expired)
+        self.assertEqual(second.reading_time, self.current + timedelta(hours=1))
+
+    def test_reevaluating_same_readings_fires_once(self):
+        AlertRule.objects.filter(pk=self.rule.pk).update(cooldown_minutes=0)
+        self.assertEqual(len(self.evaluate([0, 1], [95, 96])), 1)
+        self.assertEqual(self.evaluate([0, 1], [95, 96]), [])
+        self.assertEqual(AlertEvent.objects.count(), 1)
+        self.assertEqual(Notification.objects.count(), 1)
+
+    def test_area_rule_broadcasts(self):
+        AlertRule.objects.filter(pk=self.rule.pk).update(barangay="Poblacion", municipal="Maramag")
+        self.evaluate([0], [95])
+        broadcast = self.schedule_broadcast.call_args.args[0]
+        self.assertEqual((broadcast.barangay, broadcast.municipal), ("Poblacion", "Maramag"))
+        self.assertFalse(Notification.objects.exists())
@@ -0,0 +1,45 @@
+"""
+Process-wide async HTTP client for Open-Meteo, used by the async views.
+
+One pooled aiohttp session per event loop: under ASGI there is a single
+loop, so every request shares the keep-alive pool. (A session can't be
+shared across loops, so callers that spin up their own loop get their own.)
+aiohttp rather than httpx: httpcore's pool re-scans every connection for
+every queued request, which dominates CPU at a hundred-plus connections.
+"""
+import asyncio
+import weakref
+
+import aiohttp
+from django.conf import settings
+
+_sessions = weakref.WeakKeyDictionary()
+
+# What fetch_json raises for transport errors, timeouts and non-2xx replies
+UpstreamError = (aiohttp.ClientError, asyncio.TimeoutError)
+
+
+def get_async_client():
+    loop = asyncio.get_running_loop()
+    session = _sessions.get(loop)
+    if session is None or session.closed:
+        session = aiohttp.ClientSession(
+            timeout=aiohttp.ClientTimeout(total=settings.OPEN_METEO_TIMEOUT, sock_connect=5),
+            connector=aiohttp.TCPConnector(limit=settings.OPEN_METEO_MAX_CONNECTIONS, ttl_dns_cache=300),
+        )
+        _sessions[loop] = session
+    return session
+
+
+async def close_async_client():
+    """Close the running loop's session (before the loop itself is closed)."""
+    session = _sessions.pop(asyncio.get_running_loop(), None)
+    if session is not None:
+        await session.close()
+
+
+async def fetch_json(url):
+    """GET url and decode JSON; raises one of UpstreamError on failure."""
+    async with get_async_client().get(url) as response:
+        response.raise_for_status()
+        return await response.json(content_type=None)
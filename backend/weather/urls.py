@@ -1,4 +1,6 @@
+from django.conf import settings
 from django.urls import path
+from . import async_views
 from .views import (
     FetchWeatherData,
     WeatherHistoryView,
@@ -6,17 +8,31 @@ from .views import (
     StationListCreateView,
     StationDetailView,
     live_weather_view, 
+    AlertRuleListCreateView,
+    AlertRuleDetailView,
 )
 
 app_name = "weather"
 
+# Upstream-bound views: native async under ASGI, DRF sync views otherwise
+if settings.WEATHER_ASYNC_VIEWS:
+    fetch_view = async_views.fetch_weather_data_view
+    live_view = async_views.live_weather_view
+else:
+    fetch_view = FetchWeatherData.as_view()
+    live_view = live_weather_view
+
 urlpatterns = [
-    path("fetch/", FetchWeatherData.as_view(), name="fetch-weather"),
+    path("fetch/", fetch_view, name="fetch-weather"),
     path("history/", WeatherHistoryView.as_view(), name="weather-history"),
     path("forecast/", WeatherForecastView.as_view(), name="weather-forecast"),
     
     # Station endpoints
     path("stations/", StationListCreateView.as_view(), name="station-list"),
     path("stations/<int:pk>/", StationDetailView.as_view(), name="station-detail"),
-    path("live/", live_weather_view, name="live-weather"),  
+    path("live/", live_view, name="live-weather"),  
+
+    # Alert rule endpoints
+    path("alert-rules/", AlertRuleListCreateView.as_view(), name="alert-rule-list"),
+    path("alert-rules/<int:pk>/", AlertRuleDetailView.as_view(), name="alert-rule-detail"),
 ]
@@ -1,99 +1,194 @@
 import requests
+from django.conf import settings
 from datetime import datetime, timedelta
 from django.utils.timezone import make_aware, now
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status, generics
+from django.db import transaction
 from django.db.models import Avg, Min, Max
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.permissions import AllowAny
-from .models import WeatherData, Station
-from .serializers import StationSerializer
+from .models import WeatherData, Station, AlertRule, Forecast
+from .serializers import StationSerializer, AlertRuleSerializer, fast_station_rows
+from .alerts import evaluate_alert_rules, load_active_rules
+from .derived import add_derived_metrics
+from .forecasts import forecast_payload
+from .caching import bump_data_version, cache_weather_response, conditional_weather_get
+from django.utils.decorators import method_decorator
 from users.permissions import IsAdmin, IsAdminOrReadOnlyAuthenticated
+from core.fastpath import FastListMixin
+
+
+INGEST_PARAMS = (
+    "timezone=auto&past_days=1&hourly=temperature_2m,relative_humidity_2m,"
+    "precipitation_probability,windspeed_10m&current=temperature_2m,"
+    "relative_humidity_2m,precipitation_probability,windspeed_10m"
+)
+
+
+def station_ingest_url(station):
+    return f"{settings.OPEN_METEO_URL}?{INGEST_PARAMS}&latitude={station.latitude}&longitude={station.longitude}"
 
 
 def fetch_and_store_weather_data():
     """
     Fetch live & recent hourly weather data from Open-Meteo for all stations.
     - Stores the past 24 hours (hourly) + current reading.
-    - Uses update_or_create() to avoid duplicates.
+    - Upserts by (station, timestamp) to avoid duplicates.
+    - Evaluates alert rules against each station's new hourly window.
     """
     results = []
-    base_url = (
-        "https://api.open-meteo.com/v1/forecast?"
-        "timezone=auto&past_days=1&hourly=temperature_2m,relative_humidity_2m,"
-        "precipitation_probability,windspeed_10m&current=temperature_2m,"
-        "relative_humidity_2m,precipitation_probability,windspeed_10m"
-    )
+    rules = load_active_rules()
 
     for station in Station.objects.all():
-        url = f"{base_url}&latitude={station.latitude}&longitude={station.longitude}"
-
         try:
-            response = requests.get(url, timeout=15)
+            response = requests.get(station_ingest_url(station), timeout=15)
             response.raise_for_status()
             data = response.json()
         except requests.RequestException as e:
             results.append({"station": station.name, "error": f"Fetch failed: {str(e)}"})
             continue
 
-        # --- Store hourly data for past 24h ---
-        hourly = data.get("hourly", {})
-        if hourly and "time" in hourly:
-            for i, ts_str in enumerate(hourly["time"]):
-                try:
-                    timestamp = datetime.fromisoformat(ts_str)
-                    if timestamp.tzinfo is None:
-                        timestamp = make_aware(timestamp)
-                except Exception:
-                    continue
-
-                WeatherData.objects.update_or_create(
-                    station=station,
-                    timestamp=timestamp,
-                    defaults={
-                        "location_name": station.name,
-                        "latitude": station.latitude,
-                        "longitude": station.longitude,
-                        "temperature": hourly.get("temperature_2m", [None])[i],
-                        "humidity": hourly.get("relative_humidity_2m", [None])[i],
-                        "precipitation_probability": hourly.get("precipitation_probability", [None])[i],
-                        "wind_speed": hourly.get("windspeed_10m", [None])[i],
-                    },
-                )
-
-        # --- Store current reading ---
-        current = data.get("current", {})
-        if current:
-            ts_str = current.get("time")
-            if ts_str:
-                timestamp = datetime.fromisoformat(ts_str)
-                if timestamp.tzinfo is None:
-                    timestamp = make_aware(timestamp)
-
-                WeatherData.objects.update_or_create(
-                    station=station,
-                    timestamp=timestamp,
-                    defaults={
-                        "location_name": station.name,
-                        "latitude": station.latitude,
-                        "longitude": station.longitude,
-                        "temperature": current.get("temperature_2m"),
-                        "humidity": current.get("relative_humidity_2m"),
-                        "precipitation_probability": current.get("precipitation_probability"),
-                        "wind_speed": current.get("windspeed_10m"),
-                    },
-                )
-
-        results.append({
-            "station": station.name,
+        results.append(store_station_weather(station, data, rules))
+
+    bump_data_version()  # new ETags for station/history responses
+    return {"message": "Weather data (current + 24h history) updated", "results": results}
+
+
+def _aware(ts_str):
+    timestamp = datetime.fromisoformat(ts_str)
+    return make_aware(timestamp) if timestamp.tzinfo is None else timestamp
+
+
+def upsert_station_readings(station, readings):
+    """
+    Insert or update `readings` ({timestamp: metrics}) for one station in a
+    constant number of queries, whatever the number of hours. Stored rows
+    that already hold these values are left alone.
+    """
+    if not readings:
+        return
+    fields = ["location_name", "latitude", "longitude", *next(iter(readings.values()))]
+    existing = {
+        record.timestamp: record
+        for record in WeatherData.objects.filter(station=station, timestamp__in=list(readings))
+    }
+    created, updated = [], []
+    for timestamp, metrics in readings.items():
+        values = {
+            "location_name": station.name,
             "latitude": station.latitude,
             "longitude": station.longitude,
-            "entries_saved": WeatherData.objects.filter(station=station).count(),
-        })
+            **metrics,
+        }
+        record = existing.get(timestamp)
+        if record is None:
+            created.append(WeatherData(station=station, timestamp=timestamp, **values))
+        elif any(getattr(record, field) != value for field, value in values.items()):
+            # Most re-fetched past hours are unchanged; only rewrite those that moved
+            for field, value in values.items():
+                setattr(record, field, value)
+            updated.append(record)
+    with transaction.atomic():
+        WeatherData.objects.bulk_create(created)
+        WeatherData.objects.bulk_update(updated, fields)
+
+
+def store_station_weather(station, data, rules):
+    """Store one station's Open-Meteo payload and run its alert rules."""
+    readings = {}
+
+    # --- Hourly data for past 24h ---
+    hourly = data.get("hourly", {})
+    window_times, window = [], {}
+    if hourly and "time" in hourly:
+        for i, ts_str in enumerate(hourly["time"]):
+            try:
+                timestamp = _aware(ts_str)
+            except Exception:
+                continue
+
+            metrics = {
+                "temperature": hourly.get("temperature_2m", [None])[i],
+                "humidity": hourly.get("relative_humidity_2m", [None])[i],
+                "precipitation_probability": hourly.get("precipitation_probability", [None])[i],
+                "wind_speed": hourly.get("windspeed_10m", [None])[i],
+            }
+            readings[timestamp] = metrics
+
+            window_times.append(timestamp)
+            for metric, value in metrics.items():
+                window.setdefault(metric, []).append(value)
+
+    # --- Current reading (wins over the hourly row for the same hour) ---
+    current = data.get("current", {})
+    if current and current.get("time"):
+        readings[_aware(current["time"])] = {
+            "temperature": current.get("temperature_2m"),
+            "humidity": current.get("relative_humidity_2m"),
+            "precipitation_probability": current.get("precipitation_probability"),
+            "wind_speed": current.get("windspeed_10m"),
+        }
+
+    # --- Dew point, heat index, feels-like and trailing windows, vectorized ---
+    add_derived_metrics(station, readings)
+
+    upsert_station_readings(station, readings)
+
+    # --- Alert rules over the just-ingested window ---
+    evaluate_alert_rules(station, window_times, window, rules)
+
+    return {
+        "station": station.name,
+        "latitude": station.latitude,
+        "longitude": station.longitude,
+        "entries_saved": WeatherData.objects.filter(station=station).count(),
+    }
+
+
+# ===================== UPSTREAM PAYLOADS =====================
+# Shared by the sync views below and their async twins in async_views.py
+
+def live_url(lat, lon):
+    return (
+        f"{settings.OPEN_METEO_URL}?"
+        f"latitude={lat}&longitude={lon}"
+        f"&current=temperature_2m,relative_humidity_2m,precipitation_probability,windspeed_10m"
+        f"&timezone=auto"
+    )
 
-    return {"message": "Weather data (current + 24h history) updated", "results": results}
+
+def live_payload(lat, lon, data):
+    """(body, status) for live_weather_view from Open-Meteo's current block."""
+    current = data.get("current", {})
+    if not current:
+        return {"error": "No live weather data found."}, 502
+
+    return {
+        "latitude": float(lat),
+        "longitude": float(lon),
+        "temperature": current.get("temperature_2m"),
+        "humidity": current.get("relative_humidity_2m"),
+        "precipitation_probability": current.get("precipitation_probability"),
+        "wind_speed": current.get("windspeed_10m"),
+        "time": current.get("time"),
+    }, 200
+
+
+def reading_summary(latest):
+    """FetchWeatherData's "data" block for the newest stored reading."""
+    if not latest:
+        return None
+    return {
+        "station": latest.station.name,
+        "temperature": latest.temperature,
+        "humidity": latest.humidity,
+        "precipitation_probability": latest.precipitation_probability,
+        "wind_speed": latest.wind_speed,
+        "timestamp": latest.timestamp,
+    }
 
 
 # ===================== API VIEWS =====================
@@ -107,30 +202,21 @@ class FetchWeatherData(APIView):
         has_error = any("error" in r for r in result["results"])
         status_code = status.HTTP_502_BAD_GATEWAY if has_error else status.HTTP_200_OK
 
-        latest = WeatherData.objects.order_by("-timestamp").first()
-        data_summary = None
-        if latest:
-            data_summary = {
-                "station": latest.station.name,
-                "temperature": latest.temperature,
-                "humidity": latest.humidity,
-                "precipitation_probability": latest.precipitation_probability,
-                "wind_speed": latest.wind_speed,
-                "timestamp": latest.timestamp,
-            }
-
+        latest = WeatherData.objects.select_related("station").order_by("-timestamp").first()
         payload = {
             "message": result["message"],
             "results": result["results"],
-            "data": data_summary,
+            "data": reading_summary(latest),
         }
         return Response(payload, status=status_code)
 
 
+@method_decorator(conditional_weather_get, name="get")
 class WeatherHistoryView(APIView):
     """Aggregates and returns average weather data for the past 7 days."""
     permission_classes = [IsAuthenticated]
 
+    @cache_weather_response
     def get(self, request):
         today = now().date()
         start_date = today - timedelta(days=7)
@@ -148,6 +234,9 @@ class WeatherHistoryView(APIView):
                 avg_wind=Avg("wind_speed"),
                 min_wind=Min("wind_speed"),
                 max_wind=Max("wind_speed"),
+                avg_dew_point=Avg("dew_point"),
+                max_heat_index=Max("heat_index"),
+                max_apparent_temp=Max("apparent_temperature"),
             )
             .order_by("timestamp__date")
         )
@@ -158,66 +247,79 @@ class WeatherHistoryView(APIView):
         })
 
 
+@method_decorator(conditional_weather_get, name="get")
 class WeatherForecastView(APIView):
-    """Fetches 3-day forecast (live, not stored)."""
+    """
+    Stored forecast for one station, refreshed by the scheduler.
+    ?station=<id> (default: FORECAST_DEFAULT_STATION), ?days=1..FORECAST_DAYS
+    (default 3), ?hourly=1 to include hourly rows.
+    """
     permission_classes = [IsAuthenticated]
 
+    @cache_weather_response
     def get(self, request):
-        latitude = 7.85
-        longitude = 125.05
-        location_name = "CMU Campus"
-
-        url = (
-            f"https://api.open-meteo.com/v1/forecast?"
-            f"latitude={latitude}&longitude={longitude}"
-            f"&daily=temperature_2m_max,temperature_2m_min,precipitation_probability_mean,windspeed_10m_max"
-            f"&timezone=auto&forecast_days=3"
-        )
-
-        try:
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
-            data = response.json()
-        except requests.RequestException as e:
-            return Response(
-                {"error": f"Failed to fetch forecast data: {str(e)}"},
-                status=status.HTTP_502_BAD_GATEWAY,
+        params = request.query_params
+        station = params.get("station", "")
+        days = params.get("days", "3")
+        if (station and not station.isdigit()) or not days.isdigit():
+            return Response({"error": "station and days must be numbers."}, status=status.HTTP_400_BAD_REQUEST)
+        days = max(1, min(int(days), settings.FORECAST_DAYS))
+
+        forecasts = Forecast.objects.select_related("station")
+        if station:
+            forecast = forecasts.filter(station_id=station).first()
+            if forecast is None and not Station.objects.filter(pk=station).exists():
+                return Response({"error": "Station not found."}, status=status.HTTP_404_NOT_FOUND)
+        else:
+            forecast = (
+                forecasts.filter(station__name=settings.FORECAST_DEFAULT_STATION).first()
+                or forecasts.order_by("station_id").first()
             )
+        if forecast is None:
+            return Response({"error": "No forecast data available yet"}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
 
-        daily = data.get("daily", {})
-        if not daily:
-            return Response({"error": "No forecast data available"}, status=500)
-
-        forecast = []
-        for i, date in enumerate(daily.get("time", [])):
-            forecast.append({
-                "date": date,
-                "min_temp": daily.get("temperature_2m_min", [])[i],
-                "max_temp": daily.get("temperature_2m_max", [])[i],
-                "rain_chance": daily.get("precipitation_probability_mean", [])[i],
-                "wind_max": daily.get("windspeed_10m_max", [])[i],
-            })
-
-        return Response({
-            "message": "3-day forecast",
-            "location": location_name,
-            "data": forecast,
-        })
+        hourly = params.get("hourly", "").lower() in ("1", "true", "yes")
+        return Response(forecast_payload(forecast, days, hourly), status=status.HTTP_200_OK)
 
 
-class StationListCreateView(generics.ListCreateAPIView):
+@method_decorator(conditional_weather_get, name="get")
+class StationListCreateView(FastListMixin, generics.ListCreateAPIView):
     """List all stations or create a new one."""
     queryset = Station.objects.all().order_by("name")
     serializer_class = StationSerializer
+    fast_list = fast_station_rows
     permission_classes = [IsAdminOrReadOnlyAuthenticated]
 
+    @cache_weather_response
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
 
+
+@method_decorator(conditional_weather_get, name="get")
 class StationDetailView(generics.RetrieveUpdateDestroyAPIView):
     """Retrieve, update, or delete a specific station."""
     queryset = Station.objects.all()
     serializer_class = StationSerializer
     permission_classes = [IsAdminOrReadOnlyAuthenticated]
 
+    @cache_weather_response
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
+
+class AlertRuleListCreateView(generics.ListCreateAPIView):
+    """List all alert rules or create a new one (Admin only)."""
+    queryset = AlertRule.objects.all().order_by("name")
+    serializer_class = AlertRuleSerializer
+    permission_classes = [IsAdmin]
+
+
+class AlertRuleDetailView(generics.RetrieveUpdateDestroyAPIView):
+    """Retrieve, update, or delete an alert rule (Admin only)."""
+    queryset = AlertRule.objects.all()
+    serializer_class = AlertRuleSerializer
+    permission_classes = [IsAdmin]
+
 
 @api_view(["GET"])
 @permission_classes([AllowAny])
@@ -236,33 +338,14 @@ def live_weather_view(request):
         )
 
     try:
-        url = (
-            f"https://api.open-meteo.com/v1/forecast?"
-            f"latitude={lat}&longitude={lon}"
-            f"&current=temperature_2m,relative_humidity_2m,precipitation_probability,windspeed_10m"
-            f"&timezone=auto"
-        )
-        response = requests.get(url, timeout=10)
+        response = requests.get(live_url(lat, lon), timeout=10)
         response.raise_for_status()
         data = response.json()
-
-        current = data.get("current", {})
-        if not current:
-            return Response({"error": "No live weather data found."}, status=502)
-
-        result = {
-            "latitude": float(lat),
-            "longitude": float(lon),
-            "temperature": current.get("temperature_2m"),
-            "humidity": current.get("relative_humidity_2m"),
-            "precipitation_probability": current.get("precipitation_probability"),
-            "wind_speed": current.get("windspeed_10m"),
-            "time": current.get("time"),
-        }
-        return Response(result)
-
     except requests.RequestException as e:
         return Response(
             {"error": f"Failed to fetch live data: {str(e)}"},
             status=status.HTTP_502_BAD_GATEWAY,
         )
+
+    payload, status_code = live_payload(lat, lon, data)
+    return Response(payload, status=status_code)
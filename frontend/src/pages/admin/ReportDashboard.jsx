@@ -61,6 +61,17 @@ export default function ReportDashboard() {
     );
   }
 
+  // The list only carries a summary; load the full report (description, contact, image) when opened
+  const openReport = async (report) => {
+    setSelectedReport(report);
+    try {
+      const res = await API.get(`reports/${report.id}/`);
+      setSelectedReport((current) => (current?.id === report.id ? res.data : current));
+    } catch (err) {
+      console.error(err);
+    }
+  };
+
   const handleStatusUpdate = async (id, status) => {
     try {
       await API.patch(`reports/${id}/update_status/`, { status });
@@ -157,7 +168,7 @@ export default function ReportDashboard() {
               key={report.id}
               position={[report.latitude, report.longitude]}
               eventHandlers={{
-                click: () => setSelectedReport(report),
+                click: () => openReport(report),
               }}
             >
               <Popup>
@@ -364,7 +375,7 @@ export default function ReportDashboard() {
                         <tr
                           key={r.id}
                           className="hover:bg-gray-50 cursor-pointer transition-colors"
-                          onClick={() => setSelectedReport(r)}
+                          onClick={() => openReport(r)}
                         >
                           <td className="px-6 py-4">
                             <span
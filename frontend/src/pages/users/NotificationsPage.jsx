@@ -7,8 +7,17 @@ export default function NotificationsPage() {
   useEffect(() => {
     const fetchNotifications = async () => {
       try {
-        const res = await API.get("notifications/all/");
-        setNotifications(res.data);
+        // Personal notifications and area broadcasts, newest first
+        const [personal, inbox] = await Promise.all([
+          API.get("notifications/all/"),
+          API.get("notifications/broadcasts/inbox/"),
+        ]);
+        const items = [
+          ...personal.data.map((n) => ({ ...n, kind: "notification" })),
+          ...inbox.data.map((b) => ({ ...b, kind: "broadcast" })),
+        ];
+        items.sort((a, b) => new Date(b.created_at) - new Date(a.created_at));
+        setNotifications(items);
       } catch (err) {
         console.error("Error fetching notifications:", err);
       }
@@ -16,11 +25,15 @@ export default function NotificationsPage() {
     fetchNotifications();
   }, []);
 
-  const markAsRead = async (id) => {
+  const markAsRead = async (notif) => {
     try {
-      await API.put(`notifications/${id}/read/`, { is_read: true });
+      if (notif.kind === "broadcast") {
+        await API.patch(`notifications/broadcasts/inbox/${notif.id}/mark_as_read/`);
+      } else {
+        await API.put(`notifications/${notif.id}/read/`, { is_read: true });
+      }
       setNotifications((prev) =>
-        prev.map((n) => (n.id === id ? { ...n, is_read: true } : n))
+        prev.map((n) => (n === notif ? { ...n, is_read: true } : n))
       );
     } catch (err) {
       console.error("Failed to mark as read:", err);
@@ -36,7 +49,7 @@ export default function NotificationsPage() {
         ) : (
           notifications.map((notif) => (
             <div
-              key={notif.id}
+              key={`${notif.kind}-${notif.id}`}
               className={`p-4 rounded-lg border ${
                 notif.is_read ? "border-white/20 bg-white/5" : "border-blue-400 bg-blue-800/40"
               }`}
@@ -48,7 +61,7 @@ export default function NotificationsPage() {
               </p>
               {!notif.is_read && (
                 <button
-                  onClick={() => markAsRead(notif.id)}
+                  onClick={() => markAsRead(notif)}
                   className="mt-3 text-sm bg-blue-600 hover:bg-blue-700 px-3 py-1 rounded"
                 >
                   Mark as Read